@@ -1,10 +1,12 @@
 import sys
 import os
+import time
 import logging
+import itertools
 import requests
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from flask import Flask, request, jsonify, abort
+from flask import Flask, Response, request, jsonify, abort, g
 from werkzeug.utils import secure_filename
 from .resume_parser import parse_resume
 from .db_connection import insert_resume
@@ -17,28 +19,55 @@ sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 from backend.db_connection import (
     insert_resume, update_ranking_score, update_resume,
     delete_resume, get_top_resumes, get_all_resumes,
-    get_resume_by_id, get_resume_by_email
+    get_resume_by_id, get_resume_by_email, get_resume_id_by_content_hash, get_resume_file_info, ensure_schema
 )
 
 from backend.extract_and_clean_resume import extract_and_clean_resume, extract_section
+from backend.metrics import (
+    render_metrics, time_stage, CONTENT_TYPE, DB_SECONDS, REQUEST_SECONDS, SEARCH_SECONDS, SCORING_SECONDS, ERRORS
+)
+from backend.tracing import start_trace, end_trace
+from backend.profiling import init_profiling
+from backend.logging_config import configure_logging
+from backend.upload_storage import read_upload, persist_async, record_stored_file, allowed_file, UPLOAD_FOLDER
+from backend.blob_store import get_blob_store
+from backend.parsed_store import PARSED_STORE_DIR, hash_bytes, hash_file
+from backend.dedup import get_dedup_index
+from backend.skills_taxonomy import get_skill_taxonomy
+from backend.search_index import get_search_index
+from backend.bm25 import BM25Ranker
+from backend.cascade import CascadeRanker, CASCADE_PREFILTER_TOP_N, CASCADE_TFIDF_TOP_N
+from backend.score_matrix import score_matrix
+from backend.topk import TopK
+from backend.folder_indexer import get_folder_indexer, FOLDER_INDEXER_ENABLED
+from backend.prefork import load_shared_resources
 
 # Absolute import for resume_parser
 try:
-    from backend.resume_parser import parse_resume
+    from backend.resume_parser import parse_resume, parse_resume_bytes, calculate_ranking_score
 except ImportError as e:
-    logging.error(f"Failed to import backend.resume_parser: {e}")
+    logging.error("Failed to import backend.resume_parser: %s", e)
     sys.exit(1)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Configure logging (queue-backed, per-module levels; see backend/logging_config.py)
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Uploads folder configuration
+# Uploads folder configuration: uploads through the API go to the blob store (backend/blob_store.py);
+# files copied into UPLOAD_FOLDER are picked up by the folder indexer (both set in backend/upload_storage.py)
 #UPLOAD_FOLDER = "backend/uploads"
-UPLOAD_FOLDER = os.path.join(os.getcwd(), 'backend', 'uploads')
 
-ALLOWED_EXTENSIONS = {"pdf", "docx", "txt", "png", "jpg", "jpeg"}
+# Scorers accepted by the ranking endpoints (folder ranking parses files; pool ranking uses the search index)
+FOLDER_SCORERS = ("keyword", "bm25")
+POOL_SCORERS = ("bm25", "cascade")
+# Resumes a folder ranking returns when the request gives no limit (the best ones; the rest are only counted)
+FOLDER_RANK_DEFAULT_LIMIT = int(os.getenv("FOLDER_RANK_DEFAULT_LIMIT", "500"))
+# Most job descriptions one score matrix request may rank the pool against
+MAX_MATRIX_JOBS = int(os.getenv("MAX_MATRIX_JOBS", "100"))
+# Most resumes a score matrix response lists with their best job (the pool can be K x prefilter_top_n)
+MAX_MATRIX_CANDIDATES = int(os.getenv("MAX_MATRIX_CANDIDATES", "1000"))
 
 # Create uploads folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -47,9 +76,54 @@ app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 # Maximum file size limit (16MB)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Limit to 16MB
 
-def allowed_file(filename):
-    """Check if the file has a valid extension."""
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+def parse_deadline_ms(value):
+    """The deadline_ms field as a float (None when absent); raises ValueError unless it is a number >= 0."""
+    if value in (None, ""):
+        return None
+    message = "deadline_ms must be a non-negative number of milliseconds"
+    try:
+        deadline_ms = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+    if not deadline_ms >= 0:  # Also rejects nan
+        raise ValueError(message)
+    return deadline_ms
+
+def parse_positive_int(value, name, default):
+    """A count field such as limit or *_top_n as an int (default when absent); raises ValueError unless it is >= 1."""
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        number = 0
+    if number < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return number
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.trace = start_trace(request.headers.get("X-Request-ID"))
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, status=response.status_code)
+
+        # Stage durations for the client, plus the id to look the request up in the trace export
+        trace = g.pop("trace", None)
+        if trace is not None:
+            response.headers["Server-Timing"] = trace.server_timing(total=elapsed)
+            response.headers["X-Request-ID"] = trace.request_id
+            end_trace(method=request.method, path=request.path, endpoint=endpoint, status=response.status_code)
+    return response
+
+# Admin-only cProfile/tracemalloc capture (registered after the trace hooks so it reuses the request id)
+init_profiling(app)
 
 @app.route('/')
 def home():
@@ -74,81 +148,149 @@ def rank_resumes_from_folder(resumes, job_desc_text):
         response = requests.post(url, files=files, data=data, headers=headers)
         
         # Debugging response
-        logging.info(f"API Response Code: {response.status_code}")
-        logging.info(f"API Response Text: {response.text}")
+        logger.info("API Response Code: %s", response.status_code)
+        logger.debug("API Response Text: %s", response.text, extra={"payload": True})
         
         if response.status_code == 200:
             return response.json()
         else:
-            logging.error(f"Error: {response.status_code} - {response.text}")
+            logger.error("Error: %s - %s", response.status_code, response.text)
             return None
     except Exception as e:
-        logging.error(f"Failed to connect to the backend API: {e}")
+        logger.error("Failed to connect to the backend API: %s", e)
         return None
 
+def duplicate_response(dedup, duplicate_id, parsed_data, spill_path=None):
+    """Response for an exact re-upload of a stored resume: nothing is inserted, but it is scored for this JD."""
+    if spill_path and os.path.exists(spill_path):
+        os.unlink(spill_path)
+    logger.info("Upload is a %s duplicate of resume %s", dedup.kind, duplicate_id)
+    return jsonify({
+        "message": "Resume already uploaded",
+        "resume_id": duplicate_id,
+        "ranking_score": parsed_data.get("ranking_score", 0.0),
+        "duplicate_of": duplicate_id,
+        "duplicate_kind": dedup.kind,
+        "similarity": dedup.similarity,
+    }), 200
+
+def index_resume(resume_id, text, content_hash=None):
+    """Add a stored resume to the keyword search index; indexing failures don't fail the upload."""
+    try:
+        get_search_index().add_document(resume_id, text, content_hash)
+    except Exception as e:
+        ERRORS.inc(stage="search_index")
+        # Picked up again by `python -m backend.search_index --rebuild`, which only adds missing resumes
+        logger.error("Failed to index resume %s: %s", resume_id, e)
+
 # ✅ Upload & Parse Resume API
 @app.route('/upload_resume', methods=["POST"])
 def upload_resume():
     """Handles resume file upload, parsing, ranking, and insertion into the database."""
     if 'resume' not in request.files:
-        logging.error("No file uploaded")
+        logger.error("No file uploaded")
         return jsonify({"error": "No file uploaded"}), 400
    
     resume_file = request.files['resume']
     job_description = request.form.get("job_description", "")
 
     if resume_file.filename == '':
-        logging.error("No selected file")
+        logger.error("No selected file")
         return jsonify({"error": "No selected file"}), 400
 
     if not allowed_file(resume_file.filename):
-        logging.error("File type not allowed")
+        logger.error("File type not allowed")
         return jsonify({"error": "File type not allowed"}), 400
 
     try:
-        # Save the file
         filename = secure_filename(resume_file.filename)
-        #file_path = os.path.join(app.config["UPLOAD_FOLDER"], resume_file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        resume_file.save(file_path)
-        logging.info(f"File saved at {file_path}")
 
         # Ensure output directory exists
         #output_path = "backend/parsed_resumes"
-        output_path = os.path.join(os.getcwd(), 'backend', 'parsed_resumes')
+        # Same store the folder ranking reads uploaded resumes' parses from
+        output_path = PARSED_STORE_DIR
         os.makedirs(output_path, exist_ok=True)
 
-        # Parse the resume file
-        parsed_data = parse_resume(file_path, output_path)
-        if not parsed_data:
-            logging.error("Failed to parse resume")
+        # Parse straight from the request stream; only large uploads are spooled to disk
+        data, spill_path = read_upload(resume_file, request.content_length)
+        content_hash = hash_bytes(data) if data is not None else hash_file(spill_path)
+
+        # Exact re-upload of a resume that is already stored: nothing to insert. Its stored parse
+        # (the parse store is keyed by content hash, so nothing is re-extracted) is scored for this JD.
+        dedup_index = get_dedup_index()
+        dedup = dedup_index.check_exact(content_hash)
+        duplicate_id = get_resume_id_by_content_hash(content_hash) if dedup.is_duplicate else None
+
+        # Near-duplicates (re-exports, small edits) are spotted from the extracted text, before field
+        # extraction, and reuse the canonical resume's stored parse and embedding
+        checked = []
+
+        def find_canonical(text):
+            checked.append(dedup_index.check_and_add(content_hash, text))
+            return checked[-1].canonical_hash if checked[-1].kind == "near" else None
+
+        find = None if dedup.is_duplicate else find_canonical
+        if data is not None:
+            parsed_data = parse_resume_bytes(data, filename, output_path, job_description,
+                                             content_hash=content_hash, find_canonical=find)
+        else:
+            parsed_data = parse_resume(spill_path, output_path, job_description,
+                                       content_hash=content_hash, find_canonical=find)
+
+        if not parsed_data or "error" in parsed_data:
+            logger.error("Failed to parse resume")
             return jsonify({"error": "Failed to parse resume"}), 500
 
+        if duplicate_id is not None:
+            return duplicate_response(dedup, duplicate_id, parsed_data, spill_path)
+
+        # A near-duplicate is still a different document, so it is stored, but flagged
+        near = {}
+        text = parsed_data.get("parsed_data", {}).get("text", "")
+        if text:
+            # Already parsed (stored parse reused) documents are only indexed for dedup here
+            dedup = checked[-1] if checked else dedup_index.check_and_add(content_hash, text)
+            canonical_id = get_resume_id_by_content_hash(dedup.canonical_hash) if dedup.kind == "near" else None
+            if canonical_id is not None:
+                logger.info("Upload is a near duplicate of resume %s (similarity %.2f)", canonical_id,
+                            dedup.similarity)
+                near = {"duplicate_of": canonical_id, "duplicate_kind": "near", "similarity": dedup.similarity}
+
+        # Keep the original in the blob store, but off the request latency path
+        _, persisted = persist_async(filename, content_hash, data=data, spill_path=spill_path)
+
         ranking_score = parsed_data.get("ranking_score", 0.0)
+        fields = parsed_data.get("parsed_data", {})
 
         # Insert parsed resume into the database
-        insert_success = insert_resume(
-            name=parsed_data.get("name", ""),
-            email=parsed_data.get("email", ""),
-            phone=parsed_data.get("phone", ""),
-            skills=", ".join(parsed_data.get("skills", [])),
-            experience=parsed_data.get("experience", ""),
-            education=parsed_data.get("education", ""),
-            file_path=file_path,
+        resume_id = insert_resume(
+            name=fields.get("name", ""),
+            email=fields.get("email", ""),
+            phone=fields.get("phone", ""),
+            skills=", ".join(fields.get("skills", [])),
+            experience=fields.get("experience", ""),
+            education=fields.get("education", ""),
+            file_path=None,  # Set by record_stored_file once the blob is written
             file_format=resume_file.filename.rsplit(".", 1)[1],
             job_description=job_description,
-            ranking_score=ranking_score
+            ranking_score=ranking_score,
+            content_hash=content_hash,
+            skill_ids=fields.get("skill_ids")
         )
+        persisted.add_done_callback(lambda future: record_stored_file(resume_id, filename, future))
 
-        if insert_success:
-            logging.info("Resume uploaded and processed successfully!")
-            return jsonify({"message": "Resume uploaded and processed successfully!", "ranking_score": ranking_score}), 201
+        if resume_id:
+            index_resume(resume_id, fields.get("text", ""), content_hash)
+            logger.info("Resume uploaded and processed successfully!")
+            return jsonify({"message": "Resume uploaded and processed successfully!", "ranking_score": ranking_score,
+                            "resume_id": resume_id, **near}), 201
         else:
-            logging.error("Failed to insert resume into the database")
+            logger.error("Failed to insert resume into the database")
             return jsonify({"error": "Failed to insert resume into the database"}), 500
 
     except Exception as e:
-        logging.exception("Exception in upload_resume API")
+        ERRORS.inc(stage="upload_resume")
+        logger.exception("Exception in upload_resume API")
         return jsonify({"error": str(e)}), 500
 
 
@@ -158,19 +300,23 @@ def parse_resume_by_id(resume_id):
     """Parse a resume by its ID (GET)."""
     try:
         # Fetch the resume file path from the database using the resume_id
-        with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT file_path FROM resumes WHERE id = %s", (resume_id,))
-                resume = cursor.fetchone()
+        with time_stage(DB_SECONDS, helper="parse_resume_by_id"):
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT file_path FROM resumes WHERE id = %s", (resume_id,))
+                    resume = cursor.fetchone()
 
         if resume is None:
             return jsonify({"error": f"Resume with ID {resume_id} not found"}), 404
 
         # Assuming file_path is the first element of the tuple
         resume_file_path = resume[0]
+        if not resume_file_path:
+            # Uploads get their file_path once the original is written to the blob store (never, if that failed)
+            return jsonify({"error": f"The original file of resume {resume_id} is not stored"}), 404
         
         # Check if the path is correct by printing it for debugging purposes
-        print(f"Retrieved file path: {resume_file_path}")
+        logger.debug("Retrieved file path: %s", resume_file_path)
 
         # Construct the full file path by joining the uploads folder
         base_path = os.path.join(os.getcwd(), 'backend', 'uploads')  # Path where resumes are stored
@@ -192,6 +338,7 @@ def parse_resume_by_id(resume_id):
             return jsonify({"error": "Failed to parse resume"}), 500
 
     except Exception as e:
+        ERRORS.inc(stage="parse_resume_by_id")
         return jsonify({"error": str(e)}), 500
 
 
@@ -210,71 +357,239 @@ def parse_resume_upload(resume_id):
         if file.filename == '':
             return jsonify({"error": "No selected file"}), 400
 
-        # Save the file to a location
-        file_path = os.path.join('uploads', file.filename)
-        file.save(file_path)
-
-        # Parse the uploaded file
+        # Parse the uploaded file from memory. Nothing is inserted, so the original is not kept
+        # (a blob-store copy would have no resume row to release it)
+        filename = secure_filename(file.filename)
         output_path = "backend/parsed_resumes"
         os.makedirs(output_path, exist_ok=True)
 
-        parsed_data = parse_resume(file_path, output_path)
+        data, spill_path = read_upload(file, request.content_length)
+        content_hash = hash_bytes(data) if data is not None else hash_file(spill_path)
+        if data is not None:
+            parsed_data = parse_resume_bytes(data, filename, output_path, content_hash=content_hash)
+        else:
+            parsed_data = parse_resume(spill_path, output_path, content_hash=content_hash)
+            os.unlink(spill_path)
 
         return jsonify(parsed_data), 200
 
     except Exception as e:
-        logging.exception("Exception in parse_resume_upload API")
+        ERRORS.inc(stage="parse_resume_upload")
+        logger.exception("Exception in parse_resume_upload API")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Rank Resumes from Folder API
 @app.route('/rank_resumes_from_folder', methods=['POST'])
 def rank_resumes_from_folder():
-    """Process and rank all resumes in the uploads folder."""
-    logging.info("Rank Resumes API called with job description: %s", request.form.get("job_description"))
+    """Rank all uploaded resumes: those in the blob store and those dropped into the uploads folder.
+
+    Resumes are read from the blob store's file index, the folder indexer's manifest and
+    the stored parses (never the raw files), and only the best `limit` resumes (form field,
+    at least 1; FOLDER_RANK_DEFAULT_LIMIT when omitted) are kept while ranking, so memory
+    does not grow with the folder size.
+    Folder files the indexer hasn't parsed yet are counted in `pending` and the response is
+    marked incomplete instead of waiting for them.
+    """
+    logger.info("Rank Resumes API called with job description: %s", request.form.get("job_description"),
+                extra={"payload": True})
+    try:
+        deadline_ms = parse_deadline_ms(request.form.get("deadline_ms"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        limit = parse_positive_int(request.form.get("limit"), "limit", FOLDER_RANK_DEFAULT_LIMIT)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     try:
         # Fix: Use form-data instead of JSON
         job_description = request.form.get("job_description", "")
+        scorer = request.form.get("scorer", "keyword")
+        # Files not reached within deadline_ms are listed unscored instead of holding up the response
+        deadline = time.monotonic() + deadline_ms / 1000.0 if deadline_ms is not None else None
 
         if not job_description:
-            logging.error("Job description is required")
+            logger.error("Job description is required")
             abort(400, description="Job description is required")
 
-        resume_files = [f for f in os.listdir(UPLOAD_FOLDER) if allowed_file(f)]
-        if not resume_files:
-            logging.warning("No resumes found in the folder")
+        if scorer not in FOLDER_SCORERS:
+            return jsonify({"error": f"Unknown scorer '{scorer}'; use one of {', '.join(FOLDER_SCORERS)}"}), 400
+        bm25 = BM25Ranker() if scorer == "bm25" else None
+
+        # Parses come from the folder indexer's artifacts; parsing and embedding stay on its background
+        # thread, which is only nudged to rescan now rather than at its next poll
+        indexer = get_folder_indexer()
+        indexer.wake()
+        # Files still waiting for their parse (new, changed or mid-index): the ranking is partial
+        pending = indexer.pending()
+        store = indexer.store
+
+        # Bounded heap of the best resumes so far; everything else is released as soon as it is scored
+        top = TopK(limit)
+        unscored = TopK(limit)
+        files_found = 0
+        
+        blob_store = get_blob_store()
+        folder_entries = ((filename, content_hash) for filename, content_hash in indexer.entries()
+                          if not blob_store.contains(content_hash))  # Uploaded through the API as well
+        for filename, content_hash in itertools.chain(blob_store.entries(), folder_entries):
+            files_found += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                unscored.push(0, {"filename": filename, "ranking_score": None, "fully_scored": False})
+                continue
+
+            record = store.get(content_hash)
+            if not record:
+                logger.warning("No stored parse for file: %s", filename)
+                continue
+            fields = record["parsed_data"]
+            text = fields.get("text", "")
+            with time_stage(SCORING_SECONDS, scorer=scorer):
+                if bm25 is not None:
+                    ranking_score = bm25.score_text(text, job_description)
+                else:
+                    ranking_score = calculate_ranking_score(text, job_description, fields.get("skill_ids"))
+            top.push(ranking_score, {
+                "filename": filename,
+                "ranking_score": ranking_score,
+                "fully_scored": True,
+                "parsed_data": {"ranking_score": ranking_score, "parsed_data": fields, "content_hash": content_hash}
+            })
+
+        if not files_found and not pending:
+            logger.warning("No resumes found in the folder")
             abort(404, description="No resumes found in the folder")
 
-        ranked_resumes = []
-        
-        for filename in resume_files:
-            file_path = os.path.join(UPLOAD_FOLDER, filename)
-            logging.info(f"Processing file: {filename}")
-
-            # Ensure output directory exists
-            output_path = "backend/parsed_resumes"
-            os.makedirs(output_path, exist_ok=True)
-
-            parsed_data = parse_resume(file_path, output_path)
-            if parsed_data:
-                logging.info(f"Parsed data for {filename}: {parsed_data}")
-                ranking_score = parsed_data.get("ranking_score", 0.0)
-                ranked_resumes.append({
-                    "filename": filename,
-                    "ranking_score": ranking_score,
-                    "parsed_data": parsed_data
-                })
-            else:
-                logging.warning(f"Failed to parse file: {filename}")
-
-        if ranked_resumes:
-            ranked_resumes.sort(key=lambda x: x["ranking_score"], reverse=True)
-            return jsonify({"ranked_resumes": ranked_resumes}), 200
+        if top or unscored or pending:
+            ranked_resumes = top.items()
+            ranked_resumes += unscored.items()[:limit - len(ranked_resumes)]
+            return jsonify({
+                "ranked_resumes": ranked_resumes,
+                "scored": top.offered,
+                "unscored": unscored.offered,
+                "pending": pending,
+                "complete": not unscored.offered and not pending,
+            }), 200
         else:
             return jsonify({"error": "No valid resumes parsed"}), 404
 
     except Exception as e:
-        logging.exception("Exception in rank_resumes_from_folder API")
+        ERRORS.inc(stage="rank_resumes_from_folder")
+        logger.exception("Exception in rank_resumes_from_folder API")
+        return jsonify({"error": str(e)}), 500
+
+# ✅ Rank Stored Resumes API
+@app.route('/rank_resumes', methods=['POST'])
+def rank_resumes():
+    """Rank every indexed resume against a job description.
+
+    Form or JSON fields: job_description, scorer (bm25 or cascade), limit and deadline_ms; the
+    cascade also takes prefilter (keyword or bm25), prefilter_top_n and tfidf_top_n and reports
+    its stages. With deadline_ms the cascade returns what it reached in time and flags each
+    resume's fully_scored (embedding-scored) status.
+    """
+    data = request.get_json(silent=True) or request.form
+    job_description = data.get("job_description", "")
+    scorer = data.get("scorer", "bm25")
+
+    if not job_description:
+        return jsonify({"error": "Job description is required"}), 400
+    if scorer not in POOL_SCORERS:
+        return jsonify({"error": f"Unknown scorer '{scorer}'; use one of {', '.join(POOL_SCORERS)}"}), 400
+
+    try:
+        limit = parse_positive_int(data.get("limit"), "limit", 50)
+        deadline_ms = parse_deadline_ms(data.get("deadline_ms"))
+        if scorer == "cascade":
+            ranker = CascadeRanker(
+                prefilter=data.get("prefilter", "bm25"),
+                prefilter_top_n=parse_positive_int(data.get("prefilter_top_n"), "prefilter_top_n",
+                                                   CASCADE_PREFILTER_TOP_N),
+                tfidf_top_n=parse_positive_int(data.get("tfidf_top_n"), "tfidf_top_n", CASCADE_TFIDF_TOP_N),
+            )
+            ranked, stages = ranker.rank(job_description, limit=limit, deadline_ms=deadline_ms)
+            return jsonify({
+                "scorer": scorer,
+                "total_candidates": int(ranker.index.all_documents().size),
+                "complete": all(stage["completed"] for stage in stages),
+                "stages": stages,
+                "ranked_resumes": ranked,
+            }), 200
+
+        ranker = BM25Ranker()
+        with time_stage(SCORING_SECONDS, scorer="bm25"):
+            ranked = ranker.rank(job_description, limit=limit)
+        return jsonify({
+            "scorer": scorer,
+            "total_candidates": int(ranker.index.all_documents().size),
+            "complete": True,
+            "ranked_resumes": [
+                {"resume_id": resume_id, "ranking_score": score, "fully_scored": True} for resume_id, score in ranked
+            ],
+        }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        ERRORS.inc(stage="rank_resumes")
+        logger.exception("Exception in rank_resumes API")
+        return jsonify({"error": str(e)}), 500
+
+# ✅ Rank Stored Resumes Against Many Jobs API
+@app.route('/rank_resumes/matrix', methods=['POST'])
+def rank_resumes_matrix():
+    """Rank the indexed pool against several job descriptions in one pass.
+
+    JSON fields: job_descriptions (strings, or {"id", "job_description"} objects), top_k,
+    prefilter_top_n (per-job BM25 cutoff whose union forms the pool; 0 scores the whole pool) and
+    candidates_limit (default and maximum MAX_MATRIX_CANDIDATES; 0 for none).
+    Returns the top_k resumes for every job and, for the best-scoring candidates_limit resumes,
+    their best job.
+    """
+    data = request.get_json(silent=True) or {}
+    jobs = data.get("job_descriptions") or []
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({"error": "job_descriptions must be a non-empty list"}), 400
+    if len(jobs) > MAX_MATRIX_JOBS:
+        return jsonify({"error": f"At most {MAX_MATRIX_JOBS} job descriptions per request"}), 400
+
+    job_ids, job_texts = [], []
+    for i, job in enumerate(jobs):
+        if isinstance(job, dict):
+            job_ids.append(job.get("id", i))
+            job = job.get("job_description", "")
+        else:
+            job_ids.append(i)
+        if not isinstance(job, str) or not job.strip():
+            return jsonify({"error": f"Job description {i} is empty"}), 400
+        job_texts.append(job)
+
+    try:
+        top_k = parse_positive_int(data.get("top_k"), "top_k", 10)
+        prefilter_top_n = parse_positive_int(data.get("prefilter_top_n"), "prefilter_top_n", CASCADE_PREFILTER_TOP_N)
+        candidates_limit = int(data.get("candidates_limit", MAX_MATRIX_CANDIDATES))
+        if candidates_limit < 0:
+            return jsonify({"error": "candidates_limit must be 0 or more"}), 400
+        candidates_limit = min(candidates_limit, MAX_MATRIX_CANDIDATES)
+        with time_stage(SCORING_SECONDS, scorer="matrix"):
+            result = score_matrix(job_texts, top_k=top_k, prefilter_top_n=prefilter_top_n,
+                                  best_job_limit=candidates_limit)
+        return jsonify({
+            "total_candidates": int(result["resume_ids"].size),
+            "jobs": [
+                {"job": job_id, "ranked_resumes": [{"resume_id": r, "ranking_score": score} for r, score in top]}
+                for job_id, top in zip(job_ids, result["top"])
+            ],
+            "candidates": [
+                {"resume_id": resume_id, "best_job": job_ids[job], "ranking_score": score}
+                for resume_id, job, score in result["best_job"]
+            ],
+            "timings": {step: round(seconds, 6) for step, seconds in result["timings"].items()},
+        }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        ERRORS.inc(stage="rank_resumes_matrix")
+        logger.exception("Exception in rank_resumes_matrix API")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Insert Resume API
@@ -301,7 +616,9 @@ def insert_resume_endpoint():
     ranking_score = data.get('ranking_score', 0.0)  # Optional field, defaults to 0.0
 
     # Call the insert_resume function to add data to the database
-    result = insert_resume(name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score)
+    skill_ids = get_skill_taxonomy().normalize_many(skills)
+    result = insert_resume(name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score,
+                           skill_ids=skill_ids)
     if result:
         return jsonify({"message": "Resume inserted successfully"}), 201
     else:
@@ -312,12 +629,25 @@ def insert_resume_endpoint():
 @app.route('/resumes', methods=['GET'])
 def get_resumes():
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("SELECT * FROM resumes")
-                resumes = cursor.fetchall()
+        query, values = "SELECT * FROM resumes", None
+
+        # Optional ?skills=python,sql filter (&match=any for either skill), compared as canonical skill ids
+        skills = request.args.get("skills", "")
+        if skills:
+            skill_ids = get_skill_taxonomy().normalize_many(skills)
+            if not skill_ids:
+                return jsonify([])
+            operator = "&&" if request.args.get("match") == "any" else "@>"
+            query, values = f"SELECT * FROM resumes WHERE skill_ids {operator} %s::integer[]", (skill_ids,)
+
+        with time_stage(DB_SECONDS, helper="get_resumes"):
+            with get_db_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, values)
+                    resumes = cursor.fetchall()
         return jsonify(resumes)
     except Exception as e:
+        ERRORS.inc(stage="get_resumes")
         return jsonify({"error": str(e)}), 500
 
 # Update resume status
@@ -331,13 +661,15 @@ def update_resume_status():
         if not resume_id or not status:
             return jsonify({"error": "Missing resume_id or status"}), 400
 
-        with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("UPDATE resumes SET status = %s WHERE id = %s", (status, resume_id))
-                conn.commit()
+        with time_stage(DB_SECONDS, helper="update_resume_status"):
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("UPDATE resumes SET status = %s WHERE id = %s", (status, resume_id))
+                    conn.commit()
 
         return jsonify({"message": "Resume status updated successfully"})
     except Exception as e:
+        ERRORS.inc(stage="update_resume_status")
         return jsonify({"error": str(e)}), 500
 
 
@@ -346,14 +678,60 @@ def update_resume_status():
 def delete_resume_entry(resume_id):
     """Delete a resume entry from the database by resume ID."""
     try:
+        file_path, content_hash = get_resume_file_info(resume_id) or (None, None)
         if delete_resume(resume_id):
-            logging.info(f"Resume with ID {resume_id} successfully deleted.")
+            get_search_index().delete_document(resume_id)
+            if file_path:
+                # Drops this resume's reference; the blob goes with its last one (legacy paths are ignored)
+                get_blob_store().release(file_path)
+            if content_hash and get_resume_id_by_content_hash(content_hash) is None:
+                # Last copy gone: a later upload of the same file is new again
+                get_dedup_index().remove(content_hash)
+            logger.info("Resume with ID %s successfully deleted.", resume_id)
             return jsonify({"message": f"Resume with ID {resume_id} successfully deleted."}), 200
         else:
-            logging.error(f"Failed to delete resume with ID {resume_id}.")
+            logger.error("Failed to delete resume with ID %s.", resume_id)
             return jsonify({"error": f"Failed to delete resume with ID {resume_id}."}), 500
     except Exception as e:
-        logging.exception("Exception in delete_resume_entry API")
+        ERRORS.inc(stage="delete_resume")
+        logger.exception("Exception in delete_resume_entry API")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Keyword Search API
+@app.route('/search', methods=['GET'])
+def search_resumes():
+    """Boolean and phrase search over parsed resume text.
+
+    e.g. /search?q=kubernetes AND (go OR golang) -intern&limit=50, or q="machine learning";
+    add details=1 to include the matching resume rows.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+    try:
+        limit = parse_positive_int(request.args.get("limit"), "limit", 100)
+        with time_stage(SEARCH_SECONDS):
+            doc_ids = get_search_index().search(query)
+        # Newest resumes first
+        resume_ids = doc_ids[::-1][:limit].tolist()
+        response = {"query": query, "total": int(doc_ids.size), "resume_ids": resume_ids}
+
+        if request.args.get("details") == "1" and resume_ids:
+            with time_stage(DB_SECONDS, helper="search_details"):
+                with get_db_connection() as conn:
+                    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                        cursor.execute("SELECT * FROM resumes WHERE id = ANY(%s)", (resume_ids,))
+                        rows = {row["id"]: row for row in cursor.fetchall()}
+            response["resumes"] = [rows[resume_id] for resume_id in resume_ids if resume_id in rows]
+
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        ERRORS.inc(stage="search")
+        logger.exception("Exception in search API")
         return jsonify({"error": str(e)}), 500
 
 
@@ -364,19 +742,60 @@ def health_check():
     return jsonify({"message": "API is running successfully!"}), 200
 
 
+# ✅ Prometheus Metrics
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose per-stage latency histograms and counters in Prometheus text format (this worker's only)."""
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
+
 # Catch-all route for debugging
 @app.route('/<path:path>', methods=['GET', 'POST'])
 def catch_all(path):
-    logging.error(f"Request to non-existent route: {path}")
+    logger.error("Request to non-existent route: %s", path)
     return jsonify({"error": f"Route {path} not found"}), 404
 
 # Log all registered routes (useful for debugging route issues)
 def log_registered_routes():
-    logging.info("Registered routes:")
+    logger.info("Registered routes:")
     for rule in app.url_map.iter_rules():
-        logging.info(f"Route: {rule}")
+        logger.info("Route: %s", rule)
+
+# ✅ App factory
+def create_app(preload=False, start_workers=True):
+    """Prepare the app for serving and return it.
+
+    preload loads the models and lookup tables every request needs up front; under
+    gunicorn's preload_app (gunicorn.conf.py) that happens once in the master and the
+    forked workers share them copy-on-write. start_workers starts the per-process
+    background threads, which a pre-forking master must leave to its workers (they
+    would not survive the fork): gunicorn.conf.py calls start_background_workers()
+    in each worker instead. The schema migration is not run here, on the serving path:
+    the gunicorn master runs it once, or `python -m backend.db_connection` does.
+    """
+    if preload:
+        load_shared_resources()
+    if start_workers:
+        start_background_workers()
+    return app
+
+def start_background_workers():
+    """Start this process's background threads (no-op for those already running)."""
+    # Parse and embed new or changed files in the uploads folder in the background
+    if FOLDER_INDEXER_ENABLED:
+        get_folder_indexer().start()
+
+@app.before_request
+def prepare_process():
+    # Entry points that serve `app` without create_app (flask run, gunicorn backend.app:app,
+    # test clients) start the background threads on their first request; a no-op after that
+    start_background_workers()
 
 if __name__ == "__main__":
+    # Add the columns newer code relies on (content_hash, created_at...), if the table predates them
+    ensure_schema()
+    create_app()
+
     # Log registered routes manually when the app starts
     log_registered_routes()
     
@@ -0,0 +1,266 @@
+"""Content-addressed storage for uploaded resume files.
+
+Each distinct document is stored once, under <root>/<hash[:2]>/<hash[2:4]>/<hash>.<ext>,
+so no directory holds more than a few hundred entries however many files are
+uploaded, and same-named uploads never overwrite each other. A SQLite index next
+to the blobs maps every uploaded filename to the blob holding its bytes and keeps
+a reference count per blob; a blob is deleted when its last reference is released.
+
+The extension is part of the blob's name because the parsers pick a format by it.
+
+Usage:
+    python -m backend.blob_store --import-folder backend/uploads [--update-db]
+"""
+import os
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import tempfile
+import threading
+
+from backend.parsed_store import hash_bytes, hash_file
+
+logger = logging.getLogger(__name__)
+
+# Blob store configuration from environment variables
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", os.path.join(os.getcwd(), "backend", "blobs"))
+BLOB_INDEX_PATH = os.getenv("BLOB_INDEX_PATH", os.path.join(BLOB_STORE_DIR, "index.sqlite3"))
+
+
+def extension(filename):
+    """Lower-cased extension of a filename, with the dot ("" if it has none)."""
+    return os.path.splitext(filename or "")[1].lower()
+
+
+class BlobStore:
+    """Uploaded files stored by content hash, with per-blob reference counts and a filename index."""
+
+    def __init__(self, root=BLOB_STORE_DIR, index_path=None):
+        self.root = root
+        self.index_path = index_path or os.path.join(root, "index.sqlite3")
+        self._local = threading.local()
+        os.makedirs(root, exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                refcount INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, ext)
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                filename TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_filename_idx ON files (filename);
+            CREATE INDEX IF NOT EXISTS files_blob_idx ON files (content_hash, ext);
+        """)
+        conn.commit()
+
+    def _conn(self):
+        # sqlite connections are per thread (and per process after a fork); transactions are explicit
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def path_for(self, content_hash, filename):
+        """Where the blob for this content (and the filename's extension) lives, whether or not it is stored yet."""
+        return self._path(content_hash, extension(filename))
+
+    def _path(self, content_hash, ext):
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash + ext)
+
+    # ✅ Writes
+
+    def put(self, filename, data=None, spill_path=None, content_hash=None):
+        """Store an upload given as bytes or as a temp file (which is moved in, or deleted if the blob exists).
+
+        Adds a filename reference to the blob; returns (ref_id, blob_path).
+        """
+        if content_hash is None:
+            content_hash = hash_bytes(data) if data is not None else hash_file(spill_path)
+        ext = extension(filename)
+        path = self.path_for(content_hash, filename)
+        # Copy the bytes in before taking the lock, so a slow write doesn't hold up other uploads
+        staged = None if os.path.exists(path) else self._stage(path, data, spill_path)
+        conn = self._conn()
+        # BEGIN IMMEDIATE takes the write lock, so a concurrent release can't delete the file we are referencing
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not os.path.exists(path):
+                if staged is None:  # Released (and deleted) since we looked
+                    staged = self._stage(path, data, spill_path)
+                os.replace(staged, path)
+                staged = None
+            size = os.path.getsize(path)
+            conn.execute(
+                "INSERT INTO blobs (content_hash, ext, size, refcount, created_at) VALUES (?, ?, ?, 1, ?)"
+                " ON CONFLICT (content_hash, ext) DO UPDATE SET refcount = refcount + 1",
+                (content_hash, ext, size, time.time()),
+            )
+            ref_id = conn.execute(
+                "INSERT INTO files (filename, content_hash, ext, created_at) VALUES (?, ?, ?, ?)",
+                (filename, content_hash, ext, time.time()),
+            ).lastrowid
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            if staged is not None and os.path.exists(staged):
+                os.unlink(staged)
+            raise
+        # Already stored: a copy staged meanwhile or the caller's temp file is no longer needed
+        for leftover in (staged, spill_path):
+            if leftover is not None and os.path.exists(leftover):
+                os.unlink(leftover)
+        return ref_id, path
+
+    @staticmethod
+    def _stage(path, data=None, spill_path=None):
+        """Temp file holding the blob, next to where it goes, ready to be renamed into place."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            if spill_path is not None:
+                os.close(fd)
+                # The spill file may live on another filesystem (e.g. /tmp), so move rather than rename
+                shutil.move(spill_path, tmp_path)
+            else:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return tmp_path
+
+    def release(self, blob_path, filename=None):
+        """Drop one reference to the blob at blob_path (the most recent one for filename, when given).
+
+        The blob file is deleted with its last reference. Returns the remaining reference
+        count, or None if the path is not a blob this store knows about.
+        """
+        name = os.path.basename(blob_path)
+        content_hash, ext = name[:64], name[64:]
+        if os.path.abspath(blob_path) != os.path.abspath(self._path(content_hash, ext)):
+            return None
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            query = "SELECT id FROM files WHERE content_hash = ? AND ext = ?"
+            params = [content_hash, ext]
+            if filename is not None:
+                query += " AND filename = ?"
+                params.append(filename)
+            row = conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("DELETE FROM files WHERE id = ?", row)
+            conn.execute("UPDATE blobs SET refcount = refcount - 1 WHERE content_hash = ? AND ext = ?",
+                         (content_hash, ext))
+            remaining, = conn.execute("SELECT refcount FROM blobs WHERE content_hash = ? AND ext = ?",
+                                      (content_hash, ext)).fetchone()
+            if remaining <= 0:
+                conn.execute("DELETE FROM blobs WHERE content_hash = ? AND ext = ?", (content_hash, ext))
+                if os.path.exists(blob_path):
+                    os.unlink(blob_path)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return max(remaining, 0)
+
+    # ✅ Reads
+
+    def lookup(self, filename):
+        """Blob paths uploaded under this filename, newest first."""
+        return [self._path(content_hash, ext) for content_hash, ext in self._conn().execute(
+            "SELECT content_hash, ext FROM files WHERE filename = ? ORDER BY id DESC", (filename,)
+        )]
+
+    def refcount(self, content_hash, filename):
+        row = self._conn().execute("SELECT refcount FROM blobs WHERE content_hash = ? AND ext = ?",
+                                   (content_hash, extension(filename))).fetchone()
+        return row[0] if row else 0
+
+    def entries(self):
+        """Yield (filename, content_hash) for every stored upload, oldest first, one row at a time."""
+        yield from self._conn().execute("SELECT filename, content_hash FROM files ORDER BY id")
+
+    def contains(self, content_hash):
+        """Whether some upload with this content is stored (under any extension)."""
+        return self._conn().execute(
+            "SELECT 1 FROM blobs WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone() is not None
+
+    def stats(self):
+        blobs, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        files, = self._conn().execute("SELECT COUNT(*) FROM files").fetchone()
+        return {"files": files, "blobs": blobs, "bytes": size}
+
+    # ✅ Migration
+
+    def import_folder(self, folder):
+        """Move every file of a flat uploads folder into the store; returns {old path: blob path}.
+
+        The originals are moved, not copied: the folder indexer still watches the uploads
+        folder, and a file left in both places would be ranked twice.
+        """
+        moved = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    _, moved[entry.path] = self.put(entry.name, spill_path=entry.path)
+        return moved
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    """Process-wide BlobStore for BLOB_STORE_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore(BLOB_STORE_DIR, BLOB_INDEX_PATH)
+        return _store
+
+
+def main():
+    from backend.logging_config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Move a flat uploads folder into the content-addressed blob store.")
+    parser.add_argument("--import-folder", required=True, help="Folder of previously uploaded resumes")
+    parser.add_argument("--update-db", action="store_true",
+                        help="Point resumes.file_path rows at the imported blobs")
+    args = parser.parse_args()
+
+    store = get_blob_store()
+    moved = store.import_folder(args.import_folder)
+    if args.update_db:
+        from backend.db_connection import execute_query
+        for old_path, blob_path in moved.items():
+            # Older rows stored either the full path or just the name under the uploads folder
+            execute_query("UPDATE resumes SET file_path = %s WHERE file_path IN (%s, %s)",
+                          (blob_path, old_path, os.path.basename(old_path)))
+    logger.info("Imported %d files from %s: %s", len(moved), args.import_folder, store.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import math
+import logging
+from collections import Counter
+
+import numpy as np
+
+from backend.skills_taxonomy import tokenize
+from backend.search_index import get_search_index
+
+logger = logging.getLogger(__name__)
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Function words that only add cost to a job-description query
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being but by can could do does for from had has have
+how i if in into is it its may more most must no not of on or other our out over per plus should so some such
+than that the their them then there these they this those to under up us use using we well were what when where
+which while who will with within would you your
+""".split())
+
+
+def query_terms(text):
+    """Query term -> weight (occurrences in the query), without stopwords."""
+    return Counter(term for term in tokenize(text) if term not in STOPWORDS)
+
+
+class BM25Ranker:
+    """Okapi BM25 over the search index.
+
+    Document lengths and document frequencies come from the index (per-segment length
+    arrays and posting list sizes), so scoring the whole pool is a handful of vectorized
+    numpy passes, one per query term.
+    """
+
+    def __init__(self, index=None, k1=BM25_K1, b=BM25_B):
+        self.index = index or get_search_index()
+        self.k1 = k1
+        self.b = b
+
+    def idf(self, df, total_docs):
+        return math.log(1.0 + (total_docs - df + 0.5) / (df + 0.5))
+
+    def score_all(self, query):
+        """(doc_ids, scores) for every indexed document; documents without any query term score 0."""
+        doc_ids, lengths = self.index.documents()
+        scores = np.zeros(doc_ids.size, dtype=np.float64)
+        if not doc_ids.size:
+            return doc_ids, scores
+        # Per-document length normalization, computed once per query
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / max(lengths.mean(), 1.0))
+
+        for term, weight in query_terms(query).items():
+            term_docs, freqs, _ = self.index.postings(term)
+            if not term_docs.size:
+                continue
+            rows = np.searchsorted(doc_ids, term_docs)
+            idf = self.idf(term_docs.size, doc_ids.size)
+            scores[rows] += weight * idf * freqs * (self.k1 + 1.0) / (freqs + norm[rows])
+        return doc_ids, scores
+
+    def rank(self, query, limit=50, candidates=None):
+        """Top documents as [(doc_id, score)], best first; optionally restricted to candidate doc ids."""
+        doc_ids, scores = self.score_all(query)
+        if candidates is not None:
+            mask = np.isin(doc_ids, np.asarray(candidates, dtype=np.int64))
+            doc_ids, scores = doc_ids[mask], scores[mask]
+        matched = scores > 0
+        doc_ids, scores = doc_ids[matched], scores[matched]
+        if limit is not None and doc_ids.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            doc_ids, scores = doc_ids[top], scores[top]
+        order = np.lexsort((doc_ids, -scores))
+        return [(int(doc_ids[i]), float(scores[i])) for i in order]
+
+    def score_text(self, text, query):
+        """BM25 score of a document that is not in the index, using the index's corpus statistics."""
+        doc_ids, lengths = self.index.documents()
+        total_docs = max(doc_ids.size, 1)
+        avg_length = max(lengths.mean(), 1.0) if lengths.size else 1.0
+        tokens = Counter(tokenize(text))
+        norm = self.k1 * (1.0 - self.b + self.b * sum(tokens.values()) / avg_length)
+
+        score = 0.0
+        for term, weight in query_terms(query).items():
+            tf = tokens.get(term, 0)
+            if tf:
+                df = self.index.postings(term)[0].size
+                score += weight * self.idf(df, total_docs) * tf * (self.k1 + 1.0) / (tf + norm)
+        return score
@@ -0,0 +1,241 @@
+"""Multi-stage ranking of the indexed resume pool against a job description.
+
+Each stage scores only the survivors of the one before it, so the expensive
+sentence encoder never sees most of the pool:
+
+    1. prefilter  keyword (query terms matched) or BM25 over the search index -> top prefilter_top_n
+    2. tfidf      TF-IDF cosine on the survivors' parsed text                  -> top tfidf_top_n
+    3. embedding  MiniLM cosine similarity on what is left                     -> final order
+
+Every ranking reports how many candidates went in and out of each stage and how long it took.
+With a deadline the cascade stops early and returns the best ranking it reached (see CascadeRanker.rank).
+"""
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+
+from backend.bm25 import BM25Ranker, query_terms
+from backend.embedding_store import EMBEDDING_MODEL, normalize_rows, get_embedding_store
+from backend.job_query import get_job_query
+from backend.metrics import time_stage, SCORING_SECONDS
+from backend.search_index import get_search_index
+
+logger = logging.getLogger(__name__)
+
+# Cascade cutoffs from environment variables
+CASCADE_PREFILTER_TOP_N = int(os.getenv("CASCADE_PREFILTER_TOP_N", "1000"))
+CASCADE_TFIDF_TOP_N = int(os.getenv("CASCADE_TFIDF_TOP_N", "100"))
+# Under a deadline, embeddings are computed this many resumes at a time so scoring can stop between chunks
+EMBEDDING_CHUNK_SIZE = int(os.getenv("CASCADE_EMBEDDING_CHUNK_SIZE", "16"))
+
+PREFILTERS = ("keyword", "bm25")
+
+
+def top_scored(doc_ids, scores, limit):
+    """(doc_ids, scores) of the `limit` best-scoring entries with score > 0, best first (ties: lower id)."""
+    matched = scores > 0
+    doc_ids, scores = doc_ids[matched], scores[matched]
+    if limit is not None and doc_ids.size > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        doc_ids, scores = doc_ids[top], scores[top]
+    order = np.lexsort((doc_ids, -scores))
+    return doc_ids[order], scores[order]
+
+
+def keyword_scores(index, query):
+    """(doc_ids, scores) where a document's score is the number of distinct query terms it contains."""
+    doc_ids, _ = index.documents()
+    scores = np.zeros(doc_ids.size, dtype=np.float64)
+    for term in query_terms(query):
+        term_docs = index.postings(term)[0]
+        if term_docs.size:
+            scores[np.searchsorted(doc_ids, term_docs)] += 1.0
+    return doc_ids, scores
+
+
+def tfidf_scores(texts, query):
+    """TF-IDF cosine similarity of each text to the query, with IDF taken from the texts themselves."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words="english")
+    try:
+        matrix = vectorizer.fit_transform(texts)
+    except ValueError:
+        # Every text was empty or only stopwords
+        return np.zeros(len(texts))
+    # Rows are L2-normalized, so the dot product is the cosine
+    return np.asarray((matrix @ vectorizer.transform([query]).T).todense()).ravel()
+
+
+def embedding_scores(encode, texts, query, store=None):
+    """Cosine similarity (0-100) of each text's embedding to the query's, with the texts encoded in one batch.
+
+    query is a job description or JobQuery; its embedding is computed once per distinct JD. With an
+    EmbeddingStore, embeddings already stored (e.g. by the folder indexer) are reused and only the
+    misses are encoded.
+    """
+    query_embedding = normalize_rows(get_job_query(query).embedding(encode)[None, :])[0]
+    embeddings = store.embed(list(texts), encode) if store is not None else normalize_rows(encode(list(texts)))
+    return (embeddings @ query_embedding).astype(np.float64) * 100
+
+
+def stored_texts(index, doc_ids, store=None):
+    """{doc_id: parsed text} for indexed resumes, read from the parsed-output store by content hash."""
+    from backend.parsed_store import ParsedStore
+
+    store = store or ParsedStore()
+    hashes = index.content_hashes(doc_ids)
+    records = store.get_many(set(hashes.values()))
+    texts = {}
+    for doc_id, content_hash in hashes.items():
+        record = records.get(content_hash)
+        if record:
+            texts[doc_id] = record["parsed_data"].get("text", "")
+    return texts
+
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def get_encoder():
+    """Process-wide batched sentence encoder; the model is loaded on first use."""
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            from sentence_transformers import SentenceTransformer
+            from backend.inference_batcher import EncodeBatcher
+
+            _encoder = EncodeBatcher(SentenceTransformer(EMBEDDING_MODEL)).encode
+        return _encoder
+
+
+class CascadeRanker:
+    """Prefilter -> TF-IDF -> embedding ranking over the search index.
+
+    load_texts(doc_ids) returns {doc_id: text} for the prefilter survivors (by default the
+    stored parses) and encode(texts) returns one embedding row per text (by default the
+    shared MiniLM batcher); both can be swapped, e.g. for benchmarks over a synthetic pool.
+    Survivor embeddings are read from embeddings (an EmbeddingStore, by default the shared one
+    when the default encoder is used) and only the misses are encoded.
+    clock() measures the deadline_ms budget (time.monotonic unless replaced).
+    """
+
+    def __init__(self, index=None, prefilter="bm25", prefilter_top_n=CASCADE_PREFILTER_TOP_N,
+                 tfidf_top_n=CASCADE_TFIDF_TOP_N, load_texts=None, encode=None, embeddings=None, clock=None):
+        if prefilter not in PREFILTERS:
+            raise ValueError(f"Unknown prefilter '{prefilter}'; use one of {', '.join(PREFILTERS)}")
+        if prefilter_top_n < 1 or tfidf_top_n < 1:
+            raise ValueError("prefilter_top_n and tfidf_top_n must be positive integers")
+        self.index = index or get_search_index()
+        self.prefilter = prefilter
+        self.prefilter_top_n = prefilter_top_n
+        self.tfidf_top_n = tfidf_top_n
+        self.load_texts = load_texts or (lambda doc_ids: stored_texts(self.index, doc_ids))
+        self.encode = encode
+        # Vectors from a swapped-in encoder don't belong in the store of the configured model
+        self.embeddings = embeddings if embeddings is not None or encode is not None else get_embedding_store()
+        self.clock = clock or time.monotonic
+
+    def _stage(self, stages, name, candidates_in, func):
+        started = time.perf_counter()
+        with time_stage(SCORING_SECONDS, scorer=f"cascade_{name}"):
+            result = func()
+        stages.append({
+            "stage": name,
+            "candidates_in": int(candidates_in),
+            "candidates_out": int(len(result[0])),
+            "seconds": round(time.perf_counter() - started, 6),
+        })
+        return result
+
+    def rank(self, job_description, limit=50, deadline_ms=None):
+        """(ranked, stages): ranked is [{resume_id, ranking_score, fully_scored, <stage>_score...}] best first,
+        stages is [{stage, candidates_in, candidates_out, seconds, completed}] in pipeline order.
+
+        With deadline_ms the ranking is anytime: the prefilter always runs, TF-IDF runs only if time
+        is left, and embeddings are computed in chunks, best lexical candidates first, until the next
+        chunk would overrun the budget. Resumes that got an embedding score (fully_scored) come first,
+        ordered by it; the rest follow in lexical order with ranking_score None.
+        """
+        deadline = None if deadline_ms is None else self.clock() + max(float(deadline_ms), 0.0) / 1000.0
+        stages = []
+        pool = self.index.all_documents().size
+
+        texts = {}
+
+        def prefilter():
+            if self.prefilter == "bm25":
+                doc_ids, scores = BM25Ranker(self.index).score_all(job_description)
+            else:
+                doc_ids, scores = keyword_scores(self.index, job_description)
+            doc_ids, scores = top_scored(doc_ids, scores, self.prefilter_top_n)
+            texts.update(self.load_texts(doc_ids.tolist()))
+            # Resumes whose parsed text is unavailable drop out here
+            keep = np.array([bool(texts.get(doc_id)) for doc_id in doc_ids.tolist()], dtype=bool)
+            return doc_ids[keep], scores[keep]
+
+        doc_ids, first_scores = self._stage(stages, self.prefilter, pool, prefilter)
+        stages[-1]["completed"] = True
+        first = dict(zip(doc_ids.tolist(), first_scores.tolist()))
+        second = {}
+
+        if deadline is None or self.clock() < deadline:
+            def tfidf():
+                if not doc_ids.size:
+                    return doc_ids, np.zeros(0)
+                scores = tfidf_scores([texts[doc_id] for doc_id in doc_ids.tolist()], job_description)
+                # Unlike the prefilter, a zero here doesn't mean "no match": TF-IDF ignores terms BM25 matched
+                # (single letters like "C", stop words), so zero-scored survivors stay, in lexical order
+                order = np.lexsort((np.arange(doc_ids.size), -scores))[:self.tfidf_top_n]
+                return doc_ids[order], scores[order]
+
+            doc_ids, second_scores = self._stage(stages, "tfidf", doc_ids.size, tfidf)
+            stages[-1]["completed"] = True
+            second = dict(zip(doc_ids.tolist(), second_scores.tolist()))
+        else:
+            stages.append({"stage": "tfidf", "candidates_in": int(doc_ids.size), "candidates_out": 0,
+                           "seconds": 0.0, "completed": False})
+            doc_ids = doc_ids[:self.tfidf_top_n]
+
+        def embedding():
+            scored_ids, scores = [], []
+            if doc_ids.size:
+                encode = self.encode or get_encoder()
+                chunk_size = len(doc_ids) if deadline is None else EMBEDDING_CHUNK_SIZE
+                chunk_seconds = 0.0
+                for start in range(0, doc_ids.size, chunk_size):
+                    # Stop before a chunk that would likely run past the deadline
+                    if deadline is not None and self.clock() + chunk_seconds > deadline:
+                        break
+                    t0 = self.clock()
+                    chunk = doc_ids[start:start + chunk_size].tolist()
+                    scores.extend(embedding_scores(encode, [texts[doc_id] for doc_id in chunk], job_description,
+                                                   self.embeddings))
+                    scored_ids.extend(chunk)
+                    chunk_seconds = self.clock() - t0
+            scored_ids, scores = np.array(scored_ids, dtype=np.int64), np.array(scores, dtype=np.float64)
+            order = np.lexsort((scored_ids, -scores))
+            return scored_ids[order], scores[order]
+
+        scored_ids, final_scores = self._stage(stages, "embedding", doc_ids.size, embedding)
+        stages[-1]["completed"] = scored_ids.size == doc_ids.size
+
+        ranked = [
+            {"resume_id": doc_id, "ranking_score": round(score, 2), "fully_scored": True}
+            for doc_id, score in zip(scored_ids.tolist(), final_scores.tolist())
+        ]
+        scored = set(scored_ids.tolist())
+        ranked.extend(
+            {"resume_id": doc_id, "ranking_score": None, "fully_scored": False}
+            for doc_id in doc_ids.tolist() if doc_id not in scored
+        )
+        ranked = ranked[:limit]
+        for row in ranked:
+            row[f"{self.prefilter}_score"] = first[row["resume_id"]]
+            row["tfidf_score"] = second.get(row["resume_id"])
+        logger.debug("Cascade stages: %s", stages)
+        return ranked, stages
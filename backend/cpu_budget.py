@@ -0,0 +1,134 @@
+"""One CPU budget for the server, split between worker processes and their compute threads.
+
+Left alone, every gunicorn worker's torch and BLAS pools start one thread per core,
+and so does every tesseract run, so N workers put about N x cores busy threads on
+N cores. CpuBudget divides CPU_BUDGET cores (default: every CPU the process may
+use) so that workers x threads never exceeds them: cores // CPU_THREADS_PER_WORKER
+workers (fewer if memory only fits fewer, which then get the spare cores as extra
+threads). Each worker's thread count is applied everywhere:
+
+- the thread variables OpenMP, OpenBLAS/MKL and numexpr read when they load,
+  which tesseract subprocesses inherit (OMP_THREAD_LIMIT)
+- torch's intra-op pool and any BLAS pool that is already loaded (through the
+  optional threadpoolctl)
+- with CPU_PIN_WORKERS=1, the worker's CPU affinity, so each worker gets its own cores;
+  CpuSlots hands a respawned worker the slot its predecessor freed
+
+gunicorn.conf.py applies the environment in the master before the app is loaded
+and the per-worker limits after each fork.
+"""
+import os
+import sys
+import logging
+import threading
+
+try:
+    from threadpoolctl import threadpool_limits  # Optional: resizes BLAS/OpenMP pools that are already loaded
+except ImportError:
+    threadpool_limits = None
+
+from backend.prefork import available_cpus, memory_worker_cap, WEB_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# CPU budget configuration from environment variables
+CPU_BUDGET = int(os.getenv("CPU_BUDGET", "0"))  # 0: every CPU available to the process
+CPU_PIN_WORKERS = os.getenv("CPU_PIN_WORKERS", "0") == "1"
+CPU_THREADS_PER_WORKER = int(os.getenv("CPU_THREADS_PER_WORKER", "1"))
+
+# Read by the OpenMP runtime and the BLAS libraries numpy, scipy and torch link, when they load
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS",
+)
+
+
+class CpuBudget:
+    """How `cores` CPUs are shared: `workers` processes running `threads` compute threads each."""
+
+    def __init__(self, cores=None, workers=None, threads=CPU_THREADS_PER_WORKER, pin=CPU_PIN_WORKERS,
+                 memory_cap=None):
+        self.cores = cores or CPU_BUDGET or available_cpus()
+        workers = workers or int(os.getenv("WEB_CONCURRENCY") or 0)
+        if not workers:
+            # workers x threads <= cores, and no more workers than fit in memory
+            workers = self.cores // max(1, min(threads, self.cores))
+            memory_cap = memory_worker_cap() if memory_cap is None else memory_cap
+            if memory_cap is not None:
+                workers = min(workers, memory_cap)
+            workers = min(workers, WEB_MAX_WORKERS)
+        self.workers = max(1, workers)
+        # Whatever the workers leave idle goes to their thread pools (more workers than cores still get one)
+        self.threads = max(1, self.cores // self.workers)
+        self.pin = pin
+
+    def as_dict(self):
+        return {"cores": self.cores, "workers": self.workers, "threads": self.threads, "pin": self.pin}
+
+    def environment(self):
+        """Thread-count variables for a worker; tesseract caps its OpenMP threads at OMP_THREAD_LIMIT."""
+        env = {name: str(self.threads) for name in THREAD_ENV_VARS}
+        env["OMP_THREAD_LIMIT"] = str(self.threads)
+        return env
+
+    def cpus_for(self, slot, cpus=None):
+        """The CPUs worker `slot` is pinned to: consecutive runs of `threads` CPUs, wrapping around the budget."""
+        if cpus is None:
+            cpus = sorted(os.sched_getaffinity(0))
+        cpus = cpus[:self.cores]
+        start = (slot * self.threads) % len(cpus)
+        return [cpus[(start + i) % len(cpus)] for i in range(min(self.threads, len(cpus)))]
+
+
+class CpuSlots:
+    """Pinning slots for the workers, tracked in the master: a respawned worker takes the slot that was freed."""
+
+    def __init__(self):
+        self._used = set()
+
+    def acquire(self):
+        slot = next(slot for slot in range(len(self._used) + 1) if slot not in self._used)
+        self._used.add(slot)
+        return slot
+
+    def release(self, slot):
+        self._used.discard(slot)
+
+
+def apply_environment(budget):
+    """Export the budget's thread counts for libraries loaded later (call before numpy/torch are imported).
+
+    Values already set in the environment win, so a deployment can still override one library.
+    """
+    for name, value in budget.environment().items():
+        os.environ.setdefault(name, value)
+
+
+def apply_worker_limits(budget, slot=None):
+    """Limit the compute pools already loaded in this process, and pin it to its CPUs when the budget asks to."""
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(budget.threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:  # Only settable before the first inter-op parallel work
+            pass
+    if threadpool_limits is not None:
+        threadpool_limits(limits=budget.threads)
+    if budget.pin and slot is not None and hasattr(os, "sched_setaffinity"):
+        cpus = budget.cpus_for(slot)
+        os.sched_setaffinity(0, cpus)
+        logger.info("Worker %s pinned to CPUs %s", slot, cpus)
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_cpu_budget():
+    """Process-wide CpuBudget from CPU_BUDGET and the worker count."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = CpuBudget()
+        return _budget
@@ -3,6 +3,7 @@ from psycopg2 import sql
 from contextlib import closing
 import logging
 import os
+from backend.metrics import timed_db, ERRORS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -17,12 +18,13 @@ DB_CONFIG = {
 }
 
 # Establish database connection
+@timed_db
 def get_db_connection():
     """Returns a PostgreSQL database connection."""
     try:
         return psycopg2.connect(**DB_CONFIG)
     except psycopg2.Error as e:
-        logging.error(f"Database connection error: {e}")
+        logging.error("Database connection error: %s", e)
         raise  # Optional: raise error to halt execution, or handle it appropriately
 
 # ✅ Generic Query Executor for INSERT, UPDATE, DELETE
@@ -35,43 +37,110 @@ def execute_query(query, values=None, fetch_one=False, fetch_all=False):
                 return None
             with closing(conn.cursor()) as cur:
                 cur.execute(query, values)
+                # Commit before returning rows too, so INSERT ... RETURNING is persisted
                 if fetch_one:
-                    return cur.fetchone()
+                    row = cur.fetchone()
+                    conn.commit()
+                    return row
                 if fetch_all:
-                    return cur.fetchall()
+                    rows = cur.fetchall()
+                    conn.commit()
+                    return rows
                 conn.commit()
                 return True
     except psycopg2.Error as e:
-        logging.error(f"Database error: {e}")
+        ERRORS.inc(stage="db")
+        logging.error("Database error: %s", e)
         return None  # Optional: raise exception if critical, or provide custom error handling
 
+# ✅ Add columns newer code relies on (safe to run repeatedly)
+SCHEMA_COLUMNS = ("content_hash", "skill_ids", "created_at", "updated_at")
+SCHEMA_INDEXES = ("resumes_content_hash_idx", "resumes_skill_ids_idx", "resumes_updated_at_idx")
+
+def schema_is_current():
+    """Whether the resumes table already has every column, index and trigger ensure_schema adds (read-only)."""
+    row = execute_query("""
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.columns
+             WHERE table_name = 'resumes' AND column_name = ANY(%s)) = %s
+            AND (SELECT COUNT(*) FROM pg_indexes WHERE tablename = 'resumes' AND indexname = ANY(%s)) = %s
+            AND EXISTS (SELECT 1 FROM pg_trigger
+                        WHERE tgname = 'resumes_touch_updated_at' AND tgrelid = 'resumes'::regclass)
+    """, (list(SCHEMA_COLUMNS), len(SCHEMA_COLUMNS), list(SCHEMA_INDEXES), len(SCHEMA_INDEXES)), fetch_one=True)
+    return bool(row and row[0])
+
+def ensure_schema():
+    """Add optional columns/indexes to the resumes table if they are missing.
+
+    created_at/updated_at drive the incremental corpus export (backend/export_corpus.py); rows that
+    predate the columns get the time of the migration. updated_at is kept current by a trigger, so
+    every UPDATE path is covered. ALTER TABLE locks the table even when there is nothing to add, so
+    an up-to-date schema is detected first and left alone. Run it once per deployment: the gunicorn
+    master does (gunicorn.conf.py), or `python -m backend.db_connection`.
+    """
+    if schema_is_current():
+        return True
+    return execute_query("""
+        ALTER TABLE resumes ADD COLUMN IF NOT EXISTS content_hash TEXT;
+        CREATE INDEX IF NOT EXISTS resumes_content_hash_idx ON resumes (content_hash);
+        ALTER TABLE resumes ADD COLUMN IF NOT EXISTS skill_ids INTEGER[];
+        CREATE INDEX IF NOT EXISTS resumes_skill_ids_idx ON resumes USING GIN (skill_ids);
+        ALTER TABLE resumes ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        ALTER TABLE resumes ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        CREATE INDEX IF NOT EXISTS resumes_updated_at_idx ON resumes (updated_at, id);
+        CREATE OR REPLACE FUNCTION resumes_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_trigger
+                           WHERE tgname = 'resumes_touch_updated_at' AND tgrelid = 'resumes'::regclass) THEN
+                CREATE TRIGGER resumes_touch_updated_at BEFORE UPDATE ON resumes
+                    FOR EACH ROW EXECUTE PROCEDURE resumes_touch_updated_at();
+            END IF;
+        END
+        $$;
+    """)
+
 # ✅ Insert Resume Function with Ranking Score
-def insert_resume(name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score=0.0):
-    """Insert resume details into the database."""
-    
-    # Delay the import to avoid circular import
-    from db_connection import get_db_connection
-    
+@timed_db
+def insert_resume(name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score=0.0, content_hash=None, skill_ids=None):
+    """Insert resume details into the database; returns the new resume id (None on failure)."""
     query = """
-        INSERT INTO resumes (name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        INSERT INTO resumes (name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score, content_hash, skill_ids)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING id
     """
-    values = (name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score)
-    return execute_query(query, values)
+    values = (name, email, phone, skills, experience, education, file_path, file_format, job_description, ranking_score, content_hash, skill_ids)
+    row = execute_query(query, values, fetch_one=True)
+    return row[0] if row else None
     
 # ✅ Update Resume Status
+@timed_db
 def update_resume_status(resume_id, status):
     """Update the status of a resume."""
     query = "UPDATE resumes SET status = %s WHERE id = %s"
     return execute_query(query, (status, resume_id))
 
+# ✅ Record a Resume's Stored File
+@timed_db
+def set_resume_file_path(resume_id, file_path):
+    """Point a resume at its stored original; returns False if the resume no longer exists."""
+    query = "UPDATE resumes SET file_path = %s WHERE id = %s RETURNING id"
+    return execute_query(query, (file_path, resume_id), fetch_one=True) is not None
+
 # ✅ Update Ranking Score
+@timed_db
 def update_ranking_score(resume_id, new_score):
     """Update ranking score of a resume."""
     query = "UPDATE resumes SET ranking_score = %s WHERE id = %s"
     return execute_query(query, (new_score, resume_id))
 
 # ✅ Update Resume Fields Dynamically
+@timed_db
 def update_resume(resume_id, **fields):
     """Update specific fields of a resume dynamically."""
     if not fields:
@@ -85,31 +154,58 @@ def update_resume(resume_id, **fields):
     return execute_query(query, values)
 
 # ✅ Delete Resume
+@timed_db
 def delete_resume(resume_id):
     """Delete a resume from the database."""
     query = "DELETE FROM resumes WHERE id = %s"
     return execute_query(query, (resume_id,))
 
 # ✅ Fetch Top Resumes by Ranking Score
+@timed_db
 def get_top_resumes(limit=10):
     """Fetch resumes sorted by ranking score."""
     query = "SELECT * FROM resumes ORDER BY ranking_score DESC LIMIT %s"
     return execute_query(query, (limit,), fetch_all=True)
 
 # ✅ Fetch All Resumes
+@timed_db
 def get_all_resumes():
     """Fetch all resumes from the database."""
     query = "SELECT * FROM resumes"
     return execute_query(query, fetch_all=True)
 
 # ✅ Fetch Resume by ID
+@timed_db
 def get_resume_by_id(resume_id):
     """Fetch resume details by ID."""
     query = "SELECT * FROM resumes WHERE id = %s"
     return execute_query(query, (resume_id,), fetch_one=True)
 
+# ✅ Fetch Resume File Path and Content Hash by ID
+@timed_db
+def get_resume_file_info(resume_id):
+    """Fetch (file_path, content_hash) of a resume (None if there is no such resume)."""
+    query = "SELECT file_path, content_hash FROM resumes WHERE id = %s"
+    row = execute_query(query, (resume_id,), fetch_one=True)
+    return tuple(row) if row else None
+
 # ✅ Fetch Resume by Email
+@timed_db
 def get_resume_by_email(email):
     """Fetch resume details by Email."""
     query = "SELECT * FROM resumes WHERE email = %s"
     return execute_query(query, (email,), fetch_one=True)
+
+# ✅ Fetch Resume ID by Content Hash
+@timed_db
+def get_resume_id_by_content_hash(content_hash):
+    """Fetch the id of the first resume stored for a document content hash."""
+    query = "SELECT id FROM resumes WHERE content_hash = %s ORDER BY id LIMIT 1"
+    row = execute_query(query, (content_hash,), fetch_one=True)
+    return row[0] if row else None
+
+if __name__ == "__main__":
+    # Schema migration for deployments that don't start through gunicorn.conf.py (flask run, other servers)
+    if not ensure_schema():
+        raise SystemExit("Schema migration failed; see the log above")
+    logging.info("Schema of the resumes table is up to date")
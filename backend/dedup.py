@@ -0,0 +1,195 @@
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Dedup configuration from environment variables
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", os.path.join(os.getcwd(), "backend", "dedup_index.sqlite3"))
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.85"))
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidates start showing up around Jaccard 0.7
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+# Fixed seed: signatures are persisted, so the permutations must never change
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)  # odd multipliers
+_PERM_B = _rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.uint64(1 << 32)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text):
+    """Lowercased alphanumeric tokens, so layout and punctuation changes don't matter."""
+    return _TOKEN.findall(text.lower())
+
+
+def shingle_hashes(tokens, k=SHINGLE_SIZE):
+    """Stable 32-bit hashes of the k-word shingles of a token list."""
+    if len(tokens) < k:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = (" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1))
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64)
+
+
+def minhash_signature(text):
+    """128-value MinHash signature of the normalized text."""
+    hashes = shingle_hashes(normalize_text(text))
+    if hashes.size == 0:
+        return np.full(NUM_PERM, _EMPTY, dtype=np.uint64)
+    # Multiply-shift hashing: (a * h + b) mod 2**64 (uint64 wraparound), keep the high 32 bits
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1)
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket id per LSH band."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class DedupResult:
+    __slots__ = ("kind", "canonical_hash", "similarity")
+
+    def __init__(self, kind, canonical_hash=None, similarity=None):
+        self.kind = kind  # "exact", "near" or "new"
+        self.canonical_hash = canonical_hash
+        self.similarity = similarity
+
+    @property
+    def is_duplicate(self):
+        return self.kind != "new"
+
+
+class DedupIndex:
+    """Persistent exact + near-duplicate index (SQLite: hashes, MinHash signatures, LSH buckets)."""
+
+    def __init__(self, path=DEDUP_INDEX_PATH, threshold=NEAR_DUP_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                content_hash TEXT PRIMARY KEY,
+                canonical_hash TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (bucket, content_hash)
+            ) WITHOUT ROWID;
+        """)
+        conn.commit()
+
+    def _conn(self):
+        # sqlite connections are per thread; WAL lets gunicorn workers read while one writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def canonical(self, content_hash):
+        """Canonical hash for a known document, or None if it has never been indexed."""
+        row = self._conn().execute(
+            "SELECT canonical_hash FROM documents WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_near_duplicate(self, signature, exclude=None):
+        """Best indexed document whose estimated similarity clears the threshold."""
+        buckets = band_buckets(signature)
+        placeholders = ",".join("?" * len(buckets))
+        conn = self._conn()
+        candidates = [row[0] for row in conn.execute(
+            f"SELECT DISTINCT content_hash FROM lsh_buckets WHERE bucket IN ({placeholders})", buckets
+        ) if row[0] != exclude]
+
+        best = None
+        for content_hash in candidates:
+            row = conn.execute(
+                "SELECT canonical_hash, signature FROM documents WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is None:
+                continue
+            similarity = estimate_similarity(signature, np.frombuffer(row[1], dtype=np.uint64))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DedupResult("near", row[0], similarity)
+        return best
+
+    def add(self, content_hash, signature, canonical_hash=None):
+        """Index a document; near-duplicates point at their canonical document."""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (content_hash, canonical_hash, signature) VALUES (?, ?, ?)",
+                (content_hash, canonical_hash or content_hash, signature.astype(np.uint64).tobytes()),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (bucket, content_hash) VALUES (?, ?)",
+                [(bucket, content_hash) for bucket in band_buckets(signature)],
+            )
+
+    def remove(self, content_hash):
+        """Forget a document; its near-duplicates become canonical documents themselves."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM documents WHERE content_hash = ?", (content_hash,))
+            conn.execute("DELETE FROM lsh_buckets WHERE content_hash = ?", (content_hash,))
+            conn.execute("UPDATE documents SET canonical_hash = content_hash WHERE canonical_hash = ?",
+                         (content_hash,))
+
+    def check_exact(self, content_hash):
+        """Exact-duplicate short-circuit, before any parsing."""
+        canonical_hash = self.canonical(content_hash)
+        if canonical_hash is not None:
+            return DedupResult("exact", canonical_hash, 1.0)
+        return DedupResult("new")
+
+    def check_and_add(self, content_hash, text):
+        """Classify a parsed document as exact / near / new and index it."""
+        exact = self.check_exact(content_hash)
+        if exact.is_duplicate:
+            return exact
+        signature = minhash_signature(text)
+        near = self.find_near_duplicate(signature, exclude=content_hash)
+        self.add(content_hash, signature, near.canonical_hash if near else None)
+        return near or DedupResult("new", content_hash)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index():
+    """Process-wide DedupIndex at DEDUP_INDEX_PATH."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DedupIndex()
+        return _index
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Embedding cache configuration from environment variables
+EMBEDDING_STORE_PATH = os.getenv("EMBEDDING_STORE_PATH", os.path.join(os.getcwd(), "backend", "embeddings.sqlite3"))
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+
+def text_key(text):
+    """Cache key for a text: the SHA-256 of its UTF-8 bytes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_rows(matrix):
+    """Rows scaled to unit length (zero rows stay zero), so dot products are cosines."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingStore:
+    """Unit-length text embeddings cached in SQLite, keyed by (model, text hash).
+
+    A resume's embedding is computed once per model and reused by every later
+    ranking, whichever job description it is compared against.
+    """
+
+    def __init__(self, path=EMBEDDING_STORE_PATH, model="default"):
+        self.path = path
+        self.model = model
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID;
+        """)
+        conn.commit()
+
+    def _conn(self):
+        # sqlite connections are per thread (and per process after a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, keys, chunk_size=500):
+        """{key: vector} for the cached keys."""
+        keys = list(keys)
+        conn = self._conn()
+        found = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            rows = conn.execute(
+                "SELECT text_hash, vector FROM embeddings"
+                f" WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                [self.model, *chunk],
+            )
+            found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+        return found
+
+    def put_many(self, items):
+        """Cache (key, vector) pairs; vectors are stored as float32."""
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(self.model, key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items],
+            )
+
+    def embed(self, texts, encode, batch_size=EMBEDDING_BATCH_SIZE):
+        """Unit-length embeddings for texts, one row each; only texts not cached yet are encoded."""
+        keys = [text_key(text) for text in texts]
+        cached = self.get_many(set(keys))
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                vectors = normalize_rows(encode([text_by_key[key] for key in batch]))
+                self.put_many(zip(batch, vectors))
+                cached.update(zip(batch, vectors))
+            logger.debug("Encoded %s of %s texts (%s cached)", len(missing), len(keys), len(keys) - len(missing))
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([cached[key] for key in keys])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store():
+    """Process-wide EmbeddingStore at EMBEDDING_STORE_PATH for the configured encoder model."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore(model=EMBEDDING_MODEL)
+        return _store
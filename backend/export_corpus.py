@@ -0,0 +1,236 @@
+"""Incremental columnar export of the parsed resume corpus.
+
+Writes the resumes table, joined with the parsed text from the parsed-output store
+(and optionally sentence embeddings), to Parquet or Arrow IPC files partitioned by
+ingest date (the row's created_at). Each run only exports rows added or updated since
+the previous one, going by updated_at (both columns are added by ensure_schema), so an
+updated resume appears again in a later file: readers keep the row with the latest
+updated_at per id.
+
+Usage:
+    python -m backend.export_corpus --out exports --format parquet
+    python -m backend.export_corpus --out exports --format arrow --embeddings
+
+Reading it back (Arrow IPC files can be memory-mapped):
+    import pyarrow.dataset as ds
+    corpus = ds.dataset("exports", format="arrow", partitioning="hive")
+    latest = corpus.to_table().to_pandas().sort_values("updated_at").drop_duplicates("id", keep="last")
+"""
+import os
+import json
+import datetime
+import argparse
+import logging
+
+from psycopg2.extras import RealDictCursor
+
+from backend.db_connection import get_db_connection
+from backend.parsed_store import ParsedStore, hash_file
+from backend.upload_storage import UPLOAD_FOLDER
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_export_state.json"
+EXPORT_COLUMNS = ["id", "name", "email", "phone", "skills", "skill_ids", "experience", "education", "file_path",
+                  "file_format", "job_description", "ranking_score", "status", "content_hash", "text",
+                  "created_at", "updated_at"]
+# Watermark of a run that has exported nothing yet
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError:
+        raise SystemExit("pyarrow is required for the corpus export: pip install pyarrow")
+    return pyarrow
+
+
+def load_state(out_dir):
+    """The (updated_at, id) watermark of the last exported row."""
+    path = os.path.join(out_dir, STATE_FILE)
+    state = {"last_updated_at": EPOCH.isoformat(), "last_id": 0}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if "last_updated_at" in saved:
+            state = saved
+        else:
+            # Written before updated_at was tracked: there is no way to tell which rows changed since
+            logger.warning("Export state in %s has no updated_at watermark; exporting every row again", out_dir)
+    return state
+
+
+def save_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def fetch_batches(last_id, batch_size):
+    """Yield lists of resume rows with id > last_id, in id order."""
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            while True:
+                cursor.execute("SELECT * FROM resumes WHERE id > %s ORDER BY id LIMIT %s", (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    return
+                yield rows
+                last_id = rows[-1]["id"]
+
+
+def fetch_changed_batches(last_updated_at, last_id, batch_size):
+    """Yield lists of resume rows after the (updated_at, id) watermark, in that order."""
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            while True:
+                cursor.execute(
+                    "SELECT * FROM resumes WHERE (updated_at, id) > (%s, %s) ORDER BY updated_at, id LIMIT %s",
+                    (last_updated_at, last_id, batch_size),
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    return
+                yield rows
+                last_updated_at, last_id = rows[-1]["updated_at"], rows[-1]["id"]
+
+
+def resolve_file_path(file_path):
+    """file_path may be absolute or relative to the uploads folder."""
+    if not file_path:
+        return None
+    for candidate in (file_path, os.path.join(UPLOAD_FOLDER, file_path)):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def ingest_date(row, default):
+    for column in ("created_at", "uploaded_at", "ingested_at"):
+        value = row.get(column)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.strftime("%Y-%m-%d")
+    return default
+
+
+def build_records(rows, store, today):
+    """Join DB rows with parsed text from the store."""
+    records = []
+    for row in rows:
+        path = resolve_file_path(row.get("file_path"))
+        content_hash = row.get("content_hash") or (hash_file(path) if path else None)
+        parsed = store.get(content_hash) if content_hash else None
+        text = parsed["parsed_data"].get("text", "") if parsed else ""
+        records.append({
+            "id": row["id"],
+            "name": row.get("name"),
+            "email": row.get("email"),
+            "phone": row.get("phone"),
+            "skills": row.get("skills"),
+            "skill_ids": row.get("skill_ids"),
+            "experience": row.get("experience"),
+            "education": row.get("education"),
+            "file_path": row.get("file_path"),
+            "file_format": row.get("file_format"),
+            "job_description": row.get("job_description"),
+            "ranking_score": float(row["ranking_score"]) if row.get("ranking_score") is not None else None,
+            "status": row.get("status"),
+            "content_hash": content_hash,
+            "text": text,
+            "created_at": row.get("created_at"),
+            "updated_at": row.get("updated_at"),
+            "ingest_date": ingest_date(row, today),
+        })
+    return records
+
+
+def add_embeddings(records):
+    """Attach a sentence embedding to every record, encoded in batches."""
+    from backend.resume_analyzer import encode_batcher
+    texts = [record["text"] or "" for record in records]
+    embeddings = encode_batcher.encode(texts)
+    for record, embedding in zip(records, embeddings):
+        record["embedding"] = embedding.astype("float32").tolist()
+
+
+def write_partition(pa, records, out_dir, file_format):
+    """Write one file per ingest date for this batch; returns the paths written."""
+    paths = []
+    by_date = {}
+    for record in records:
+        by_date.setdefault(record["ingest_date"], []).append(record)
+
+    for date, partition in sorted(by_date.items()):
+        partition_dir = os.path.join(out_dir, f"ingest_date={date}")
+        os.makedirs(partition_dir, exist_ok=True)
+        # Explicit types so batches with all-empty columns still share one schema
+        types = {"id": pa.int64(), "ranking_score": pa.float64(), "skill_ids": pa.list_(pa.int32()),
+                 "created_at": pa.timestamp("us", tz="UTC"), "updated_at": pa.timestamp("us", tz="UTC")}
+        fields = [(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS]
+        if "embedding" in partition[0]:
+            fields.append(("embedding", pa.list_(pa.float32(), len(partition[0]["embedding"]))))
+        schema = pa.schema(fields)
+        table = pa.table({name: [r.get(name) for r in partition] for name in schema.names}, schema=schema)
+
+        # Named after the batch's last watermark: re-exported rows must not overwrite an earlier file
+        last = partition[-1]
+        name = f"part-{last['updated_at']:%Y%m%dT%H%M%S%f}-{last['id']:010d}"
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+            path = os.path.join(partition_dir, name + ".parquet")
+            pq.write_table(table, path + ".tmp", compression="zstd")
+        else:
+            path = os.path.join(partition_dir, name + ".arrow")
+            with pa.OSFile(path + ".tmp", "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
+
+
+def export_corpus(out_dir, file_format="parquet", batch_size=1000, embeddings=False, store_root=None):
+    """Export resumes added or updated since the last run. Returns the number of rows exported."""
+    pa = _require_pyarrow()
+    os.makedirs(out_dir, exist_ok=True)
+    store = ParsedStore(store_root) if store_root else ParsedStore()
+    state = load_state(out_dir)
+    today = datetime.date.today().strftime("%Y-%m-%d")
+
+    exported = 0
+    last_updated_at = datetime.datetime.fromisoformat(state["last_updated_at"])
+    for rows in fetch_changed_batches(last_updated_at, state["last_id"], batch_size):
+        records = build_records(rows, store, today)
+        if embeddings:
+            add_embeddings(records)
+        paths = write_partition(pa, records, out_dir, file_format)
+        # Advance the watermark only once the batch's files are in place
+        state = {"last_updated_at": rows[-1]["updated_at"].isoformat(), "last_id": rows[-1]["id"]}
+        save_state(out_dir, state)
+        exported += len(rows)
+        logger.info("Exported %s rows up to %s (%s)", exported, state, ", ".join(paths))
+    return exported
+
+
+def main():
+    from backend.logging_config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Export the parsed resume corpus to Parquet or Arrow IPC.")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--embeddings", action="store_true", help="Include sentence embeddings")
+    parser.add_argument("--store", help="Parsed-output store root (defaults to PARSED_STORE_DIR)")
+    args = parser.parse_args()
+
+    count = export_corpus(args.out, args.format, args.batch_size, args.embeddings, args.store)
+    logger.info("Export finished: %s new or updated rows", count)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import os
-import re
 import logging
 import pdfplumber
 from docx import Document
 
+from backend import section_segmenter
+
 # Set up logging for error handling
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -32,6 +33,10 @@ def extract_text_from_docx(docx_path):
         logging.error(f"Error extracting text from DOCX file {docx_path}: {str(e)}")
         return None
 
+def normalize_whitespace(text):
+    """Collapse runs of spaces and line breaks into single spaces."""
+    return " ".join(text.split())
+
 # Function to clean and extract sections from the resume
 def extract_and_clean_resume(file_path):
     """Process and clean the resume, extracting text and sections."""
@@ -52,7 +57,7 @@ def extract_and_clean_resume(file_path):
         return None
 
     # Clean the extracted text (remove extra spaces & line breaks)
-    cleaned_text = " ".join(text.split())
+    cleaned_text = normalize_whitespace(text)
 
     # Define the cleaned file path
     output_file = file_path.replace(".pdf", "_cleaned.txt").replace(".docx", "_cleaned.txt")
@@ -73,9 +78,7 @@ def extract_and_clean_resume(file_path):
 # Function to extract specific sections from the resume text
 def extract_section(text, start_keyword, end_keywords):
     """Extract sections like Experience, Skills, Education."""
-    pattern = rf"{start_keyword}(.*?)(?={'|'.join(end_keywords)}|\Z)"
-    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-    return match.group(1).strip() if match else "Not Found"
+    return section_segmenter.extract_section(text, start_keyword, end_keywords)
 
 # Example usage of the functions (update this with dynamic file paths)
 def process_resume(file_path):
@@ -83,10 +86,11 @@ def process_resume(file_path):
     if not cleaned_text:
         return None
 
-    # Example: Extract specific sections from the cleaned resume text
-    experience = extract_section(cleaned_text, "Experience", ["Skills", "Education"])
-    skills = extract_section(cleaned_text, "Skills", ["Education"])
-    education = extract_section(cleaned_text, "Education", ["Experience", "Skills"])
+    # Segment the cleaned resume text once and pick out the sections we report
+    sections = section_segmenter.split_sections(cleaned_text)
+    experience = sections.get("experience") or "Not Found"
+    skills = sections.get("skills") or "Not Found"
+    education = sections.get("education") or "Not Found"
 
     # Define the extracted file path
     extracted_file = file_path.replace(".pdf", "_extracted.txt").replace(".docx", "_extracted.txt")
@@ -106,10 +110,11 @@ def process_resume(file_path):
 
     return extracted_file
 
-# Example: Update the file_path dynamically, e.g. via an API or CLI
-file_path = os.path.join(os.getcwd(), 'backend', 'uploads', 'sample.pdf')
-extracted_file = process_resume(file_path)
-if extracted_file:
-    print(f"✅ Process completed successfully. Extracted sections saved to: {extracted_file}")
-else:
-    print("❌ Failed to process the resume.")
+if __name__ == "__main__":
+    # Example: Update the file_path dynamically, e.g. via an API or CLI
+    file_path = os.path.join(os.getcwd(), 'backend', 'uploads', 'sample.pdf')
+    extracted_file = process_resume(file_path)
+    if extracted_file:
+        print(f"✅ Process completed successfully. Extracted sections saved to: {extracted_file}")
+    else:
+        print("❌ Failed to process the resume.")
@@ -0,0 +1,68 @@
+import re
+
+from backend.section_segmenter import find_sections
+from backend.skills_taxonomy import get_skill_taxonomy
+
+# Patterns are compiled once at import; email and phone share one alternation so the text is scanned once
+CONTACT_PATTERN = re.compile(
+    r"(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?P<phone>(?<![\w])(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d))"
+)
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){1,3}$")
+DEGREE_PATTERN = re.compile(
+    r"\b(?:bachelor|master|ph\.?d|mba|b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?a\.?|m\.?\s?a\.?|b\.?\s?tech|m\.?\s?tech"
+    r"|b\.?\s?e\.?|diploma|associate|university|college|institute)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_skills(text):
+    """Canonical skill names mentioned in the text, in order of first mention."""
+    taxonomy = get_skill_taxonomy()
+    return taxonomy.names_for(taxonomy.match_ids(text))
+
+
+def extract_name(text, max_lines=5):
+    """The first short line near the top that looks like a person's name."""
+    checked = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if NAME_PATTERN.match(line) and not find_sections(line):
+            return line
+        checked += 1
+        if checked >= max_lines:
+            break
+    return ""
+
+
+def extract_fields(text):
+    """Structured fields for insert_resume: name, email, phone, skills (names and ids), education, experience."""
+    email = phone = ""
+    for match in CONTACT_PATTERN.finditer(text):
+        if match.lastgroup == "email" and not email:
+            email = match.group()
+        elif match.lastgroup == "phone" and not phone:
+            phone = match.group().strip()
+        if email and phone:
+            break
+
+    sections = {section.name: text[section.start:section.end].strip() for section in find_sections(text)}
+    education = sections.get("education", "")
+    if not education:
+        # No Education heading: fall back to the lines that mention a degree or school
+        education = "\n".join(line.strip() for line in text.splitlines() if DEGREE_PATTERN.search(line))
+
+    taxonomy = get_skill_taxonomy()
+    skill_ids = taxonomy.match_ids(text)
+
+    return {
+        "name": extract_name(text),
+        "email": email,
+        "phone": phone,
+        "skills": taxonomy.names_for(skill_ids),
+        "skill_ids": skill_ids,
+        "education": education,
+        "experience": sections.get("experience", ""),
+    }
@@ -0,0 +1,330 @@
+"""Incremental indexer for the uploads folder.
+
+A manifest (SQLite) records every resume file's size, mtime, content hash and
+the PARSER_VERSION that parsed it. Each sync compares the folder against it and
+only parses (and embeds) files that are new, changed or parsed by an older
+parser; parses land in the ParsedStore and embeddings in the EmbeddingStore,
+both keyed by content, so rankers read those artifacts instead of the raw
+documents. A background thread keeps the manifest current, woken by
+inotify when the optional inotify_simple package is installed and polling
+otherwise (wake() cuts a poll short). Only one process at a time indexes (an
+flock on <manifest>.lock).
+
+Usage:
+    python -m backend.folder_indexer            # one sync of UPLOAD_FOLDER
+    python -m backend.folder_indexer --watch    # keep syncing
+"""
+import os
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags  # Optional: event-driven watching on Linux
+except ImportError:
+    INotify = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every process indexes
+    fcntl = None
+
+from backend.metrics import ERRORS
+from backend.parsed_store import ParsedStore, PARSED_STORE_DIR, PARSER_VERSION, hash_file
+from backend.upload_storage import UPLOAD_FOLDER, allowed_file
+
+logger = logging.getLogger(__name__)
+
+# Folder indexer configuration from environment variables
+FOLDER_MANIFEST_PATH = os.getenv(
+    "FOLDER_MANIFEST_PATH", os.path.join(os.getcwd(), "backend", "folder_manifest.sqlite3")
+)
+FOLDER_INDEXER_ENABLED = os.getenv("FOLDER_INDEXER_ENABLED", "1") == "1"
+FOLDER_INDEXER_EMBED = os.getenv("FOLDER_INDEXER_EMBED", "1") == "1"
+# Polling interval without inotify; with inotify, the interval of a safety full rescan
+FOLDER_POLL_SECONDS = float(os.getenv("FOLDER_POLL_SECONDS", "5"))
+FOLDER_RESCAN_SECONDS = float(os.getenv("FOLDER_RESCAN_SECONDS", "300"))
+
+
+def is_resume_file(name):
+    return not name.startswith(".") and allowed_file(name)
+
+
+class FolderIndexer:
+    """Keeps the parse (and embedding) of every resume file in a folder up to date."""
+
+    def __init__(self, folder=UPLOAD_FOLDER, manifest_path=FOLDER_MANIFEST_PATH, store_root=PARSED_STORE_DIR,
+                 embed=FOLDER_INDEXER_EMBED, poll_seconds=FOLDER_POLL_SECONDS):
+        self.folder = folder
+        self.manifest_path = manifest_path
+        self.store = ParsedStore(store_root)
+        self.embed = embed
+        self.poll_seconds = poll_seconds
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock_file = None
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                status TEXT NOT NULL,
+                error TEXT,
+                indexed_at REAL NOT NULL
+            );
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+        if "parser_version" not in columns:
+            # Manifests written before the column existed: their rows count as parsed by an older parser
+            conn.execute("ALTER TABLE files ADD COLUMN parser_version INTEGER")
+        conn.commit()
+
+    def _conn(self):
+        # sqlite connections are per thread (and per process after a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.manifest_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # ✅ Sync
+
+    def _stat_folder(self):
+        """{name: (size, mtime_ns)} of the resume files in the folder."""
+        found = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if is_resume_file(entry.name) and entry.is_file():
+                        stat = entry.stat()
+                        found[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return found
+
+    def _known(self):
+        """{name: (size, mtime_ns, content_hash, status, parser_version)} from the manifest."""
+        return {row[0]: row[1:] for row in self._conn().execute(
+            "SELECT name, size, mtime_ns, content_hash, status, parser_version FROM files")}
+
+    @staticmethod
+    def _is_current(previous, size, mtime_ns):
+        return previous is not None and previous[:2] == (size, mtime_ns) and previous[4] == PARSER_VERSION
+
+    def pending(self):
+        """How many resume files in the folder are not indexed yet (new, changed or parsed by an older parser)."""
+        known = self._known()
+        return sum(not self._is_current(known.get(name), size, mtime_ns)
+                   for name, (size, mtime_ns) in self._stat_folder().items())
+
+    def sync(self, blocking=True):
+        """Bring the manifest up to date; returns counts of added, changed, removed, unchanged and failed files.
+
+        With blocking=False, returns None instead of waiting when another thread is already syncing.
+        """
+        if not self._sync_lock.acquire(blocking=blocking):
+            return None
+        try:
+            conn = self._conn()
+            known = self._known()
+            current = self._stat_folder()
+            counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0, "failed": 0}
+
+            removed = [name for name in known if name not in current]
+            if removed:
+                with conn:
+                    conn.executemany("DELETE FROM files WHERE name = ?", [(name,) for name in removed])
+                counts["removed"] = len(removed)
+
+            for name, (size, mtime_ns) in current.items():
+                previous = known.get(name)
+                if self._is_current(previous, size, mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                status = self._index_file(name, size, mtime_ns, previous)
+                if status == "failed":
+                    counts["failed"] += 1
+                else:
+                    counts["added" if previous is None else "changed"] += 1
+
+            if any(counts[key] for key in ("added", "changed", "removed", "failed")):
+                logger.info("Folder sync of %s: %s", self.folder, counts)
+            return counts
+        finally:
+            self._sync_lock.release()
+
+    def _index_file(self, name, size, mtime_ns, previous):
+        path = os.path.join(self.folder, name)
+        content_hash, status, error = None, "indexed", None
+        try:
+            content_hash = hash_file(path)
+            # Touched but identical content, parsed by this parser: the stored artifacts are still valid
+            if not (previous and previous[2] == content_hash and previous[3] == "indexed"
+                    and previous[4] == PARSER_VERSION):
+                self._build_artifacts(path, content_hash)
+        except Exception as e:
+            ERRORS.inc(stage="folder_index")
+            logger.error("Failed to index %s: %s", path, e)
+            status, error = "failed", str(e)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files"
+                " (name, size, mtime_ns, content_hash, status, error, indexed_at, parser_version)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, size, mtime_ns, content_hash, status, error, time.time(), PARSER_VERSION),
+            )
+        return status
+
+    def _build_artifacts(self, path, content_hash):
+        # Imported here: the parsers pull in PDF/OCR libraries the manifest queries don't need
+        from backend.resume_parser import parse_resume
+
+        result = parse_resume(path, self.store.root, content_hash=content_hash)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        text = result["parsed_data"].get("text", "")
+        if not text:
+            raise RuntimeError("no text extracted")
+        if self.embed:
+            self._embed(text)
+
+    def _embed(self, text):
+        try:
+            from backend.cascade import get_encoder
+            from backend.embedding_store import get_embedding_store
+            get_embedding_store().embed([text], get_encoder())
+        except ImportError as e:
+            logger.warning("Sentence encoder unavailable, indexing without embeddings: %s", e)
+            self.embed = False
+
+    # ✅ Reads
+
+    def entries(self):
+        """Yield (name, content_hash) for every indexed file, one row at a time."""
+        yield from self._conn().execute(
+            "SELECT name, content_hash FROM files WHERE status = 'indexed' ORDER BY name"
+        )
+
+    def stats(self):
+        counts = dict(self._conn().execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+        return {"indexed": counts.get("indexed", 0), "failed": counts.get("failed", 0)}
+
+    # ✅ Background watching
+
+    def _acquire_process_lock(self):
+        """Whether this process may index (holds the manifest's lock file)."""
+        if fcntl is None:
+            return True
+        if self._lock_file is None:
+            lock_file = open(self.manifest_path + ".lock", "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._lock_file = lock_file
+        return True
+
+    def _watcher(self):
+        if INotify is None:
+            return None
+        try:
+            watcher = INotify()
+            watcher.add_watch(self.folder, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO |
+                              inotify_flags.MOVED_FROM | inotify_flags.DELETE)
+            return watcher
+        except OSError as e:
+            logger.warning("inotify unavailable for %s, polling instead: %s", self.folder, e)
+            return None
+
+    def _run(self):
+        os.makedirs(self.folder, exist_ok=True)
+        watcher = self._watcher()
+        logger.info("Indexing %s (%s)", self.folder, "inotify" if watcher else f"polling every {self.poll_seconds}s")
+        while not self._stop.is_set():
+            if self._acquire_process_lock():
+                try:
+                    self.sync()
+                except Exception as e:
+                    ERRORS.inc(stage="folder_index")
+                    logger.error("Folder sync failed: %s", e)
+            if watcher is not None and self._lock_file is not None:
+                # Wake on the next change (batched over 200 ms), or rescan after FOLDER_RESCAN_SECONDS anyway
+                watcher.read(timeout=int(FOLDER_RESCAN_SECONDS * 1000), read_delay=200)
+            else:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def start(self):
+        """Start the background indexer in this process (restarted after a fork); no-op if it is running."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock_file = None  # After a fork the inherited lock descriptor belongs to the parent; take our own
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="folder-indexer", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Have the background thread rescan now instead of at its next poll; never indexes in the caller."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+
+_indexer = None
+_indexer_lock = threading.Lock()
+
+
+def get_folder_indexer():
+    """Process-wide FolderIndexer for UPLOAD_FOLDER."""
+    global _indexer
+    with _indexer_lock:
+        if _indexer is None:
+            _indexer = FolderIndexer()
+        return _indexer
+
+
+def main():
+    from backend.logging_config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Parse and embed new or changed resumes in a folder.")
+    parser.add_argument("--folder", default=UPLOAD_FOLDER)
+    parser.add_argument("--manifest", default=FOLDER_MANIFEST_PATH)
+    parser.add_argument("--no-embed", action="store_true", help="Only parse, skip sentence embeddings")
+    parser.add_argument("--watch", action="store_true", help="Keep watching the folder")
+    args = parser.parse_args()
+
+    indexer = FolderIndexer(args.folder, args.manifest, embed=not args.no_embed)
+    if args.watch:
+        indexer.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            indexer.stop()
+    else:
+        logger.info("Sync: %s, manifest: %s", indexer.sync(), indexer.stats())
+
+
+if __name__ == "__main__":
+    main()
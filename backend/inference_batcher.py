@@ -0,0 +1,143 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from backend.metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Batching configuration from environment variables
+ENCODE_BATCH_MAX_WAIT_MS = float(os.getenv("ENCODE_BATCH_MAX_WAIT_MS", "5"))
+ENCODE_BATCH_MAX_SIZE = int(os.getenv("ENCODE_BATCH_MAX_SIZE", "32"))
+
+
+def _gather(parts, future):
+    """Resolve future with the rows of every part Future, in order (or with the first part's error)."""
+    remaining = [len(parts)]
+
+    def part_done(part):
+        # Parts are resolved one at a time by the batcher's worker thread
+        if future.done():
+            return
+        if part.exception() is not None:
+            future.set_exception(part.exception())
+            return
+        remaining[0] -= 1
+        if not remaining[0]:
+            future.set_result(np.concatenate([p.result() for p in parts]))
+
+    for part in parts:
+        part.add_done_callback(part_done)
+
+
+class EncodeBatcher:
+    """Coalesces concurrent encode calls into a single model.encode batch.
+
+    Callers block in encode() while a background thread gathers requests for up to
+    max_wait_ms (or until max_batch_size texts are queued), runs one batched encode
+    and hands every caller back its own rows. No batch exceeds max_batch_size: larger
+    requests are split into parts, and a request that doesn't fit starts the next batch.
+    """
+
+    def __init__(self, model, max_wait_ms=ENCODE_BATCH_MAX_WAIT_MS, max_batch_size=ENCODE_BATCH_MAX_SIZE):
+        self.model = model
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._queue = queue.Queue()
+        self._carry = None  # Taken from the queue but left for the next batch (it didn't fit)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+
+    @property
+    def queue_depth(self):
+        """Number of encode requests waiting to be batched."""
+        return self._queue.qsize()
+
+    def _ensure_worker(self):
+        # The worker thread does not survive a fork, so restart it in each new process
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._carry = None
+                self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name="encode-batcher", daemon=True)
+            self._worker.start()
+
+    def submit(self, texts):
+        """Queue texts for encoding and return a Future resolving to their embeddings."""
+        if isinstance(texts, str):
+            texts = [texts]
+        future = Future()
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+        self._ensure_worker()
+        texts = list(texts)
+        parts = [texts[start:start + self.max_batch_size] for start in range(0, len(texts), self.max_batch_size)]
+        if len(parts) == 1:
+            QUEUE_DEPTH.inc(queue="encode")
+            self._queue.put((texts, future))
+            return future
+
+        part_futures = [Future() for _ in parts]
+        _gather(part_futures, future)
+        for part, part_future in zip(parts, part_futures):
+            QUEUE_DEPTH.inc(queue="encode")
+            self._queue.put((part, part_future))
+        return future
+
+    def encode(self, texts, timeout=None):
+        """Encode texts through the shared batch and return a 2-D numpy array."""
+        return self.submit(texts).result(timeout=timeout)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the wait or size limit."""
+        if self._carry is not None:
+            batch, self._carry = [self._carry], None
+        else:
+            batch = [self._queue.get()]
+            QUEUE_DEPTH.dec(queue="encode")
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Anything already queued is taken even once the wait budget is spent
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            QUEUE_DEPTH.dec(queue="encode")
+            if size + len(item[0]) > self.max_batch_size:
+                # It would overflow this batch, so it starts the next one
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                embeddings = np.asarray(
+                    self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+                )
+            except Exception as e:
+                logger.error("Batched encode of %s texts failed: %s", len(texts), e)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in batch:
+                future.set_result(embeddings[offset:offset + len(request_texts)])
+                offset += len(request_texts)
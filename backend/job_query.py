@@ -0,0 +1,162 @@
+"""Per-job-description state shared by every scoring path.
+
+A JobQuery is built once per distinct job description (cached by its hash) and
+holds what each scorer needs from the JD: the extracted keywords and skill ids
+with a compiled matcher for them, the JD's term counts for TF-IDF, and its
+sentence embedding (computed on first use). Scoring N resumes against one JD
+then only does per-resume work.
+"""
+import os
+import re
+import math
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from backend.bm25 import query_terms
+from backend.skills_taxonomy import get_skill_taxonomy
+
+# Job query cache configuration from environment variables
+JOB_QUERY_CACHE_SIZE = int(os.getenv("JOB_QUERY_CACHE_SIZE", "256"))
+# Keywords kept for a job description that names no known skill
+MAX_FALLBACK_KEYWORDS = 10
+
+# Characters that separate skill tokens (the complement of skills_taxonomy.TOKEN_PATTERN's token characters)
+_SEPARATOR = r"[^a-z0-9+#.\-]+"
+# "python3", "python-3.11": the same trailing version numbers the taxonomy ignores
+_VERSION = r"(?:[.\-]?v?\d+(?:\.\d+)*)?"
+
+_tfidf_analyzer = None
+
+
+def tfidf_analyzer():
+    """The tokenizer TfidfVectorizer(stop_words="english") uses, built once."""
+    global _tfidf_analyzer
+    if _tfidf_analyzer is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        _tfidf_analyzer = TfidfVectorizer(stop_words="english").build_analyzer()
+    return _tfidf_analyzer
+
+
+def job_key(job_description):
+    """Cache key for a job description: the SHA-256 of its whitespace-normalized text."""
+    return hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest()
+
+
+class JobQuery:
+    """Everything the scorers derive from one job description, computed once."""
+
+    def __init__(self, job_description, taxonomy=None):
+        taxonomy = taxonomy or get_skill_taxonomy()
+        self.text = job_description
+        self.key = job_key(job_description)
+        self.skill_ids = taxonomy.match_ids(job_description)
+        self.keywords = taxonomy.names_for(self.skill_ids) or [
+            term for term, _ in query_terms(job_description).most_common(MAX_FALLBACK_KEYWORDS)
+        ]
+        self.pattern = self._compile(taxonomy)
+        self.term_counts = Counter(tfidf_analyzer()(job_description))
+        self._embeddings = {}
+        self._lock = threading.Lock()
+
+    def _compile(self, taxonomy):
+        # One named group per JD skill, listing all of its aliases longest first
+        groups = []
+        for skill_id in self.skill_ids:
+            aliases = sorted(taxonomy.aliases.get(skill_id, ()), key=lambda tokens: -len(" ".join(tokens)))
+            alternation = "|".join(_SEPARATOR.join(map(re.escape, tokens)) for tokens in aliases)
+            groups.append(f"(?P<s{skill_id}>{alternation})")
+        if not groups:
+            return None
+        return re.compile(rf"(?<![a-z0-9+#.\-])(?:{'|'.join(groups)}){_VERSION}(?![a-z0-9+#])")
+
+    def matched_skill_ids(self, resume_text):
+        """The JD's skill ids that the resume mentions."""
+        if self.pattern is None:
+            return set()
+        wanted = len(self.skill_ids)
+        found = set()
+        for match in self.pattern.finditer(resume_text.lower()):
+            found.add(int(match.lastgroup[1:]))
+            if len(found) == wanted:
+                break
+        return found
+
+    def skill_overlap(self, resume_text=None, skill_ids=None):
+        """Number of JD skills the resume has; pass the resume's skill_ids when already known."""
+        if skill_ids is not None:
+            return len(set(skill_ids).intersection(self.skill_ids))
+        return len(self.matched_skill_ids(resume_text))
+
+    def tfidf_similarity(self, resume_text):
+        """TF-IDF cosine (0-100) between the resume and the JD, as fitting TfidfVectorizer on the pair would give.
+
+        With two documents the smoothed IDF only depends on whether a term occurs in one or both,
+        so the JD side (its term counts) is reused and only the resume is tokenized per call.
+        """
+        resume_counts = Counter(tfidf_analyzer()(resume_text))
+        if not resume_counts and not self.term_counts:
+            return 0.0
+        one_doc_idf = math.log(3 / 2) + 1.0  # ln((1 + n) / (1 + df)) + 1 with n = 2, df = 1 (df = 2 gives 1)
+
+        def norm(counts, other):
+            return math.sqrt(sum((tf * (1.0 if term in other else one_doc_idf)) ** 2 for term, tf in counts.items()))
+
+        dot = sum(tf * self.term_counts[term] for term, tf in resume_counts.items() if term in self.term_counts)
+        denominator = norm(resume_counts, self.term_counts) * norm(self.term_counts, resume_counts)
+        return dot / denominator * 100 if denominator else 0.0
+
+    def embedding(self, encode, preprocess=None):
+        """The JD's sentence embedding (a 1-D array), encoded on first use.
+
+        preprocess is applied to the JD text first. Embeddings are cached per encoder (the
+        model or batcher a bound encode method belongs to) and preprocess function.
+        """
+        variant = _variant(encode, preprocess)
+        with self._lock:
+            cached = self._embeddings.get(variant)
+            if cached is None:
+                text = preprocess(self.text) if preprocess else self.text
+                cached = np.asarray(encode([text]), dtype=np.float32).reshape(-1)
+                self._embeddings[variant] = cached
+            return cached
+
+
+def _variant(encode, preprocess=None):
+    return getattr(encode, "__self__", encode), preprocess
+
+
+def job_embeddings(job_queries, encode):
+    """Stacked embeddings of several JobQuerys; the ones not embedded yet are encoded in one batch."""
+    variant = _variant(encode)
+    missing = [query for query in job_queries if variant not in query._embeddings]
+    if missing:
+        vectors = np.asarray(encode([query.text for query in missing]), dtype=np.float32)
+        for query, vector in zip(missing, vectors):
+            with query._lock:
+                query._embeddings.setdefault(variant, vector)
+    return np.vstack([query.embedding(encode) for query in job_queries])
+
+
+_queries = OrderedDict()
+_queries_lock = threading.Lock()
+
+
+def get_job_query(job_description):
+    """JobQuery for a job description, shared across calls through an LRU cache keyed by the JD's hash."""
+    if isinstance(job_description, JobQuery):
+        return job_description
+    key = job_key(job_description)
+    with _queries_lock:
+        query = _queries.get(key)
+        if query is not None:
+            _queries.move_to_end(key)
+            return query
+    query = JobQuery(job_description)
+    with _queries_lock:
+        query = _queries.setdefault(key, query)
+        while len(_queries) > JOB_QUERY_CACHE_SIZE:
+            _queries.popitem(last=False)
+    return query
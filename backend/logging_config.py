@@ -0,0 +1,123 @@
+import os
+import sys
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+
+# Logging configuration from environment variables
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")  # e.g. "backend.resume_parser=WARNING,backend.db_connection=INFO"
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") == "1"
+LOG_FILE = os.getenv("LOG_FILE", "")
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "300"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+_listener = None
+
+
+class TruncatedPayload:
+    """Wraps a log argument so it is rendered and truncated only when formatted."""
+
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value, max_chars):
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self):
+        text = str(self.value)
+        if len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... [{len(text) - self.max_chars} chars truncated]"
+        return text
+
+    __repr__ = __str__
+
+
+class PayloadFilter(logging.Filter):
+    """Samples and truncates records flagged with extra={"payload": True}.
+
+    Payload records (whole parsed documents, API responses) are dropped except for
+    a sampled fraction; arguments of surviving records are wrapped so truncation
+    happens in the listener thread, not on the request path.
+    """
+
+    def __init__(self, max_chars=LOG_PAYLOAD_MAX_CHARS, sample_rate=LOG_PAYLOAD_SAMPLE_RATE):
+        super().__init__()
+        self.max_chars = max_chars
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        if not getattr(record, "payload", False):
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        if isinstance(record.args, tuple):
+            record.args = tuple(TruncatedPayload(arg, self.max_chars) for arg in record.args)
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler formats the record before enqueueing it; this one only
+    captures exception text, so the caller pays for a queue put and nothing more.
+    """
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec):
+    """'backend.resume_parser=WARNING,backend.app=DEBUG' -> {name: level}"""
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, level = part.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=LOG_LEVEL, module_levels=LOG_LEVELS, use_queue=LOG_ASYNC, log_file=LOG_FILE):
+    """Set up root logging once: per-module levels, payload filter, optional queue listener."""
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    # Replace whatever basicConfig() an imported module installed first
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    payload_filter = PayloadFilter()
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(payload_filter)
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        # The listener thread does not survive a fork (gunicorn --preload), so restart it in the child
+        os.register_at_fork(after_in_child=_listener.start)
+    else:
+        for handler in handlers:
+            handler.addFilter(payload_filter)
+            root.addHandler(handler)
+        _listener = False  # Configured, but synchronously
+
+    for name, module_level in parse_levels(module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
@@ -0,0 +1,163 @@
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+
+from backend.tracing import record_span
+
+# Default latency buckets in seconds (1ms .. 60s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Short stage name used for trace spans and Server-Timing entries
+        self.stage = name.removeprefix("resume_").removesuffix("_seconds")
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+@contextmanager
+def time_stage(histogram, **labels):
+    """Observe the wall time of the enclosed block on the given histogram.
+
+    The same timing is recorded as a span on the active request trace.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        histogram.observe(duration, **labels)
+        record_span(histogram.stage, started, duration, labels)
+
+
+def timed_db(func):
+    """Decorator recording a DB helper's duration under its function name."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with time_stage(DB_SECONDS, helper=func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text exposition format.
+
+    Metrics live in process memory: under a multi-worker server (gunicorn.conf.py) each scrape
+    of /metrics reaches one worker and shows that worker's counters only. Scrape every worker,
+    or run a single worker, for totals.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ✅ Pipeline metrics
+FILE_SAVE_SECONDS = Histogram("resume_file_save_seconds", "Time spent saving uploaded files")
+EXTRACTION_SECONDS = Histogram("resume_extraction_seconds", "Time spent extracting text by file format", ["format"])
+OCR_SECONDS = Histogram("resume_ocr_seconds", "Time spent in tesseract OCR")
+CLEANING_SECONDS = Histogram("resume_cleaning_seconds", "Time spent cleaning extracted text")
+FIELD_EXTRACTION_SECONDS = Histogram("resume_field_extraction_seconds", "Time spent extracting structured fields")
+SCORING_SECONDS = Histogram("resume_scoring_seconds", "Time spent scoring resumes by scorer", ["scorer"])
+EMBEDDING_SECONDS = Histogram("resume_embedding_seconds", "Time spent computing sentence embeddings")
+SEARCH_SECONDS = Histogram("resume_search_seconds", "Time spent answering keyword index searches")
+DB_SECONDS = Histogram("resume_db_seconds", "Time spent in database helpers", ["helper"])
+REQUEST_SECONDS = Histogram("resume_http_request_seconds", "API request latency", ["endpoint", "status"])
+
+CACHE_HITS = Counter("resume_cache_hits_total", "Cache hits by cache name", ["cache"])
+CACHE_MISSES = Counter("resume_cache_misses_total", "Cache misses by cache name", ["cache"])
+ERRORS = Counter("resume_errors_total", "Errors by pipeline stage", ["stage"])
+QUEUE_DEPTH = Gauge("resume_queue_depth", "Requests waiting in in-process queues", ["queue"])
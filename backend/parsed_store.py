@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import msgpack  # Optional: smaller and faster than JSON when installed
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Parsed-output store configuration from environment variables
+PARSED_STORE_DIR = os.getenv("PARSED_STORE_DIR", os.path.join(os.getcwd(), "backend", "parsed_resumes"))
+PARSED_STORE_FORMAT = os.getenv("PARSED_STORE_FORMAT", "msgpack" if msgpack else "json")
+
+# Bump when the parsers change so cached parses are not reused
+PARSER_VERSION = 3
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of an in-memory document."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedStore:
+    """Parsed resumes keyed by content hash, one compact file per document.
+
+    Records live under <root>/<first two hex chars>/<hash>.<ext> so no directory
+    grows unbounded, and each write goes to a temp file in the same shard that is
+    then renamed into place, so concurrent workers never see partial output.
+    """
+
+    def __init__(self, root=PARSED_STORE_DIR, encoding=PARSED_STORE_FORMAT):
+        if encoding == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed; storing parsed resumes as JSON")
+            encoding = "json"
+        self.root = root
+        self.encoding = encoding
+
+    def _path(self, key, encoding=None):
+        return os.path.join(self.root, key[:2], f"{key}.{encoding or self.encoding}")
+
+    def _dumps(self, record):
+        if self.encoding == "msgpack":
+            return msgpack.packb(record, use_bin_type=True)
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _loads(data, encoding):
+        if encoding == "msgpack":
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data)
+
+    def put(self, key, record):
+        """Atomically write one record."""
+        path = self._path(key)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=shard, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._dumps(record))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return path
+
+    def get(self, key):
+        """Return the record stored under key (following a near-duplicate alias), or None."""
+        record = self._get(key)
+        if record is not None and "alias_of" in record:
+            return self._get(record["alias_of"])
+        return record
+
+    def put_alias(self, key, canonical_key):
+        """Point key at another document's record, e.g. for a near-duplicate upload."""
+        return self.put(key, {"alias_of": canonical_key})
+
+    def _get(self, key):
+        for encoding in (self.encoding, "json" if self.encoding == "msgpack" else "msgpack"):
+            path = self._path(key, encoding)
+            try:
+                with open(path, "rb") as f:
+                    return self._loads(f.read(), encoding)
+            except FileNotFoundError:
+                continue
+            except (ValueError, TypeError) as e:
+                logger.error("Corrupt parsed record %s: %s", path, e)
+                return None
+        return None
+
+    def contains(self, key):
+        return os.path.exists(self._path(key))
+
+    def delete(self, key):
+        try:
+            os.unlink(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def keys(self):
+        """Yield every stored content hash."""
+        if not os.path.isdir(self.root):
+            return
+        for shard in sorted(os.listdir(self.root)):
+            shard_path = os.path.join(self.root, shard)
+            if len(shard) != 2 or not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                if not name.startswith("."):
+                    yield name.split(".", 1)[0]
+
+    def get_many(self, keys, workers=8):
+        """Load many records in one pass; returns {key: record} for the keys found."""
+        keys = list(keys)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            records = pool.map(self.get, keys)
+        return {key: record for key, record in zip(keys, records) if record is not None}
+
+    def load_all(self, workers=8):
+        """Load the whole store, e.g. for offline re-ranking."""
+        return self.get_many(self.keys(), workers=workers)
+
+    def export_jsonl(self, out_path):
+        """Write every record as one JSON line ({"key": ..., "record": ...}) for bulk consumers."""
+        count = 0
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, record in self.load_all().items():
+                f.write(json.dumps({"key": key, "record": record}, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+                count += 1
+        os.replace(tmp_path, out_path)
+        return count
@@ -0,0 +1,131 @@
+"""Helpers for serving the API from a pre-forking server (see gunicorn.conf.py).
+
+With gunicorn's preload_app the master builds the app once and forks the workers,
+so anything loaded before the fork (the sentence-transformer weights, the skill
+taxonomy and its alias tries, the TF-IDF stopword analyzer) is shared copy-on-write
+instead of loaded again per worker. Only read-only resources belong here: sqlite
+connections, thread pools and background threads are created lazily per process.
+
+The worker count comes from the CPUs and memory actually available to the
+process (cgroup limits included), unless WEB_CONCURRENCY sets it.
+"""
+import os
+import gc
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pre-fork configuration from environment variables
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "1") == "1"
+# Memory each worker needs on top of what it shares with the master (request buffers, parses, its own caches)
+WEB_WORKER_MEMORY_MB = int(os.getenv("WEB_WORKER_MEMORY_MB", "256"))
+# Share of the available memory the workers may use; the rest is left for the page cache and spikes
+WEB_MEMORY_FRACTION = float(os.getenv("WEB_MEMORY_FRACTION", "0.8"))
+WEB_MAX_WORKERS = int(os.getenv("WEB_MAX_WORKERS", "32"))
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+MEMINFO_PATH = "/proc/meminfo"
+
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+# ✅ Shared resources
+
+def load_shared_resources(models=PRELOAD_MODELS):
+    """Load the read-only resources every worker uses; returns {resource: seconds}."""
+    from backend.skills_taxonomy import get_skill_taxonomy
+    from backend.job_query import tfidf_analyzer
+
+    loaders = [("skill_taxonomy", get_skill_taxonomy), ("tfidf_analyzer", tfidf_analyzer)]
+    if models:
+        from backend.cascade import get_encoder
+        loaders.append(("sentence_encoder", get_encoder))
+
+    timings = {}
+    for name, load in loaders:
+        started = time.perf_counter()
+        try:
+            load()
+        except ImportError as e:
+            # Optional model dependencies: workers load them on first use instead (or not at all)
+            logger.warning("Not preloading %s: %s", name, e)
+            continue
+        timings[name] = round(time.perf_counter() - started, 3)
+    logger.info("Preloaded shared resources: %s", timings)
+    return timings
+
+
+def freeze_heap():
+    """Move everything allocated so far out of the collector's reach before forking.
+
+    A collection in a worker would otherwise write to the GC header of every inherited
+    object and copy the pages holding them; frozen objects are never visited.
+    """
+    gc.freeze()
+
+
+# ✅ Worker sizing
+
+def available_cpus(cgroup_root=CGROUP_ROOT):
+    """CPUs this process may use: its affinity mask, capped by a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    quota = _read(os.path.join(cgroup_root, "cpu.max"))
+    if quota:
+        limit, period = (quota.split() + ["100000"])[:2]
+        if limit != "max":
+            cpus = min(cpus, max(1, int(int(limit) / int(period))))
+    return cpus
+
+
+def available_memory_bytes(cgroup_root=CGROUP_ROOT, meminfo_path=MEMINFO_PATH):
+    """Memory still available to this process: MemAvailable, capped by the cgroup v2 limit's headroom."""
+    available = None
+    meminfo = _read(meminfo_path)
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemAvailable:"):
+                available = int(line.split()[1]) * 1024
+                break
+    limit = _read(os.path.join(cgroup_root, "memory.max"))
+    if limit and limit != "max":
+        used = int(_read(os.path.join(cgroup_root, "memory.current")) or 0)
+        headroom = max(int(limit) - used, 0)
+        available = headroom if available is None else min(available, headroom)
+    if available is None:
+        try:
+            available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError, AttributeError):
+            return None
+    return available
+
+
+def memory_worker_cap(memory_bytes=None, worker_memory_mb=WEB_WORKER_MEMORY_MB, memory_fraction=WEB_MEMORY_FRACTION):
+    """How many workers fit in the available memory (None when it can't be measured)."""
+    memory_bytes = available_memory_bytes() if memory_bytes is None else memory_bytes
+    if memory_bytes is None:
+        return None
+    return int(memory_bytes * memory_fraction // (worker_memory_mb * 1024 * 1024))
+
+
+def worker_count(cpus=None, memory_bytes=None, worker_memory_mb=WEB_WORKER_MEMORY_MB,
+                 memory_fraction=WEB_MEMORY_FRACTION, max_workers=WEB_MAX_WORKERS):
+    """gunicorn's 2 x CPUs + 1, reduced to what fits in memory; WEB_CONCURRENCY overrides it."""
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    cpus = cpus or available_cpus()
+    workers = 2 * cpus + 1
+    cap = memory_worker_cap(memory_bytes, worker_memory_mb, memory_fraction)
+    if cap is not None:
+        workers = min(workers, cap)
+    return max(1, min(workers, max_workers))
@@ -0,0 +1,180 @@
+import os
+import re
+import hmac
+import json
+import time
+import uuid
+import random
+import pstats
+import logging
+import cProfile
+import threading
+import tracemalloc
+from flask import request, jsonify, g, send_from_directory, abort
+
+logger = logging.getLogger(__name__)
+
+# Profiling configuration from environment variables
+# Profiling is disabled unless an admin token is configured.
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.getcwd(), "backend", "profiles"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "30"))
+
+_PROFILE_NAME = re.compile(r"^[A-Za-z0-9_.-]+\.(pstats|json)$")
+
+# tracemalloc is process-wide, so it runs while at least one profiled request is active
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = set()
+_tracemalloc_owned = False
+
+
+def is_admin():
+    """True when the request carries the configured admin token.
+
+    Only the X-Admin-Token header is accepted: query strings end up in access logs.
+    """
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(PROFILE_ADMIN_TOKEN) and hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+
+def should_profile():
+    """Profile on an explicit admin request, or for a sampled fraction of traffic."""
+    if not PROFILE_ADMIN_TOKEN:
+        return False
+    if request.path.startswith("/admin/profiles"):
+        return False
+    if is_admin() and (request.headers.get("X-Profile") == "1" or request.args.get("profile") == "1"):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _start_tracemalloc(profiler):
+    global _tracemalloc_owned
+    with _tracemalloc_lock:
+        if not _tracemalloc_users:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_owned = True
+            # The peak is process-wide: only reset it when no other profiled request is measuring it
+            tracemalloc.reset_peak()
+        else:
+            # Overlapping requests share one peak; their reports say so
+            profiler.concurrent = True
+            for other in _tracemalloc_users:
+                other.concurrent = True
+        _tracemalloc_users.add(profiler)
+
+
+def _stop_tracemalloc(profiler):
+    global _tracemalloc_owned
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        _tracemalloc_users.discard(profiler)
+        if not _tracemalloc_users and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+    return snapshot, peak
+
+
+class RequestProfiler:
+    """cProfile run plus tracemalloc snapshot for a single request."""
+
+    def __init__(self, profile_id):
+        self.profile_id = profile_id
+        self.profiler = cProfile.Profile()
+        self.started = None
+        self.concurrent = False  # Another profiled request overlapped this one
+
+    def start(self):
+        _start_tracemalloc(self)
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self, status):
+        self.profiler.disable()
+        duration = time.perf_counter() - self.started
+        snapshot, peak = _stop_tracemalloc(self)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+
+        pstats_path = os.path.join(PROFILE_DIR, f"{self.profile_id}.pstats")
+        self.profiler.dump_stats(pstats_path)
+
+        stats = pstats.Stats(self.profiler)
+        top_functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_N]
+        top_allocations = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]).statistics("lineno")[:PROFILE_TOP_N]
+
+        report = {
+            "profile_id": self.profile_id,
+            "method": request.method,
+            "path": request.path,
+            "status": status,
+            "duration_ms": round(duration * 1000.0, 3),
+            "peak_traced_bytes": peak,
+            # With overlapping profiled requests the peak covers their allocations too
+            "peak_includes_concurrent_requests": self.concurrent,
+            "top_functions_by_cumtime": [
+                {"function": f"{filename}:{line}({name})", "calls": calls,
+                 "tottime_s": round(tottime, 6), "cumtime_s": round(cumtime, 6)}
+                for (filename, line, name), (_, calls, tottime, cumtime, _) in top_functions
+            ],
+            "top_allocations": [
+                {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in top_allocations
+            ],
+            "pstats_file": os.path.basename(pstats_path),
+        }
+        json_path = os.path.join(PROFILE_DIR, f"{self.profile_id}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+        logger.info("Profile %s saved to %s", self.profile_id, PROFILE_DIR)
+        return report
+
+
+def init_profiling(app):
+    """Register the profiling hooks and admin download routes on the Flask app."""
+
+    @app.before_request
+    def start_request_profile():
+        if should_profile():
+            trace = g.get("trace")
+            profile_id = trace.request_id if trace is not None else f"{int(time.time() * 1000)}"
+            # The request id may come from a client header, so keep it filename-safe, and unique so that
+            # a repeated id can't overwrite another request's profile
+            profile_id = f"{re.sub(r'[^A-Za-z0-9_-]', '_', profile_id)[:64]}-{uuid.uuid4().hex[:8]}"
+            g.profiler = RequestProfiler(profile_id)
+            g.profiler.start()
+
+    @app.after_request
+    def stop_request_profile(response):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            try:
+                profiler.stop(response.status_code)
+                response.headers["X-Profile-ID"] = profiler.profile_id
+            except Exception as e:
+                logger.error("Failed to save profile %s: %s", profiler.profile_id, e)
+        return response
+
+    @app.route("/admin/profiles", methods=["GET"])
+    def list_profiles():
+        """List saved profiles (admin only)."""
+        if not is_admin():
+            abort(403)
+        if not os.path.isdir(PROFILE_DIR):
+            return jsonify({"profiles": []}), 200
+        names = sorted(name for name in os.listdir(PROFILE_DIR) if _PROFILE_NAME.match(name))
+        return jsonify({"profiles": names}), 200
+
+    @app.route("/admin/profiles/<filename>", methods=["GET"])
+    def download_profile(filename):
+        """Download a saved .pstats or .json profile (admin only)."""
+        if not is_admin():
+            abort(403)
+        if not _PROFILE_NAME.match(filename):
+            abort(404)
+        return send_from_directory(PROFILE_DIR, filename, as_attachment=True)
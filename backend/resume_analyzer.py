@@ -1,3 +1,4 @@
+import io
 import os
 import re
 from flask import Flask, request, jsonify, url_for
@@ -9,22 +10,31 @@ from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from backend.db_connection import insert_resume, update_resume_status
+from backend.field_extractor import extract_fields
+from backend.search_index import get_search_index
+from backend.inference_batcher import EncodeBatcher
+from backend.job_query import get_job_query
+from backend.upload_storage import persist_async, record_stored_file
+from backend.parsed_store import hash_bytes
+from backend.metrics import (
+    time_stage, EXTRACTION_SECONDS, OCR_SECONDS, CLEANING_SECONDS, EMBEDDING_SECONDS, FIELD_EXTRACTION_SECONDS
+)
 
 app = Flask(__name__)
 
-# Set up upload folder
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)  # Ensure the upload folder exists
-
 # Load the lightweight pre-trained BERT model
 bert_model = SentenceTransformer("all-MiniLM-L6-v2")
 
+# Shared batcher so concurrent requests are encoded together instead of one by one
+encode_batcher = EncodeBatcher(bert_model)
+
 # Function to clean and format extracted text
 def clean_text(text):
-    text = re.sub(r"\(cid:\d+\)", " ", text)  # Remove artifacts
-    text = re.sub(r"\s{2,}", "\n", text).strip()  # Remove excessive spaces
-    text = text.replace("○␣", "✅ ")  # Fix bullet points
-    text = text.replace("•", "✅ ")
+    with time_stage(CLEANING_SECONDS):
+        text = re.sub(r"\(cid:\d+\)", " ", text)  # Remove artifacts
+        text = re.sub(r"\s{2,}", "\n", text).strip()  # Remove excessive spaces
+        text = text.replace("○␣", "✅ ")  # Fix bullet points
+        text = text.replace("•", "✅ ")
     return text
 
 # Function to extract text from resumes
@@ -32,22 +42,35 @@ def extract_text(uploaded_file):
     """
     Extracts text from various resume formats (PDF, DOCX, TXT, PNG, JPG).
     """
-    file_extension = uploaded_file.filename.split(".")[-1].lower()
+    return extract_text_from_bytes(uploaded_file.read(), uploaded_file.filename)
+
+# Function to extract text from an in-memory resume
+def extract_text_from_bytes(data, filename):
+    """
+    Extracts text from resume bytes (or a memoryview); filename decides the format.
+    """
+    file_extension = filename.split(".")[-1].lower()
+    uploaded_file = io.BytesIO(data)
 
     if file_extension == "pdf":
-        with pdfplumber.open(uploaded_file) as pdf:
-            text = "\n".join([page.extract_text() or "" for page in pdf.pages])
+        with time_stage(EXTRACTION_SECONDS, format="pdf"):
+            with pdfplumber.open(uploaded_file) as pdf:
+                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
     
     elif file_extension in ["docx", "doc"]:
-        doc = Document(uploaded_file)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        with time_stage(EXTRACTION_SECONDS, format="docx"):
+            doc = Document(uploaded_file)
+            text = "\n".join([para.text for para in doc.paragraphs])
     
     elif file_extension in ["png", "jpg", "jpeg"]:
-        image = Image.open(uploaded_file)
-        text = pytesseract.image_to_string(image)
+        with time_stage(EXTRACTION_SECONDS, format="image"):
+            image = Image.open(uploaded_file)
+            with time_stage(OCR_SECONDS):
+                text = pytesseract.image_to_string(image)
     
     elif file_extension == "txt":
-        text = uploaded_file.read().decode("utf-8", errors="ignore")
+        with time_stage(EXTRACTION_SECONDS, format="txt"):
+            text = bytes(data).decode("utf-8", errors="ignore")
     
     else:
         return "❌ Unsupported file format."
@@ -58,17 +81,16 @@ def extract_text(uploaded_file):
 def calculate_similarity(resume_text, job_desc_text):
     """
     Uses BERT embeddings to compare resume and job description for a more accurate similarity score.
+    job_desc_text may be a string or a JobQuery; the JD embedding is computed once per distinct JD.
     """
-    if not resume_text.strip() or not job_desc_text.strip():
+    job_query = get_job_query(job_desc_text)
+    if not resume_text.strip() or not job_query.text.strip():
         return 0.0  # Return 0% similarity if either is empty
 
-    # Generate embeddings (numerical representations)
-    resume_embedding = bert_model.encode(resume_text, convert_to_tensor=True)
-    job_desc_embedding = bert_model.encode(job_desc_text, convert_to_tensor=True)
-
-    # Convert tensors to NumPy arrays
-    resume_embedding = resume_embedding.cpu().numpy().reshape(1, -1)
-    job_desc_embedding = job_desc_embedding.cpu().numpy().reshape(1, -1)
+    # Generate embeddings (numerical representations) in the shared batch
+    with time_stage(EMBEDDING_SECONDS):
+        job_desc_embedding = job_query.embedding(encode_batcher.encode).reshape(1, -1)
+        resume_embedding = encode_batcher.encode([resume_text])[0].reshape(1, -1)
 
     # Compute cosine similarity
     similarity_score = cosine_similarity(resume_embedding, job_desc_embedding)[0][0]
@@ -103,21 +125,40 @@ def upload_resume():
     if not file or not job_description:
         return jsonify({"error": "File and job description are required"}), 400
 
-    # Save the resume temporarily
-    file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-    file.save(file_path)
+    # Read the upload once; parse it from memory and save the original to the blob store in the background
+    data = file.read()
+    _, persisted = persist_async(file.filename, hash_bytes(data), data=data)
 
     # Extract text from the uploaded resume
-    resume_text = extract_text(file)
+    resume_text = extract_text_from_bytes(data, file.filename)
 
     # Calculate similarity score using BERT
     ranking_score = calculate_similarity(resume_text, job_description)
 
     # Store the resume data in the database
-    insert_resume(file.filename, file_path, job_description, ranking_score)
+    with time_stage(FIELD_EXTRACTION_SECONDS):
+        fields = extract_fields(resume_text)
+    resume_id = insert_resume(
+        name=fields["name"],
+        email=fields["email"],
+        phone=fields["phone"],
+        skills=", ".join(fields["skills"]),
+        experience=fields["experience"],
+        education=fields["education"],
+        file_path=None,  # Set by record_stored_file once the blob is written
+        file_format=file.filename.rsplit(".", 1)[-1].lower(),
+        job_description=job_description,
+        ranking_score=ranking_score,
+        skill_ids=fields["skill_ids"],
+    )
+    # Without a resume_id the callback releases the stored blob again
+    persisted.add_done_callback(lambda future: record_stored_file(resume_id, file.filename, future))
+    if not resume_id:
+        return jsonify({"error": "Failed to insert resume into the database"}), 500
+    get_search_index().add_document(resume_id, resume_text)
 
     # Update status to "Processed"
-    update_resume_status(file_path, "Processed")
+    update_resume_status(resume_id, "Processed")
 
     return jsonify({"message": "Resume processed successfully", "ranking_score": ranking_score})
 
@@ -1,132 +1,220 @@
 import PyPDF2
 import docx
+import io
 import os
 import logging
+from contextlib import nullcontext
 from PIL import Image
 import pytesseract
-import json  # Ensure JSON is properly handled
+from backend.metrics import (
+    time_stage, EXTRACTION_SECONDS, OCR_SECONDS, CLEANING_SECONDS, SCORING_SECONDS, FIELD_EXTRACTION_SECONDS,
+    CACHE_HITS, CACHE_MISSES, ERRORS
+)
+from backend.parsed_store import ParsedStore, hash_bytes, hash_file, PARSER_VERSION
+from backend.field_extractor import extract_fields
+from backend.job_query import get_job_query
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Module logger; levels and handlers come from backend.logging_config
+logger = logging.getLogger(__name__)
 
-def parse_resume(file_path, output_path, job_description=None):
+# General keywords that add to every resume's score, whatever the job description
+DEFAULT_KEYWORDS = [keyword.lower() for keyword in
+                    ['python', 'data science', 'machine learning', 'software engineer', 'C#', 'AI']]
+
+def parse_resume(file_path, output_path, job_description=None, content_hash=None, find_canonical=None):
     """Parses resumes from different formats (PDF, DOCX, TXT, image files) and extracts relevant data."""
-    
-    parsed_data = {}
-    ranking_score = 0.0  # Default ranking score
-    
     try:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"The file at {file_path} does not exist.")
 
-        if file_path.endswith('.pdf'):
-            parsed_data = parse_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            parsed_data = parse_docx(file_path)
-        elif file_path.endswith('.txt'):
-            parsed_data = parse_txt(file_path)
-        elif file_path.lower().endswith(('.png', '.jpg', '.jpeg')):
-            parsed_data = parse_image(file_path)
-        else:
-            raise ValueError("Unsupported file format")
-        
-        # Calculate ranking score based on the parsed text and job description
-        if parsed_data.get("text"):
-            ranking_score = calculate_ranking_score(parsed_data["text"], job_description)
-        
-        # Save parsed data to output path (optional)
-        os.makedirs(output_path, exist_ok=True)
-        with open(os.path.join(output_path, 'parsed_data.json'), 'w', encoding='utf-8') as f:
-            json.dump(parsed_data, f, ensure_ascii=False, indent=4)
-        
-        logging.debug(f"Parsed data: {parsed_data}")
-        logging.debug(f"Calculated ranking score: {ranking_score}")
-        
-        return {"ranking_score": ranking_score, "parsed_data": parsed_data}  # Return as dictionary
+        content_hash = content_hash or hash_file(file_path)
+        return _parse_and_score(content_hash, file_path, file_path, output_path, job_description, find_canonical)
     
     except Exception as e:
-        logging.error(f"Error parsing resume: {e}")
+        ERRORS.inc(stage="parse")
+        logger.error("Error parsing resume: %s", e)
         return {"error": str(e)}
 
-def parse_pdf(file_path):
+def parse_resume_bytes(data, filename, output_path, job_description=None, content_hash=None, find_canonical=None):
+    """Parses a resume held in memory (bytes or memoryview), e.g. straight from the request stream."""
+    try:
+        content_hash = content_hash or hash_bytes(data)
+        return _parse_and_score(content_hash, data, filename, output_path, job_description, find_canonical)
+
+    except Exception as e:
+        ERRORS.inc(stage="parse")
+        logger.error("Error parsing resume: %s", e)
+        return {"error": str(e)}
+
+def _parse_and_score(content_hash, source, filename, output_path, job_description, find_canonical=None):
+    """Parses (or reuses the stored parse of) a document and scores it.
+
+    find_canonical(text), if given, is asked for the content hash of an already stored
+    near-duplicate once the text is extracted; a hit aliases this document to that parse.
+    """
+    ranking_score = 0.0  # Default ranking score
+    alias_of = None
+
+    # Parsed output is stored by content hash, so identical files are parsed once
+    store = ParsedStore(output_path)
+    cached = store.get(content_hash)
+    if cached and cached.get("parser_version") == PARSER_VERSION:
+        CACHE_HITS.inc(cache="parsed_store")
+        parsed_data = cached["parsed_data"]
+    else:
+        CACHE_MISSES.inc(cache="parsed_store")
+        parsed_data = extract_parsed_data(source, filename)
+        canonical_hash = find_canonical(parsed_data["text"]) if find_canonical and parsed_data.get("text") else None
+        canonical = store.get(canonical_hash) if canonical_hash and canonical_hash != content_hash else None
+        if canonical and canonical.get("parser_version") == PARSER_VERSION:
+            # Near-duplicate: reuse the canonical document's fields (and, through its text, its embedding)
+            CACHE_HITS.inc(cache="near_duplicate")
+            store.put_alias(content_hash, canonical_hash)
+            parsed_data, alias_of = canonical["parsed_data"], canonical_hash
+        # Empty text usually means a transient extraction failure (e.g. OCR missing); don't cache it
+        elif parsed_data.get("text"):
+            # Name, email, phone, skills, education and experience for the resumes table
+            with time_stage(FIELD_EXTRACTION_SECONDS):
+                parsed_data.update(extract_fields(parsed_data["text"]))
+            store.put(content_hash, {
+                "parser_version": PARSER_VERSION,
+                "source_file": os.path.basename(filename),
+                "parsed_data": parsed_data,
+            })
+
+    # Calculate ranking score based on the parsed text and job description
+    if parsed_data.get("text"):
+        with time_stage(SCORING_SECONDS, scorer="keyword"):
+            ranking_score = calculate_ranking_score(parsed_data["text"], job_description, parsed_data.get("skill_ids"))
+
+    logger.debug("Parsed data: %s", parsed_data, extra={"payload": True})
+    logger.debug("Calculated ranking score: %s", ranking_score)
+
+    result = {"ranking_score": ranking_score, "parsed_data": parsed_data, "content_hash": content_hash}
+    if alias_of:
+        result["alias_of"] = alias_of
+    return result  # Return as dictionary
+
+def extract_parsed_data(source, filename=None):
+    """Dispatches to the parser for the file's format.
+
+    source is a file path, raw bytes/memoryview or a binary file object; filename
+    (defaulting to source when it is a path) decides the format.
+    """
+    filename = (filename or source).lower()
+    if filename.endswith('.pdf'):
+        with time_stage(EXTRACTION_SECONDS, format="pdf"):
+            return parse_pdf(source)
+    elif filename.endswith('.docx'):
+        with time_stage(EXTRACTION_SECONDS, format="docx"):
+            return parse_docx(source)
+    elif filename.endswith('.txt'):
+        with time_stage(EXTRACTION_SECONDS, format="txt"):
+            return parse_txt(source)
+    elif filename.endswith(('.png', '.jpg', '.jpeg')):
+        with time_stage(EXTRACTION_SECONDS, format="image"):
+            return parse_image(source)
+    else:
+        raise ValueError("Unsupported file format")
+
+def _open_binary(source):
+    """Binary file object for a path, in-memory bytes or an already open stream."""
+    if isinstance(source, str):
+        return open(source, 'rb')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return nullcontext(source)
+
+def parse_pdf(source):
     """Parses PDF resumes."""
     text = ""
     try:
-        with open(file_path, 'rb') as f:
+        with _open_binary(source) as f:
             reader = PyPDF2.PdfReader(f)
             for page in range(len(reader.pages)):
                 page_text = reader.pages[page].extract_text() or ""
                 text += page_text
         text = clean_text(text)
-        logging.debug(f"PDF parsing completed with text: {text[:300]}...")
+        logger.debug("PDF parsing completed with text: %s", text, extra={"payload": True})
     except Exception as e:
-        logging.error(f"Error parsing PDF file: {e}")
+        ERRORS.inc(stage="extract")
+        logger.error("Error parsing PDF file: %s", e)
     return {"text": text}
 
-def parse_docx(file_path):
+def parse_docx(source):
     """Parses DOCX resumes."""
     text = ""
     try:
-        doc = docx.Document(file_path)
+        with _open_binary(source) as f:
+            doc = docx.Document(f)
         text = "\n".join([para.text for para in doc.paragraphs if para.text.strip() != ""])
         text = clean_text(text)
-        logging.debug(f"DOCX parsing completed with text: {text[:300]}...")
+        logger.debug("DOCX parsing completed with text: %s", text, extra={"payload": True})
     except Exception as e:
-        logging.error(f"Error parsing DOCX file: {e}")
+        ERRORS.inc(stage="extract")
+        logger.error("Error parsing DOCX file: %s", e)
     return {"text": text}
 
-def parse_txt(file_path):
+def parse_txt(source):
     """Parses TXT resumes."""
     text = ""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        with _open_binary(source) as f:
+            text = f.read().decode('utf-8')
         text = clean_text(text)
-        logging.debug(f"TXT parsing completed with text: {text[:300]}...")
+        logger.debug("TXT parsing completed with text: %s", text, extra={"payload": True})
     except Exception as e:
-        logging.error(f"Error parsing TXT file: {e}")
+        ERRORS.inc(stage="extract")
+        logger.error("Error parsing TXT file: %s", e)
     return {"text": text}
 
-def parse_image(file_path):
+def parse_image(source):
     """Parses image files using OCR."""
     text = ""
     try:
-        img = Image.open(file_path)
-        text = pytesseract.image_to_string(img)
+        with _open_binary(source) as f:
+            img = Image.open(f)
+            with time_stage(OCR_SECONDS):
+                text = pytesseract.image_to_string(img)
         text = clean_text(text)
-        logging.debug(f"Image parsing completed with text: {text[:300]}...")
+        logger.debug("Image parsing completed with text: %s", text, extra={"payload": True})
     except Exception as e:
-        logging.error(f"Error parsing image file: {e}")
+        ERRORS.inc(stage="extract")
+        logger.error("Error parsing image file: %s", e)
     return {"text": text}
 
 def clean_text(text):
     """Cleans unwanted characters from resume text."""
-    return text.replace('\xa0', ' ').replace('\x00', '').strip()
+    with time_stage(CLEANING_SECONDS):
+        return text.replace('\xa0', ' ').replace('\x00', '').strip()
+
+def calculate_ranking_score(resume_text, job_description=None, skill_ids=None):
+    """Calculates ranking score based on matching keywords.
 
-def calculate_ranking_score(resume_text, job_description=None):
-    """Calculates ranking score based on matching keywords."""
+    job_description may be a string or a JobQuery; its skills are extracted once per
+    distinct JD (see backend.job_query). Pass the resume's skill_ids when they are
+    already known to skip matching the text.
+    """
     score = 0.0
-    keywords = ['python', 'data science', 'machine learning', 'software engineer', 'C#', 'AI']
+    resume_lower = resume_text.lower()
     
-    for keyword in keywords:
-        if keyword.lower() in resume_text.lower():
+    for keyword in DEFAULT_KEYWORDS:
+        if keyword in resume_lower:
             score += 1.0
     
     if job_description:
-        job_keywords = extract_keywords_from_job_description(job_description)
-        for keyword in job_keywords:
-            if keyword.lower() in resume_text.lower():
-                score += 1.5
+        job_query = get_job_query(job_description)
+        score += 1.5 * job_query.skill_overlap(resume_text, skill_ids)
     
-    logging.debug(f"Calculated ranking score: {score}")
+    logger.debug("Calculated ranking score: %s", score)
     return score
 
 def extract_keywords_from_job_description(job_description):
-    """Extracts keywords from job description."""
-    # You can expand this with a more sophisticated keyword extraction algorithm
-    return ['python', 'data analysis', 'teamwork', 'communication', 'problem-solving']
+    """Extracts keywords from job description: the skills it names, else its most frequent terms."""
+    return get_job_query(job_description).keywords
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
     file_path = "data/resume.pdf"  # Example file path
     output_path = "path/to/output"  # Specify the output path where parsed data will be saved
     job_description = "Looking for a software engineer with Python and ML experience."
@@ -134,6 +222,6 @@ if __name__ == "__main__":
     result = parse_resume(file_path, output_path, job_description)
     
     if "ranking_score" in result:
-        logging.info(f"Resume parsing completed successfully with ranking score: {result['ranking_score']}")
+        logger.info("Resume parsing completed successfully with ranking score: %s", result["ranking_score"])
     else:
-        logging.error("Resume parsing failed.")
+        logger.error("Resume parsing failed.")
@@ -0,0 +1,86 @@
+"""Rank one resume pool against many job descriptions at once.
+
+Each resume is embedded once (and cached in the embedding store), the K job
+descriptions are encoded in one batch, and the whole K x N cosine score matrix
+is a single matrix product. From it come the top k resumes for every job and
+the best-matching job for every resume. Job description embeddings come from the
+shared JobQuery cache, so a repeated JD is not encoded again.
+"""
+import time
+import logging
+
+import numpy as np
+
+from backend.bm25 import BM25Ranker
+from backend.cascade import get_encoder, stored_texts, top_scored
+from backend.embedding_store import get_embedding_store, normalize_rows
+from backend.job_query import get_job_query, job_embeddings
+from backend.search_index import get_search_index
+
+logger = logging.getLogger(__name__)
+
+
+def prefilter_pool(index, job_descriptions, top_n):
+    """Sorted doc ids in the union of every job's BM25 top_n (the whole pool when top_n is falsy)."""
+    if not top_n:
+        return index.all_documents()
+    ranker = BM25Ranker(index)
+    pools = [top_scored(*ranker.score_all(job_description), top_n)[0] for job_description in job_descriptions]
+    return np.unique(np.concatenate(pools)) if pools else np.zeros(0, dtype=np.int64)
+
+
+def top_k_per_row(scores, k):
+    """(columns, values) of each row's k best scores, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64), np.zeros((scores.shape[0], 0))
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(columns, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def score_matrix(job_descriptions, top_k=10, prefilter_top_n=None, index=None, load_texts=None, encode=None,
+                 store=None, best_job_limit=None):
+    """Score the pool against every job description in one pass.
+
+    Returns {"resume_ids": [...], "scores": K x N array (cosine x 100), "top": [[(resume_id, score)] per job],
+    "best_job": [(resume_id, job_index, score)] best first (at most best_job_limit), "timings": {step: seconds}}.
+    """
+    index = index or get_search_index()
+    load_texts = load_texts or (lambda doc_ids: stored_texts(index, doc_ids))
+    store = store or get_embedding_store()
+    timings = {}
+
+    started = time.perf_counter()
+    doc_ids = prefilter_pool(index, job_descriptions, prefilter_top_n)
+    texts = load_texts(doc_ids.tolist())
+    doc_ids = np.array([doc_id for doc_id in doc_ids.tolist() if texts.get(doc_id)], dtype=np.int64)
+    timings["pool"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    encode = encode or get_encoder()
+    resumes = store.embed([texts[doc_id] for doc_id in doc_ids.tolist()], encode)
+    jobs = normalize_rows(job_embeddings([get_job_query(job) for job in job_descriptions], encode))
+    timings["embedding"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if doc_ids.size:
+        scores = (jobs @ resumes.T).astype(np.float64) * 100
+    else:
+        scores = np.zeros((len(job_descriptions), 0))
+    columns, values = top_k_per_row(scores, top_k)
+    top = [
+        [(int(doc_ids[column]), round(float(value), 2)) for column, value in zip(row_columns, row_values)]
+        for row_columns, row_values in zip(columns, values)
+    ]
+    best_job = []
+    if doc_ids.size:
+        best = scores.argmax(axis=0)
+        best_scores = scores[best, np.arange(doc_ids.size)]
+        order = np.lexsort((doc_ids, -best_scores))[:best_job_limit]
+        best_job = [(int(doc_ids[i]), int(best[i]), round(float(best_scores[i]), 2)) for i in order]
+    timings["scoring"] = time.perf_counter() - started
+
+    logger.debug("Scored %s resumes against %s job descriptions: %s", doc_ids.size, len(job_descriptions), timings)
+    return {"resume_ids": doc_ids, "scores": scores, "top": top, "best_job": best_job, "timings": timings}
@@ -0,0 +1,626 @@
+"""Persistent inverted index over parsed resume text.
+
+Postings live in SQLite, one row per (term, segment). Each row is a zlib-compressed
+array of delta-encoded doc ids, term frequencies and delta-encoded positions, so
+boolean queries only decompress the terms they touch and phrase queries can check
+adjacency. New documents are written as small segments; a background merge folds
+every MERGE_FACTOR segments of one level into one segment of the next level and
+drops deleted (tombstoned) documents along the way.
+
+Usage:
+    python -m backend.search_index --rebuild       # index every resume in the database
+    python -m backend.search_index --query 'kubernetes AND (go OR golang) -intern'
+"""
+import os
+import re
+import time
+import zlib
+import sqlite3
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from backend.skills_taxonomy import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Search index configuration from environment variables
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", os.path.join(os.getcwd(), "backend", "search_index.sqlite3"))
+MERGE_FACTOR = int(os.getenv("SEARCH_MERGE_FACTOR", "8"))
+POSTINGS_CACHE_SIZE = int(os.getenv("SEARCH_POSTINGS_CACHE_SIZE", "2048"))
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def encode_postings(doc_ids, freqs, positions):
+    """Compress one posting list: sorted doc ids, per-doc frequencies, and each doc's sorted positions."""
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    freqs = np.asarray(freqs, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    doc_gaps = np.diff(doc_ids, prepend=0)
+    position_gaps = np.diff(positions, prepend=0)
+    if positions.size:
+        # Positions restart at every document, so the first gap of each document is the position itself
+        starts = np.cumsum(freqs) - freqs
+        position_gaps[starts] = positions[starts]
+    header = np.array([doc_ids.size, positions.size], dtype=np.int64)
+    payload = np.concatenate([header, doc_gaps, freqs, position_gaps]).astype("<u4")
+    return zlib.compress(payload.tobytes(), 1)
+
+
+def decode_postings(blob):
+    """Inverse of encode_postings: (doc_ids, freqs, positions) as int64 arrays."""
+    values = np.frombuffer(zlib.decompress(blob), dtype="<u4").astype(np.int64)
+    n_docs, n_positions = int(values[0]), int(values[1])
+    doc_ids = np.cumsum(values[2:2 + n_docs])
+    freqs = values[2 + n_docs:2 + 2 * n_docs]
+    gaps = values[2 + 2 * n_docs:2 + 2 * n_docs + n_positions]
+    positions = np.cumsum(gaps)
+    if n_positions:
+        starts = np.cumsum(freqs) - freqs
+        positions -= np.repeat(positions[starts] - gaps[starts], freqs)
+    return doc_ids, freqs, positions
+
+
+def _concat_postings(parts):
+    """Merge posting lists of disjoint document sets into one, ordered by doc id."""
+    parts = [p for p in parts if p[0].size]
+    if not parts:
+        return _EMPTY, _EMPTY, _EMPTY
+    if len(parts) == 1:
+        return parts[0]
+    doc_ids = np.concatenate([p[0] for p in parts])
+    freqs = np.concatenate([p[1] for p in parts])
+    positions = np.concatenate([p[2] for p in parts])
+    order = np.argsort(doc_ids, kind="stable")
+    if np.array_equal(order, np.arange(order.size)):
+        return doc_ids, freqs, positions
+    # Reorder the position runs along with their documents
+    starts = np.cumsum(freqs) - freqs
+    new_freqs = freqs[order]
+    new_starts = np.cumsum(new_freqs) - new_freqs
+    if not positions.size:
+        return doc_ids[order], new_freqs, positions
+    position_index = np.arange(positions.size) + np.repeat(starts[order] - new_starts, new_freqs)
+    return doc_ids[order], new_freqs, positions[position_index]
+
+
+def _drop_docs(postings, doc_ids):
+    """Remove the given documents (e.g. tombstones) from a posting list."""
+    ids, freqs, positions = postings
+    if not doc_ids.size or not ids.size:
+        return postings
+    keep = ~np.isin(ids, doc_ids)
+    if keep.all():
+        return postings
+    return ids[keep], freqs[keep], positions[np.repeat(keep, freqs)] if positions.size else positions
+
+
+# Set operations on sorted, duplicate-free id arrays; searchsorted and run-aware sorts avoid a full re-sort
+def _intersect_sorted(a, b):
+    if a.size > b.size:
+        a, b = b, a
+    if not a.size:
+        return a
+    found = b[np.minimum(np.searchsorted(b, a), b.size - 1)] == a
+    return a[found]
+
+
+def _difference_sorted(a, b):
+    if not a.size or not b.size:
+        return a
+    found = b[np.minimum(np.searchsorted(b, a), b.size - 1)] == a
+    return a[~found]
+
+
+def _union_sorted(a, b):
+    if not a.size:
+        return b
+    if not b.size:
+        return a
+    merged = np.concatenate([a, b])
+    merged.sort(kind="stable")  # Timsort: two sorted runs merge in linear time
+    return merged[np.concatenate(([True], merged[1:] != merged[:-1]))]
+
+
+# ✅ Query parsing: terms, "quoted phrases", AND / OR / NOT (or -term), parentheses
+_QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|-(?=\S)|[^\s()"]+')
+
+
+def parse_query(query):
+    """Parse a query into a small tree of ("term", t), ("phrase", [t, ...]), ("and"|"or", [...]), ("not", node).
+
+    Operators are upper case (AND, OR, NOT); adjacent clauses are ANDed and OR binds looser than AND.
+    """
+    tokens = _QUERY_TOKEN.findall(query)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        clauses = [parse_and()]
+        while peek() == "OR":
+            take()
+            clauses.append(parse_and())
+        clauses = [c for c in clauses if c is not None]
+        return clauses[0] if len(clauses) == 1 else ("or", clauses) if clauses else None
+
+    def parse_and():
+        clauses = []
+        while peek() is not None and peek() not in (")", "OR"):
+            if peek() == "AND":
+                take()
+                continue
+            clause = parse_unary()
+            if clause is not None:
+                clauses.append(clause)
+        return clauses[0] if len(clauses) == 1 else ("and", clauses) if clauses else None
+
+    def parse_unary():
+        token = peek()
+        if token in ("NOT", "-"):
+            take()
+            operand = parse_unary()
+            return ("not", operand) if operand is not None else None
+        return parse_primary()
+
+    def parse_primary():
+        token = take()
+        if token == "(":
+            node = parse_or()
+            if peek() == ")":
+                take()
+            return node
+        if token == ")":
+            return None
+        terms = tokenize(token.strip('"'))
+        if not terms:
+            return None
+        # A quoted phrase, or a single word that tokenizes into several terms ("ci/cd")
+        return ("term", terms[0]) if len(terms) == 1 else ("phrase", terms)
+
+    return parse_or()
+
+
+class SearchIndex:
+    """Segmented, compressed inverted index stored in one SQLite file."""
+
+    def __init__(self, path=SEARCH_INDEX_PATH, merge_factor=MERGE_FACTOR, background_merge=True):
+        self.path = path
+        self.merge_factor = merge_factor
+        self.background_merge = background_merge
+        self._local = threading.local()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._merge_pool = None
+        self._merge_pid = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0);
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                content_hash TEXT,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tombstones (doc_id INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS segments (
+                segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                level INTEGER NOT NULL,
+                doc_count INTEGER NOT NULL,
+                doc_lengths BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment_id INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (term, segment_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_segment_idx ON postings (segment_id);
+        """)
+        conn.commit()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(segments)")}
+        if "doc_lengths" not in columns:
+            raise RuntimeError(f"{path} was built by an older index format; delete it and run --rebuild")
+
+    def _conn(self):
+        # sqlite connections are per thread (and per process after a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _generation(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    @staticmethod
+    def _bump_generation(conn):
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    # ✅ Writes
+
+    def add_document(self, doc_id, text, content_hash=None):
+        """Index one document; returns False if doc_id is already indexed."""
+        return self.add_documents([(doc_id, text, content_hash)]) == 1
+
+    def add_documents(self, documents):
+        """Index (doc_id, text, content_hash) tuples as one new segment; returns how many were added."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            postings = {}
+            rows = []
+            for doc_id, text, content_hash in documents:
+                doc_id = int(doc_id)
+                exists = conn.execute(
+                    "SELECT 1 FROM documents WHERE doc_id = ? UNION ALL SELECT 1 FROM tombstones WHERE doc_id = ?",
+                    (doc_id, doc_id),
+                ).fetchone()
+                if exists:
+                    continue
+                terms = tokenize(text or "")
+                rows.append((doc_id, content_hash, len(terms)))
+                doc_positions = {}
+                for position, term in enumerate(terms):
+                    doc_positions.setdefault(term, []).append(position)
+                for term, positions in doc_positions.items():
+                    postings.setdefault(term, []).append((doc_id, positions))
+
+            if rows:
+                # Each segment carries its documents' lengths (encoded like a posting list) for BM25
+                lengths = sorted((doc_id, length) for doc_id, _, length in rows)
+                segment_id = conn.execute(
+                    "INSERT INTO segments (level, doc_count, doc_lengths) VALUES (0, ?, ?)",
+                    (len(rows), encode_postings([d for d, _ in lengths], [n for _, n in lengths], [])),
+                ).lastrowid
+                conn.executemany("INSERT INTO documents (doc_id, content_hash, length) VALUES (?, ?, ?)", rows)
+                conn.executemany(
+                    "INSERT INTO postings (term, segment_id, data) VALUES (?, ?, ?)",
+                    ((term, segment_id, self._encode_entries(entries)) for term, entries in postings.items()),
+                )
+                self._bump_generation(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if rows:
+            self._schedule_merge()
+        return len(rows)
+
+    @staticmethod
+    def _encode_entries(entries):
+        entries.sort(key=lambda entry: entry[0])
+        doc_ids = [doc_id for doc_id, _ in entries]
+        freqs = [len(positions) for _, positions in entries]
+        positions = [p for _, doc_positions in entries for p in doc_positions]
+        return encode_postings(doc_ids, freqs, positions)
+
+    def delete_document(self, doc_id):
+        """Tombstone a document; its postings are dropped at the next merge."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = conn.execute("DELETE FROM documents WHERE doc_id = ?", (int(doc_id),)).rowcount
+            if deleted:
+                conn.execute("INSERT OR IGNORE INTO tombstones (doc_id) VALUES (?)", (int(doc_id),))
+                self._bump_generation(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(deleted)
+
+    # ✅ Merging
+
+    def _schedule_merge(self):
+        if not self.background_merge:
+            self.merge()
+            return
+        if self._merge_pool is None or self._merge_pid != os.getpid():
+            self._merge_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-merge")
+            self._merge_pid = os.getpid()
+        self._merge_pool.submit(self._merge_quietly)
+
+    def _merge_quietly(self):
+        try:
+            self.merge()
+        except Exception as e:
+            logger.error("Search index merge failed: %s", e)
+
+    def merge(self, force=False):
+        """Merge full levels (or, with force=True, everything) into larger segments."""
+        merged = 0
+        while True:
+            conn = self._conn()
+            if force:
+                segments = [row[0] for row in conn.execute("SELECT segment_id FROM segments")]
+                if len(segments) <= 1 and not conn.execute("SELECT 1 FROM tombstones LIMIT 1").fetchone():
+                    return merged
+                level = conn.execute("SELECT COALESCE(MAX(level), 0) FROM segments").fetchone()[0]
+            else:
+                row = conn.execute(
+                    "SELECT level FROM segments GROUP BY level HAVING COUNT(*) >= ? ORDER BY level LIMIT 1",
+                    (self.merge_factor,),
+                ).fetchone()
+                if row is None:
+                    return merged
+                level = row[0]
+                segments = [r[0] for r in conn.execute(
+                    "SELECT segment_id FROM segments WHERE level = ? ORDER BY segment_id LIMIT ?",
+                    (level, self.merge_factor),
+                )]
+            if not segments:
+                return merged
+            self._merge_segments(segments, level + 1)
+            merged += 1
+            if force:
+                return merged
+
+    def _merge_segments(self, segment_ids, level):
+        conn = self._conn()
+        placeholders = ",".join("?" * len(segment_ids))
+        # Segments never change once written, so the merged one is built from a read snapshot without
+        # blocking writers; the write lock is only held to swap it in
+        conn.execute("BEGIN")
+        try:
+            tombstones = np.fromiter((r[0] for r in conn.execute("SELECT doc_id FROM tombstones")), dtype=np.int64)
+            doc_lengths = _drop_docs(_concat_postings([decode_postings(r[0]) for r in conn.execute(
+                f"SELECT doc_lengths FROM segments WHERE segment_id IN ({placeholders})", segment_ids
+            )]), tombstones)
+            rows = conn.execute(
+                f"SELECT term, data FROM postings WHERE segment_id IN ({placeholders}) ORDER BY term", segment_ids
+            )
+            merged = []
+            current_term, parts = None, []
+
+            def flush_term():
+                postings = _drop_docs(_concat_postings(parts), tombstones)
+                if postings[0].size:
+                    merged.append((current_term, encode_postings(*postings)))
+
+            for term, data in rows:
+                if term != current_term and parts:
+                    flush_term()
+                    parts = []
+                current_term = term
+                parts.append(decode_postings(data))
+            if parts:
+                flush_term()
+        finally:
+            conn.execute("COMMIT")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Segments may have been merged by another worker in the meantime
+            live = [r[0] for r in conn.execute(
+                f"SELECT segment_id FROM segments WHERE segment_id IN ({placeholders})", segment_ids
+            )]
+            if len(live) != len(segment_ids):
+                conn.execute("ROLLBACK")
+                return
+            conn.execute(f"DELETE FROM postings WHERE segment_id IN ({placeholders})", segment_ids)
+            conn.execute(f"DELETE FROM segments WHERE segment_id IN ({placeholders})", segment_ids)
+            if doc_lengths[0].size:
+                new_segment = conn.execute(
+                    "INSERT INTO segments (level, doc_count, doc_lengths) VALUES (?, ?, ?)",
+                    (level, int(doc_lengths[0].size), encode_postings(*doc_lengths)),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO postings (term, segment_id, data) VALUES (?, ?, ?)",
+                    ((term, new_segment, data) for term, data in merged),
+                )
+            # Tombstones whose postings are all gone can be forgotten (ones added since the snapshot still have some)
+            if tombstones.size and conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0] <= 1:
+                conn.executemany("DELETE FROM tombstones WHERE doc_id = ?", ((int(d),) for d in tombstones))
+            self._bump_generation(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ✅ Reads
+
+    def postings(self, term):
+        """(doc_ids, freqs, positions) for a term across all segments, without deleted documents."""
+        conn = self._conn()
+        key = (self._generation(conn), term)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        parts = [decode_postings(row[0]) for row in conn.execute(
+            "SELECT data FROM postings WHERE term = ? ORDER BY segment_id", (term,)
+        )]
+        postings = _concat_postings(parts)
+        tombstones = self._tombstones(conn, key[0])
+        postings = _drop_docs(postings, tombstones)
+
+        with self._cache_lock:
+            self._cache[key] = postings
+            while len(self._cache) > POSTINGS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return postings
+
+    def _tombstones(self, conn, generation):
+        key = (generation, "\0tombstones")
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            cached = np.fromiter((r[0] for r in conn.execute("SELECT doc_id FROM tombstones")), dtype=np.int64)
+            with self._cache_lock:
+                self._cache[key] = cached
+        return cached
+
+    def documents(self):
+        """(doc_ids, lengths) of every live document, sorted by doc id; rebuilt only when the index changes."""
+        conn = self._conn()
+        key = (self._generation(conn), "\0documents")
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            parts = [decode_postings(row[0]) for row in conn.execute("SELECT doc_lengths FROM segments")]
+            doc_ids, lengths, _ = _drop_docs(_concat_postings(parts), self._tombstones(conn, key[0]))
+            cached = (doc_ids, lengths)
+            with self._cache_lock:
+                self._cache[key] = cached
+        return cached
+
+    def all_documents(self):
+        return self.documents()[0]
+
+    def content_hashes(self, doc_ids, chunk_size=500):
+        """{doc_id: content_hash} for the given documents that were indexed with a hash."""
+        conn = self._conn()
+        doc_ids = [int(doc_id) for doc_id in doc_ids]
+        hashes = {}
+        for start in range(0, len(doc_ids), chunk_size):
+            chunk = doc_ids[start:start + chunk_size]
+            rows = conn.execute(
+                f"SELECT doc_id, content_hash FROM documents WHERE doc_id IN ({','.join('?' * len(chunk))})"
+                " AND content_hash IS NOT NULL", chunk)
+            hashes.update(rows)
+        return hashes
+
+    def stats(self):
+        conn = self._conn()
+        docs, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+        return {
+            "documents": docs,
+            "average_length": total_length / docs if docs else 0.0,
+            "segments": conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0],
+            "tombstones": conn.execute("SELECT COUNT(*) FROM tombstones").fetchone()[0],
+        }
+
+    def phrase(self, terms):
+        """Documents containing the terms at consecutive positions."""
+        keys = None
+        for offset, term in enumerate(terms):
+            doc_ids, freqs, positions = self.postings(term)
+            if not doc_ids.size:
+                return _EMPTY
+            # (doc, position - offset) pairs line up across terms exactly when the phrase occurs
+            term_keys = (np.repeat(doc_ids, freqs) << 32) | (positions - offset + (1 << 31))
+            keys = term_keys if keys is None else _intersect_sorted(keys, term_keys)
+            if not keys.size:
+                return _EMPTY
+        doc_ids = keys >> 32
+        return doc_ids[np.concatenate(([True], doc_ids[1:] != doc_ids[:-1]))]
+
+    def evaluate(self, node):
+        """Sorted doc ids matching a parsed query node."""
+        if node is None:
+            return _EMPTY
+        kind = node[0]
+        if kind == "term":
+            return self.postings(node[1])[0]
+        if kind == "phrase":
+            return self.phrase(node[1])
+        if kind == "not":
+            return _difference_sorted(self.all_documents(), self.evaluate(node[1]))
+        if kind == "or":
+            result = _EMPTY
+            for clause in node[1]:
+                result = _union_sorted(result, self.evaluate(clause))
+            return result
+        if kind == "and":
+            positive = [c for c in node[1] if c[0] != "not"]
+            negative = [c[1] for c in node[1] if c[0] == "not"]
+            if positive:
+                # Smallest posting lists first keeps the intersections cheap
+                results = sorted((self.evaluate(c) for c in positive), key=len)
+                result = results[0]
+                for other in results[1:]:
+                    if not result.size:
+                        break
+                    result = _intersect_sorted(result, other)
+            else:
+                result = self.all_documents()
+            for clause in negative:
+                if not result.size:
+                    break
+                result = _difference_sorted(result, self.evaluate(clause))
+            return result
+        raise ValueError(f"Unknown query node: {kind}")
+
+    def search(self, query):
+        """Doc ids (sorted) matching a boolean/phrase query string."""
+        return self.evaluate(parse_query(query))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Process-wide SearchIndex at SEARCH_INDEX_PATH."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+        return _index
+
+
+def rebuild_from_database(index, batch_size=1000, store_root=None):
+    """Index every resume in the database that is not indexed yet, using the stored parses."""
+    from backend.export_corpus import fetch_batches, resolve_file_path
+    from backend.parsed_store import ParsedStore, hash_file
+
+    store = ParsedStore(store_root) if store_root else ParsedStore()
+    indexed = 0
+    for rows in fetch_batches(0, batch_size):
+        documents = []
+        for row in rows:
+            path = resolve_file_path(row.get("file_path"))
+            content_hash = row.get("content_hash") or (hash_file(path) if path else None)
+            parsed = store.get(content_hash) if content_hash else None
+            if parsed:
+                documents.append((row["id"], parsed["parsed_data"].get("text", ""), content_hash))
+        indexed += index.add_documents(documents)
+        logger.info("Indexed %s resumes", indexed)
+    return indexed
+
+
+def main():
+    from backend.logging_config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Build or query the resume search index.")
+    parser.add_argument("--index", default=SEARCH_INDEX_PATH, help="Index file")
+    parser.add_argument("--rebuild", action="store_true", help="Index resumes from the database")
+    parser.add_argument("--optimize", action="store_true", help="Merge all segments into one")
+    parser.add_argument("--query", help="Run a query and print the matching resume ids")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index, background_merge=False)
+    if args.rebuild:
+        rebuild_from_database(index)
+    if args.optimize:
+        index.merge(force=True)
+    if args.query:
+        started = time.perf_counter()
+        doc_ids = index.search(args.query)
+        logger.info("%s matches in %.2f ms: %s", doc_ids.size, (time.perf_counter() - started) * 1000,
+                    doc_ids[:50].tolist())
+    logger.info("Index stats: %s", index.stats())
+
+
+if __name__ == "__main__":
+    main()
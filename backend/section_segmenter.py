@@ -0,0 +1,135 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Canonical section name -> heading synonyms (matched case-insensitively, whole words)
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "employment", "work history", "career history", "internships"),
+    "education": ("education", "academic background", "academic qualifications", "qualifications",
+                  "education and training"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+               "skills and abilities"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications"),
+    "awards": ("awards", "honors", "honors and awards", "achievements"),
+    "publications": ("publications", "research"),
+    "languages": ("languages",),
+    "volunteering": ("volunteering", "volunteer experience", "volunteer work"),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+    "references": ("references",),
+}
+
+Section = namedtuple("Section", ["name", "heading_start", "start", "end"])
+
+_SYNONYM_TO_SECTION = {synonym: name for name, synonyms in SECTION_HEADINGS.items() for synonym in synonyms}
+
+
+_HEADING_STRIP = " \t\r\n•*#-:"
+_MAX_HEADING_CHARS = 48
+
+
+@lru_cache(maxsize=32)
+def _compile_headings(headings):
+    """(synonym -> section map, inline pattern) for a tuple of (section, synonyms) pairs, built once."""
+    synonyms = {synonym: name for name, names in headings for synonym in names}
+    # Longest first so "work experience" wins over "experience"; spaces match any whitespace run
+    alternation = "|".join(r"\s+".join(map(re.escape, synonym.split()))
+                           for synonym in sorted(synonyms, key=len, reverse=True))
+    # No leading assertion, so the regex engine can skip ahead on the alternation's first characters
+    return synonyms, re.compile(rf"(?:{alternation})\b")
+
+
+def _default_headings():
+    return tuple(SECTION_HEADINGS.items())
+
+
+def _line_headings(text, synonyms):
+    """Headings that sit alone on their own line, e.g. 'WORK EXPERIENCE' or 'Skills:'."""
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if len(line) <= _MAX_HEADING_CHARS:
+            name = synonyms.get(" ".join(line.strip(_HEADING_STRIP).lower().split()))
+            if name is not None:
+                yield name, offset, offset + len(line)
+        offset += len(line)
+
+
+def _inline_headings(text, synonyms, pattern):
+    """Any whole-word heading occurrence, for text whose line breaks were collapsed."""
+    lowered = text.lower()
+    for match in pattern.finditer(lowered):
+        start, end = match.span()
+        if start and lowered[start - 1].isalnum():
+            continue
+        if lowered[end:end + 1] == ":":
+            end += 1
+        yield synonyms[" ".join(match.group().split())], start, end
+
+
+def find_sections(text, headings=None):
+    """Find every section heading in one scan; returns Sections in document order.
+
+    Headings alone on a line are preferred; text without any (e.g. whitespace-collapsed
+    output) falls back to whole-word matches anywhere. A section's span runs from the end
+    of its heading to the start of the next detected heading (or the end of the text).
+    A section named twice is reported once, at its first heading; the repeat still ends
+    the section before it.
+    """
+    synonyms, pattern = _compile_headings(headings or _default_headings())
+    matches = list(_line_headings(text, synonyms)) if "\n" in text else []
+    if not matches:
+        matches = list(_inline_headings(text, synonyms, pattern))
+
+    seen = set()
+    sections = []
+    for i, (name, heading_start, start) in enumerate(matches):
+        if name not in seen:
+            seen.add(name)
+            end = matches[i + 1][1] if i + 1 < len(matches) else len(text)
+            sections.append(Section(name, heading_start, start, end))
+    return sections
+
+
+def split_sections(text, headings=None):
+    """{section name: stripped section text} for every section found."""
+    return {section.name: text[section.start:section.end].strip() for section in find_sections(text, headings)}
+
+
+def section_name(keyword):
+    """Canonical section for a heading keyword, e.g. 'Work Experience' -> 'experience'."""
+    key = " ".join(keyword.lower().split())
+    return _SYNONYM_TO_SECTION.get(key, key)
+
+
+def extract_section(text, start_keyword, end_keywords):
+    """Text of the section headed by start_keyword, up to the next heading among end_keywords.
+
+    Only the caller's keywords are headings here: on a line of its own a keyword also
+    matches its synonyms (e.g. "Technical Skills" for "Skills"), in collapsed text only
+    the keyword itself does. The end is the first end heading after the start heading.
+    """
+    keywords = [start_keyword, *end_keywords]
+    start = section_name(start_keyword)
+    ends = {section_name(keyword) for keyword in end_keywords}
+    line_synonyms, _ = _compile_headings(tuple(
+        (section_name(keyword), SECTION_HEADINGS.get(section_name(keyword), (section_name(keyword),)))
+        for keyword in keywords
+    ))
+    literal_synonyms, literal_pattern = _compile_headings(tuple(
+        (section_name(keyword), (" ".join(keyword.lower().split()),)) for keyword in keywords
+    ))
+
+    scans = [lambda: _line_headings(text, line_synonyms)] if "\n" in text else []
+    scans.append(lambda: _inline_headings(text, literal_synonyms, literal_pattern))
+    for scan in scans:
+        matches = list(scan())
+        begin = next((start_at for name, _, start_at in matches if name == start), None)
+        if begin is None:
+            continue
+        end = next((heading_start for name, heading_start, _ in matches
+                    if name in ends and heading_start >= begin), len(text))
+        return text[begin:end].strip()
+    return "Not Found"
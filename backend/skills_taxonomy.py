@@ -0,0 +1,134 @@
+import os
+import re
+import json
+import threading
+from array import array
+
+# Skills taxonomy file: {"version": ..., "skills": [{"id": int, "name": str, "aliases": [str, ...]}, ...]}
+SKILLS_TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+)
+
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#.\-]*")
+# "python3", "html5", "python-3.11" -> the name without its version number
+VERSION_SUFFIX = re.compile(r"^([a-z][a-z+#.]*?)[.\-]?v?\d+(?:\.\d+)*$")
+# A separate version token, as in "Python 3.11"
+VERSION_TOKEN = re.compile(r"^v?\d+(?:\.\d+)*$")
+
+
+def tokenize(text):
+    """Lowercased skill tokens; '/' splits tokens ("CI/CD" -> ci, cd) and trailing punctuation is dropped."""
+    return [token.rstrip(".-") for token in TOKEN_PATTERN.findall(text.lower().replace("/", " "))]
+
+
+class SkillTaxonomy:
+    """Canonical skills with integer ids, matched through a token trie.
+
+    The trie is stored flat: one dict of (node, token) -> child node and an array
+    holding the skill id that ends at each node (0 for none), so matching a whole
+    resume is a single left-to-right scan that keeps the longest alias at each position.
+    """
+
+    def __init__(self, skills):
+        self.names = {}
+        self.aliases = {}  # skill id -> token tuples of every alias (including the name)
+        self._edges = {}
+        self._terminal = array("i", [0])
+        self._vocabulary = set()
+        for skill in skills:
+            skill_id = int(skill["id"])
+            self.names[skill_id] = skill["name"]
+            for alias in {skill["name"].lower(), *skill.get("aliases", ())}:
+                tokens = tokenize(alias)
+                self._insert(tokens, skill_id)
+                if tokens:
+                    self.aliases.setdefault(skill_id, set()).add(tuple(tokens))
+
+    @classmethod
+    def from_file(cls, path=SKILLS_TAXONOMY_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def _insert(self, tokens, skill_id):
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            self._vocabulary.add(token)
+            child = self._edges.get((node, token))
+            if child is None:
+                child = len(self._terminal)
+                self._terminal.append(0)
+                self._edges[(node, token)] = child
+            node = child
+        self._terminal[node] = skill_id
+
+    def _tokens(self, text):
+        tokens = []
+        for token in tokenize(text):
+            if token not in self._vocabulary:
+                if VERSION_TOKEN.match(token) and tokens and tokens[-1] in self._vocabulary:
+                    continue
+                match = VERSION_SUFFIX.match(token)
+                if match:
+                    token = match.group(1)
+            tokens.append(token)
+        return tokens
+
+    def match_ids(self, text):
+        """Skill ids mentioned in the text, in order of first mention."""
+        tokens = self._tokens(text)
+        edges, terminal = self._edges, self._terminal
+        found = {}
+        i, n = 0, len(tokens)
+        while i < n:
+            node, j, best, best_end = 0, i, 0, i
+            while j < n:
+                node = edges.get((node, tokens[j]))
+                if node is None:
+                    break
+                j += 1
+                if terminal[node]:
+                    best, best_end = terminal[node], j
+            if best:
+                found.setdefault(best, None)
+                i = best_end
+            else:
+                i += 1
+        return list(found)
+
+    def normalize(self, skill):
+        """Canonical id for one skill string ("py", "Python3", "python" -> Python's id), or None."""
+        node = 0
+        for token in self._tokens(skill):
+            node = self._edges.get((node, token))
+            if node is None:
+                return None
+        return self._terminal[node] or None
+
+    def normalize_many(self, skills):
+        """Sorted, de-duplicated ids for a list of skills or a comma-separated string; unknown skills are dropped."""
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        return sorted({skill_id for skill_id in map(self.normalize, skills) if skill_id})
+
+    def names_for(self, skill_ids):
+        return [self.names[skill_id] for skill_id in skill_ids if skill_id in self.names]
+
+
+def skill_overlap(skill_ids, other_ids):
+    """Number of skills two id lists share."""
+    return len(set(skill_ids).intersection(other_ids))
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy():
+    """Process-wide SkillTaxonomy loaded from SKILLS_TAXONOMY_PATH."""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = SkillTaxonomy.from_file()
+        return _taxonomy
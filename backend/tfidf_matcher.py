@@ -2,6 +2,7 @@ import nltk
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import string
+from backend.job_query import get_job_query
 
 # Download necessary NLTK resources
 nltk.download('stopwords')
@@ -30,39 +31,47 @@ def preprocess_text(text):
 
 # Function to compute similarity between resume and job description
 def compute_similarity(resume_text, job_desc_text):
-    # Preprocess both resume and job description
+    # job_desc_text may be a string or a JobQuery; the JD is preprocessed and embedded once per distinct JD
+    job_query = get_job_query(job_desc_text)
+
+    # Preprocess the resume
     cleaned_resume = preprocess_text(resume_text)
-    cleaned_job_desc = preprocess_text(job_desc_text)
 
     # Get embeddings for both texts using Sentence-BERT
     resume_embedding = model.encode([cleaned_resume])
-    job_desc_embedding = model.encode([cleaned_job_desc])
+    job_desc_embedding = job_query.embedding(model.encode, preprocess=preprocess_text).reshape(1, -1)
 
     # Compute cosine similarity between the embeddings
     similarity = cosine_similarity(resume_embedding, job_desc_embedding)
     
     return similarity[0][0] * 100  # Return as percentage
 
-# Example Resume and Job Description (you can replace these with your actual data)
-resume_text = """
-Experienced software developer with a demonstrated history of working in the software industry. 
-Skilled in Python, Java, SQL, and cloud computing. Proficient in backend development and data analysis. 
-Strong problem-solving and analytical skills. Worked with AWS, Docker, Kubernetes for cloud deployment and containerization. 
-"""
+# Function to compute TF-IDF similarity between resume and job description
+def compute_tfidf_similarity(resume_text, job_desc_text):
+    # Same score as fitting a TfidfVectorizer on the pair, but the JD is only tokenized once per distinct JD
+    return get_job_query(job_desc_text).tfidf_similarity(resume_text)  # Return as percentage
+
+if __name__ == "__main__":
+    # Example Resume and Job Description (you can replace these with your actual data)
+    resume_text = """
+    Experienced software developer with a demonstrated history of working in the software industry. 
+    Skilled in Python, Java, SQL, and cloud computing. Proficient in backend development and data analysis. 
+    Strong problem-solving and analytical skills. Worked with AWS, Docker, Kubernetes for cloud deployment and containerization. 
+    """
 
-job_desc_text = """
-We are looking for a highly skilled software developer with expertise in Python, Java, and SQL. 
-The ideal candidate will have experience in backend development and cloud technologies such as AWS, Docker, and Kubernetes. 
-Strong analytical and problem-solving skills are a must. Experience with machine learning algorithms is a plus. 
-"""
+    job_desc_text = """
+    We are looking for a highly skilled software developer with expertise in Python, Java, and SQL. 
+    The ideal candidate will have experience in backend development and cloud technologies such as AWS, Docker, and Kubernetes. 
+    Strong analytical and problem-solving skills are a must. Experience with machine learning algorithms is a plus. 
+    """
 
-# Compute similarity score
-similarity_score = compute_similarity(resume_text, job_desc_text)
+    # Compute similarity score
+    similarity_score = compute_similarity(resume_text, job_desc_text)
 
-# Display the result
-if similarity_score > 80:
-    print(f"Resume Similarity Score: {similarity_score:.2f}% \n🔵 Strong Match! The candidate is a good fit for the job.")
-elif similarity_score > 50:
-    print(f"Resume Similarity Score: {similarity_score:.2f}% \n🟡 Medium Match! The candidate has potential for the job.")
-else:
-    print(f"Resume Similarity Score: {similarity_score:.2f}% \n🔴 Very Low Match! The candidate is not a strong fit for the job.")
+    # Display the result
+    if similarity_score > 80:
+        print(f"Resume Similarity Score: {similarity_score:.2f}% \n🔵 Strong Match! The candidate is a good fit for the job.")
+    elif similarity_score > 50:
+        print(f"Resume Similarity Score: {similarity_score:.2f}% \n🟡 Medium Match! The candidate has potential for the job.")
+    else:
+        print(f"Resume Similarity Score: {similarity_score:.2f}% \n🔴 Very Low Match! The candidate is not a strong fit for the job.")
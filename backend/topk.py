@@ -0,0 +1,45 @@
+import heapq
+import itertools
+
+
+class TopK:
+    """Bounded min-heap keeping the k highest-scoring items seen so far.
+
+    Items that don't make the cut (or are pushed out later) are dropped at once, so
+    memory stays at k items however many are offered. k=None keeps everything.
+    Ties keep the item offered first.
+    """
+
+    def __init__(self, k=None):
+        if k is not None and k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.offered = 0
+        self._heap = []
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def would_keep(self, score):
+        """Whether an item with this score would enter the heap right now (lets callers skip building it)."""
+        if self.k is None or len(self._heap) < self.k:
+            return True
+        return bool(self._heap) and score > self._heap[0][0]
+
+    def push(self, score, item):
+        """Offer an item; returns True if it is (for now) among the top k."""
+        self.offered += 1
+        if not self.would_keep(score):
+            return False
+        # Earlier items win ties: a smaller negated sequence number sorts as "larger"
+        entry = (score, -next(self._order), item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def items(self):
+        """Kept items, best first."""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
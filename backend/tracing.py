@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Tracing configuration from environment variables
+# Spans are always summed per stage for the Server-Timing header; individual spans
+# are only kept and written out when TRACE_EXPORT_PATH is set.
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+
+_current_trace = ContextVar("current_trace", default=None)
+_export_lock = threading.Lock()
+
+
+class Trace:
+    """Spans and per-stage totals collected for one request."""
+
+    def __init__(self, request_id=None, keep_spans=False):
+        self.request_id = request_id or uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.keep_spans = keep_spans
+        self.spans = []
+        self.stage_intervals = {}
+
+    def add_span(self, name, started, duration, attrs=None):
+        self.stage_intervals.setdefault(name, []).append((started, started + duration))
+        if self.keep_spans:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((started - self.started) * 1000.0, 3),
+                "duration_ms": round(duration * 1000.0, 3),
+                "attrs": attrs or {},
+            })
+
+    def stage_totals(self):
+        """Wall time per stage, counting nested spans of the same stage once."""
+        totals = {}
+        for name, intervals in self.stage_intervals.items():
+            total, covered_until = 0.0, float("-inf")
+            for start, end in sorted(intervals):
+                if end > covered_until:
+                    total += end - max(start, covered_until)
+                    covered_until = end
+            totals[name] = total
+        return totals
+
+    def server_timing(self, total=None):
+        """Format stage totals as a Server-Timing header value."""
+        entries = [f"{name};dur={seconds * 1000.0:.2f}" for name, seconds in self.stage_totals().items()]
+        if total is not None:
+            entries.append(f"total;dur={total * 1000.0:.2f}")
+        return ", ".join(entries)
+
+
+def start_trace(request_id=None):
+    """Begin a trace for the current request and make it the active one."""
+    trace = Trace(request_id, keep_spans=bool(TRACE_EXPORT_PATH))
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def end_trace(**attrs):
+    """Close the active trace, export its spans if enabled and return it."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    _current_trace.set(None)
+    duration = time.perf_counter() - trace.started
+    if trace.keep_spans:
+        trace.spans.insert(0, {"name": "request", "start_ms": 0.0,
+                               "duration_ms": round(duration * 1000.0, 3), "attrs": attrs})
+        export_trace(trace)
+    return trace
+
+
+def record_span(name, started, duration, attrs=None):
+    """Attach a finished span to the active trace (no-op outside a request)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(name, started, duration, attrs)
+
+
+def export_trace(trace, path=None):
+    """Append one JSON line per span to the trace export file."""
+    path = path or TRACE_EXPORT_PATH
+    if not path:
+        return
+    lines = [
+        json.dumps({"request_id": trace.request_id, "trace_start": trace.started_at, **span}, default=str)
+        for span in trace.spans
+    ]
+    try:
+        with _export_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        logger.error("Failed to export trace %s: %s", trace.request_id, e)
@@ -0,0 +1,92 @@
+import os
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.metrics import time_stage, FILE_SAVE_SECONDS, ERRORS
+from backend.blob_store import get_blob_store
+
+logger = logging.getLogger(__name__)
+
+# Upload handling configuration from environment variables
+# Resumes copied into this folder (rather than uploaded through the API) are picked up by the folder indexer
+UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(os.getcwd(), "backend", "uploads"))
+# Uploads up to this size are parsed straight from memory; larger ones are spooled to disk first.
+UPLOAD_SPILL_THRESHOLD = int(os.getenv("UPLOAD_SPILL_THRESHOLD", str(8 * 1024 * 1024)))
+UPLOAD_PERSIST_WORKERS = int(os.getenv("UPLOAD_PERSIST_WORKERS", "2"))
+
+ALLOWED_EXTENSIONS = {"pdf", "docx", "txt", "png", "jpg", "jpeg"}
+
+_persist_pool = None
+_persist_pid = None
+
+
+def allowed_file(filename):
+    """Check if the file has a valid extension."""
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def _pool():
+    # Thread pools don't survive a fork, so each worker process gets its own
+    global _persist_pool, _persist_pid
+    if _persist_pool is None or _persist_pid != os.getpid():
+        _persist_pool = ThreadPoolExecutor(max_workers=UPLOAD_PERSIST_WORKERS, thread_name_prefix="upload-persist")
+        _persist_pid = os.getpid()
+    return _persist_pool
+
+
+def read_upload(file_storage, content_length=None, threshold=UPLOAD_SPILL_THRESHOLD):
+    """Read an uploaded file for parsing.
+
+    Returns (data, spill_path): the bytes when the upload is at or below the
+    threshold, otherwise None and the path of a temp file it was streamed to.
+    """
+    if content_length is not None and content_length > threshold:
+        suffix = os.path.splitext(file_storage.filename or "")[1]
+        fd, spill_path = tempfile.mkstemp(prefix="upload-", suffix=suffix)
+        with os.fdopen(fd, "wb") as f:
+            with time_stage(FILE_SAVE_SECONDS):
+                file_storage.save(f)
+        return None, spill_path
+    return file_storage.read(), None
+
+
+def _persist(store, filename, content_hash, data=None, spill_path=None):
+    try:
+        with time_stage(FILE_SAVE_SECONDS):
+            _, path = store.put(filename, data=data, spill_path=spill_path, content_hash=content_hash)
+        logger.info("File saved at %s", path)
+        return path
+    except Exception as e:
+        ERRORS.inc(stage="persist_upload")
+        logger.error("Failed to persist upload %s: %s", filename, e)
+
+
+def persist_async(filename, content_hash, data=None, spill_path=None, store=None):
+    """Save the original upload in the blob store, off the request path.
+
+    Returns the blob path it will have and the Future of the write, whose result is that path
+    (None if the write failed). Only record the path once the write is done: see record_stored_file.
+    """
+    store = store or get_blob_store()
+    future = _pool().submit(_persist, store, filename, content_hash, data, spill_path)
+    return store.path_for(content_hash, filename), future
+
+
+def record_stored_file(resume_id, filename, future, store=None):
+    """Done-callback of persist_async's Future: point the resume row at its blob once the blob exists.
+
+    Rows are inserted with file_path NULL, and keep it if the write fails. A blob whose row was
+    never inserted (resume_id None) or was deleted in the meantime is released again.
+    """
+    from backend.db_connection import set_resume_file_path  # psycopg2 is only needed by the upload endpoints
+
+    path = future.result()
+    if path is None:
+        return
+    try:
+        if resume_id is None or not set_resume_file_path(resume_id, path):
+            (store or get_blob_store()).release(path, filename)
+    except Exception as e:
+        ERRORS.inc(stage="persist_upload")
+        logger.error("Failed to record the stored file of resume %s: %s", resume_id, e)
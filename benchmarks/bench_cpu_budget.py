@@ -0,0 +1,115 @@
+"""Throughput of concurrent worker processes with and without the CPU budget.
+
+Starts --workers processes (as gunicorn would) that each run the same CPU-bound
+inference-like workload, once with every library's default thread count (one
+thread per core in every process) and once with backend.cpu_budget's split of
+--cores, optionally pinned. Reports items/s and per-item latency for each mode.
+
+Usage:
+    python -m benchmarks.bench_cpu_budget --workers 4 --items 200
+    python -m benchmarks.bench_cpu_budget --workload torch --pin --out bench_cpu_budget.json
+
+The blas workload is a float32 matrix product shaped like a MiniLM projection over a
+batch; torch runs a small MLP when torch is installed.
+"""
+import os
+import json
+import time
+import argparse
+import logging
+import multiprocessing
+
+from benchmarks.bench_stages import summarize
+from backend.cpu_budget import CpuBudget, THREAD_ENV_VARS
+from backend.prefork import available_cpus
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def _workload(name, size):
+    # numpy/torch are imported here, in the worker, after its thread variables are set
+    if name == "torch":
+        import torch
+        model = torch.nn.Sequential(torch.nn.Linear(size, 4 * size), torch.nn.GELU(), torch.nn.Linear(4 * size, size))
+        batch = torch.randn(64, size)
+
+        def run():
+            with torch.no_grad():
+                model(batch)
+        return run
+
+    import numpy as np
+    rng = np.random.default_rng(0)
+    weights = rng.standard_normal((size, 4 * size), dtype=np.float32)
+    batch = rng.standard_normal((256, size), dtype=np.float32)
+    return lambda: batch @ weights
+
+
+def _worker(env, cpus, workload, size, items, barrier, results):
+    os.environ.update(env)
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    run = _workload(workload, size)
+    run()  # Warm up: thread pools start and weights are touched
+    barrier.wait()
+    latencies = []
+    for _ in range(items):
+        started = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - started)
+    results.put(latencies)
+
+
+def run_mode(budget, workload, size, items, budgeted):
+    """Run budget.workers processes at once; returns the summary over every item they processed."""
+    context = multiprocessing.get_context("spawn")  # A fresh interpreter, so each worker's thread settings apply
+    barrier = context.Barrier(budget.workers + 1)
+    results = context.Queue()
+    processes = []
+    for slot in range(budget.workers):
+        if budgeted:
+            env = budget.environment()
+            cpus = budget.cpus_for(slot) if budget.pin else None
+        else:
+            # Library defaults: one thread per core in every process
+            env = {name: str(budget.cores) for name in THREAD_ENV_VARS}
+            cpus = None
+        process = context.Process(target=_worker, args=(env, cpus, workload, size, items, barrier, results))
+        process.start()
+        processes.append(process)
+
+    barrier.wait()
+    started = time.perf_counter()
+    latencies = [latency for _ in processes for latency in results.get()]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    return summarize(latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare worker throughput with and without the CPU budget.")
+    parser.add_argument("--cores", type=int, default=available_cpus(), help="Core budget to split")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: the budget's count)")
+    parser.add_argument("--workload", default="blas", choices=("blas", "torch"))
+    parser.add_argument("--size", type=int, default=384, help="Embedding width of the workload")
+    parser.add_argument("--items", type=int, default=100, help="Items each worker processes")
+    parser.add_argument("--pin", action="store_true", help="Pin budgeted workers to their own CPUs")
+    parser.add_argument("--out", default="bench_cpu_budget.json")
+    args = parser.parse_args()
+
+    budget = CpuBudget(cores=args.cores, workers=args.workers or None, pin=args.pin)
+    results = {"budget": budget.as_dict(), "workload": args.workload, "size": args.size}
+    for mode, budgeted in (("unbounded", False), ("budgeted", True)):
+        results[mode] = run_mode(budget, args.workload, args.size, args.items, budgeted)
+        logging.info(f"{mode}: {results[mode]}")
+    if results["unbounded"]["throughput_per_s"]:
+        results["speedup"] = round(results["budgeted"]["throughput_per_s"] / results["unbounded"]["throughput_per_s"], 3)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    logging.info(f"Benchmark results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Ranking benchmarks over a synthetic indexed pool.
+
+Usage:
+    python -m benchmarks.bench_ranking --docs 100000 --index /tmp/bench_index.sqlite3 --repeat 5
+    python -m benchmarks.bench_ranking --cascade-docs 5000 --prefilter-top-n 500 --tfidf-top-n 50
+
+The index is built once (synthetic resumes, doc ids 1..N) and reused on later runs. The cascade
+benchmark uses a separate pool of distinct resumes (<index>.cascade.sqlite3), times each stage and
+measures recall@k against embedding every resume in that pool.
+"""
+import os
+import json
+import time
+import random
+import argparse
+import logging
+
+import numpy as np
+
+from benchmarks.synthetic_corpus import generate_resume_text
+from benchmarks.bench_stages import JOB_DESCRIPTION, summarize
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def corpus_texts(docs, size=200, distinct=5000, seed=7):
+    """The distinct synthetic texts behind an index of `docs` resumes; doc id d holds texts[(d - 1) % len(texts)]."""
+    rng = random.Random(seed)
+    # A pool of distinct texts, reused round-robin, keeps generation time out of the picture
+    return ["\n".join(generate_resume_text(rng, size)) for _ in range(min(distinct, docs))]
+
+
+def build_index(path, docs, size=200, distinct=5000, batch_size=10000, seed=7):
+    """Create (or reuse) a search index holding `docs` synthetic resumes."""
+    from backend.search_index import SearchIndex
+
+    index = SearchIndex(path, background_merge=False)
+    have = index.stats()["documents"]
+    if have >= docs:
+        return index
+    texts = corpus_texts(docs, size, distinct, seed)
+    started = time.perf_counter()
+    for start in range(have, docs, batch_size):
+        end = min(start + batch_size, docs)
+        index.add_documents((doc_id + 1, texts[doc_id % len(texts)], None) for doc_id in range(start, end))
+        index.merge()
+    logging.info(f"Indexed {docs - have} resumes in {time.perf_counter() - started:.1f}s: {index.stats()}")
+    return index
+
+
+def bench_bm25(index, job_description=JOB_DESCRIPTION, repeat=5, limit=50):
+    from backend.bm25 import BM25Ranker
+
+    ranker = BM25Ranker(index)
+    ranker.rank(job_description, limit=limit)  # Warm the postings cache and document lengths
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ranker.rank(job_description, limit=limit)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_cascade(index, texts, encode, job_description=JOB_DESCRIPTION, repeat=3, k=50,
+                  prefilter="bm25", prefilter_top_n=1000, tfidf_top_n=100, encode_batch=256):
+    """Cascade latency and per-stage timings, plus recall@k against embedding every resume in the pool.
+
+    texts are the distinct pool texts (see corpus_texts); the pool should hold each text once so the
+    exhaustive ranking has no ties.
+    """
+    from backend.cascade import CascadeRanker, embedding_scores
+
+    def load_texts(doc_ids):
+        return {doc_id: texts[(doc_id - 1) % len(texts)] for doc_id in doc_ids}
+
+    ranker = CascadeRanker(index, prefilter=prefilter, prefilter_top_n=prefilter_top_n,
+                           tfidf_top_n=tfidf_top_n, load_texts=load_texts, encode=encode)
+    ranker.rank(job_description, limit=k)  # Warm the postings cache and the model
+    latencies, stage_seconds = [], {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ranked, stages = ranker.rank(job_description, limit=k)
+        latencies.append(time.perf_counter() - t0)
+        for stage in stages:
+            stage_seconds.setdefault(stage["stage"], []).append(stage["seconds"])
+    cascade = summarize(latencies, time.perf_counter() - started)
+
+    # Ground truth: embedding similarity for every resume in the pool
+    doc_ids = index.all_documents()
+    t0 = time.perf_counter()
+    scores = np.concatenate([
+        embedding_scores(encode, [texts[(doc_id - 1) % len(texts)] for doc_id in chunk.tolist()], job_description)
+        for chunk in np.array_split(doc_ids, max(1, -(-doc_ids.size // encode_batch)))
+    ])
+    exhaustive_seconds = time.perf_counter() - t0
+    truth = set(doc_ids[np.lexsort((doc_ids, -scores))[:k]].tolist())
+    found = {row["resume_id"] for row in ranked}
+
+    return {
+        "pool": int(doc_ids.size),
+        "cutoffs": {"prefilter": prefilter, "prefilter_top_n": prefilter_top_n, "tfidf_top_n": tfidf_top_n},
+        "stages": [
+            {**stage, "p50_ms": round(float(np.median(stage_seconds[stage["stage"]])) * 1000, 4)} for stage in stages
+        ],
+        "cascade": cascade,
+        "exhaustive_embedding_ms": round(exhaustive_seconds * 1000, 4),
+        f"recall_at_{k}": round(len(truth & found) / max(len(truth), 1), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pool ranking over a synthetic search index.")
+    parser.add_argument("--index", default="bench_index.sqlite3", help="Index file (built if smaller than --docs)")
+    parser.add_argument("--docs", type=int, default=100000, help="Resumes in the pool")
+    parser.add_argument("--size", type=int, default=200, help="Approximate words per resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="bench_ranking.json")
+    parser.add_argument("--cascade-docs", type=int, default=2000,
+                        help="Distinct resumes in the cascade recall pool (every one is embedded once); 0 skips it")
+    parser.add_argument("--prefilter", default="bm25", choices=("keyword", "bm25"))
+    parser.add_argument("--prefilter-top-n", type=int, default=1000)
+    parser.add_argument("--tfidf-top-n", type=int, default=100)
+    parser.add_argument("--k", type=int, default=50, help="Recall is measured on the top k")
+    args = parser.parse_args()
+
+    index = build_index(args.index, args.docs, size=args.size)
+    results = {"docs": index.stats()["documents"], "bm25": bench_bm25(index, repeat=args.repeat)}
+    logging.info(f"bm25: {results['bm25']}")
+
+    if args.cascade_docs:
+        try:
+            from backend.cascade import get_encoder
+            encode = get_encoder()
+        except ImportError as e:
+            logging.error(f"Skipping the cascade benchmark, the sentence encoder is unavailable: {e}")
+        else:
+            root, ext = os.path.splitext(args.index)
+            recall_index = build_index(f"{root}.cascade{ext}", args.cascade_docs, size=args.size,
+                                       distinct=args.cascade_docs)
+            texts = corpus_texts(args.cascade_docs, args.size, distinct=args.cascade_docs)
+            results["cascade"] = bench_cascade(
+                recall_index, texts, encode, repeat=args.repeat, k=args.k, prefilter=args.prefilter,
+                prefilter_top_n=args.prefilter_top_n, tfidf_top_n=args.tfidf_top_n,
+            )
+            logging.info(f"cascade: {results['cascade']}")
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Per-stage micro-benchmarks over a synthetic resume corpus.
+
+Usage:
+    python -m benchmarks.bench_stages --count 50 --size 400 --out bench_results.json
+    python -m benchmarks.bench_stages --stages parse_pdf,keyword_score --repeat 3
+
+Stages whose dependencies are not installed are reported as skipped.
+"""
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import logging
+import statistics
+
+from benchmarks.synthetic_corpus import generate_corpus
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Stages with a throughput target (items per minute on one core); results record whether it was met
+STAGE_TARGETS_PER_MIN = {"extract_fields": 10000}
+
+JOB_DESCRIPTION = (
+    "We are looking for a software engineer with Python, SQL and machine learning experience. "
+    "Experience with AWS, Docker and Kubernetes is a plus. Strong communication and teamwork skills."
+)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # The smallest value with at least pct% of the values at or below it: rank ceil(pct/100 * n)
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct * len(sorted_values) / 100.0) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, total_seconds):
+    """Throughput and latency percentiles (milliseconds) for one stage."""
+    values = sorted(latency * 1000.0 for latency in latencies)
+    return {
+        "items": len(values),
+        "total_s": round(total_seconds, 6),
+        "throughput_per_s": round(len(values) / total_seconds, 3) if total_seconds > 0 else None,
+        "throughput_per_min": round(60 * len(values) / total_seconds, 1) if total_seconds > 0 else None,
+        "mean_ms": round(statistics.fmean(values), 4) if values else 0.0,
+        "min_ms": round(values[0], 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 4),
+        "p90_ms": round(percentile(values, 90), 4),
+        "p99_ms": round(percentile(values, 99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+    }
+
+
+def run_stage(func, inputs, repeat=1, warmup=1):
+    """Call func on every input `repeat` times and time each call."""
+    for item in inputs[:warmup]:
+        func(item)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            t0 = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def load_texts(corpus):
+    """Reference text for each resume (read from the TXT copies)."""
+    texts = []
+    for path in corpus.get("txt", []):
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def build_stages(corpus, texts):
+    """Map stage name -> (callable, inputs). Import errors become skip reasons."""
+    stages = {}
+
+    def add(name, loader):
+        try:
+            stages[name] = loader()
+        except Exception as e:  # Missing optional dependency (torch, nltk, tesseract, ...)
+            stages[name] = e
+
+    def parsers():
+        from backend import resume_parser
+        return resume_parser
+
+    add("parse_pdf", lambda: (parsers().parse_pdf, corpus.get("pdf", [])))
+    add("parse_docx", lambda: (parsers().parse_docx, corpus.get("docx", [])))
+    add("parse_txt", lambda: (parsers().parse_txt, corpus.get("txt", [])))
+
+    def image_parser():
+        # parse_image swallows OCR errors, so check for the tesseract binary up front
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return parsers().parse_image, corpus.get("png", [])
+    add("parse_image", image_parser)
+
+    add("clean_text_parser", lambda: (parsers().clean_text, texts))
+
+    def whitespace_cleaner():
+        from backend.extract_and_clean_resume import normalize_whitespace
+        return normalize_whitespace, texts
+    add("clean_text_whitespace", whitespace_cleaner)
+
+    def analyzer_cleaner():
+        from backend.resume_analyzer import clean_text
+        return clean_text, texts
+    add("clean_text_analyzer", analyzer_cleaner)
+
+    def segmenter():
+        from backend.section_segmenter import split_sections
+        return split_sections, texts
+    add("segment_sections", segmenter)
+
+    def field_extractor():
+        from backend.field_extractor import extract_fields
+        return extract_fields, texts
+    add("extract_fields", field_extractor)
+
+    add("keyword_score", lambda: (
+        lambda text: parsers().calculate_ranking_score(text, JOB_DESCRIPTION), texts))
+
+    def tfidf_scorer():
+        from backend.tfidf_matcher import compute_tfidf_similarity
+        return (lambda text: compute_tfidf_similarity(text, JOB_DESCRIPTION)), texts
+    add("tfidf_score", tfidf_scorer)
+
+    def embedding_scorer():
+        from backend.resume_analyzer import calculate_similarity
+        return (lambda text: calculate_similarity(text, JOB_DESCRIPTION)), texts
+    add("embedding_score", embedding_scorer)
+
+    return stages
+
+
+def run_benchmarks(corpus_dir, count, size, repeat=1, only=None):
+    corpus = generate_corpus(corpus_dir, count=count, size=size)
+    texts = load_texts(corpus)
+
+    # The parsers log every document at DEBUG; keep that out of the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    for name, stage in build_stages(corpus, texts).items():
+        if only and name not in only:
+            continue
+        if isinstance(stage, Exception):
+            results[name] = {"skipped": f"{type(stage).__name__}: {stage}"}
+            continue
+        func, inputs = stage
+        if not inputs:
+            results[name] = {"skipped": "no inputs"}
+            continue
+        try:
+            results[name] = run_stage(func, inputs, repeat=repeat)
+            target = STAGE_TARGETS_PER_MIN.get(name)
+            if target:
+                results[name]["target_per_min"] = target
+                results[name]["meets_target"] = (results[name]["throughput_per_min"] or 0) >= target
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+        logging.getLogger().setLevel(logging.INFO)
+        logging.info(f"{name}: {results[name]}")
+        logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger().setLevel(logging.INFO)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus_dir": corpus_dir,
+            "count": count,
+            "size_words": size,
+            "repeat": repeat,
+        },
+        "stages": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run per-stage resume pipeline benchmarks.")
+    parser.add_argument("--corpus", default="bench_corpus", help="Corpus directory (generated if missing)")
+    parser.add_argument("--count", type=int, default=20, help="Resumes per format")
+    parser.add_argument("--size", type=int, default=400, help="Approximate words per resume")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage")
+    parser.add_argument("--stages", default="", help="Comma-separated subset of stages to run")
+    parser.add_argument("--out", default="bench_results.json", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    only = set(filter(None, args.stages.split(",")))
+    results = run_benchmarks(args.corpus, args.count, args.size, args.repeat, only)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    logging.info(f"Benchmark results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
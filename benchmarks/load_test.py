@@ -0,0 +1,294 @@
+"""End-to-end load test for the Flask API (backend.app:app).
+
+Replays a weighted mix of /upload_resume, /rank_resumes_from_folder, /resumes and
+/parse_resume/<id> requests from concurrent clients, using the synthetic corpus and
+whatever database the DB_* environment variables point at (use a local Postgres).
+
+Usage:
+    # Against a server that is already running
+    python -m benchmarks.load_test --base-url http://127.0.0.1:5000 --duration 60 --concurrency 8
+
+    # Start the Procfile web command (gunicorn) locally, create the table and save a baseline
+    python -m benchmarks.load_test --start-server --setup-db --save-baseline load_baseline.json
+
+    # Compare a run against the stored baseline (exit code 1 on regression)
+    python -m benchmarks.load_test --start-server --baseline load_baseline.json
+"""
+import os
+import json
+import time
+import shlex
+import random
+import argparse
+import logging
+import threading
+import subprocess
+from collections import defaultdict
+
+import requests
+
+from benchmarks.synthetic_corpus import generate_corpus
+from benchmarks.bench_stages import JOB_DESCRIPTION, percentile
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = "upload_resume=4,rank_resumes_from_folder=1,resumes=3,parse_resume=2"
+
+# Latency histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# Local stand-in for the production table, matching the columns insert_resume writes
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id SERIAL PRIMARY KEY,
+    name TEXT, email TEXT, phone TEXT, skills TEXT, experience TEXT, education TEXT,
+    file_path TEXT, file_format TEXT, job_description TEXT,
+    ranking_score DOUBLE PRECISION DEFAULT 0.0,
+    status TEXT DEFAULT 'Pending'
+)
+"""
+
+
+class Recorder:
+    """Thread-safe collection of per-endpoint latencies and errors."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, seconds, status):
+        with self.lock:
+            self.latencies[endpoint].append(seconds * 1000.0)
+            self.status_codes[endpoint][str(status)] += 1
+            if status is None or status >= 500:
+                self.errors[endpoint] += 1
+
+    def report(self, elapsed):
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            histogram = {}
+            for bound in BUCKETS_MS:
+                histogram[f"le_{bound}"] = sum(1 for v in values if v <= bound)
+            histogram["le_inf"] = len(values)
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": self.errors[endpoint],
+                "error_rate": round(self.errors[endpoint] / len(values), 4),
+                "throughput_per_s": round(len(values) / elapsed, 3),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p90_ms": round(percentile(values, 90), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2),
+                "status_codes": dict(self.status_codes[endpoint]),
+                "histogram_ms": histogram,
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "throughput_per_s": round(total / elapsed, 3) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def parse_mix(mix):
+    """'upload_resume=4,resumes=1' -> [('upload_resume', 4.0), ('resumes', 1.0)]"""
+    weights = []
+    for part in filter(None, mix.split(",")):
+        name, _, weight = part.partition("=")
+        weights.append((name.strip(), float(weight or 1)))
+    return weights
+
+
+class LoadClient:
+    """One simulated client issuing requests from the mix against the API."""
+
+    def __init__(self, base_url, corpus_files, recorder, resume_ids, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.corpus_files = corpus_files
+        self.recorder = recorder
+        self.resume_ids = resume_ids
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.rng = random.Random()
+
+    def _call(self, endpoint, method, path, **kwargs):
+        started = time.perf_counter()
+        status = None
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+            status = response.status_code
+            return response
+        except requests.RequestException as e:
+            logging.debug(f"{endpoint} failed: {e}")
+            return None
+        finally:
+            self.recorder.record(endpoint, time.perf_counter() - started, status)
+
+    def upload_resume(self):
+        path = self.rng.choice(self.corpus_files)
+        with open(path, "rb") as f:
+            self._call("upload_resume", "POST", "/upload_resume",
+                       files={"resume": (os.path.basename(path), f)},
+                       data={"job_description": JOB_DESCRIPTION})
+
+    def rank_resumes_from_folder(self):
+        self._call("rank_resumes_from_folder", "POST", "/rank_resumes_from_folder",
+                   data={"job_description": JOB_DESCRIPTION})
+
+    def resumes(self):
+        response = self._call("resumes", "GET", "/resumes")
+        if response is not None and response.status_code == 200:
+            try:
+                ids = [row["id"] for row in response.json() if "id" in row]
+            except (ValueError, TypeError):
+                return
+            if ids:
+                self.resume_ids[:] = ids
+
+    def parse_resume(self):
+        if not self.resume_ids:
+            return self.resumes()
+        resume_id = self.rng.choice(self.resume_ids)
+        self._call("parse_resume", "GET", f"/parse_resume/{resume_id}")
+
+
+def run_load(base_url, corpus_files, mix, concurrency, duration, max_requests, timeout):
+    recorder = Recorder()
+    resume_ids = []
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    issued = [0]
+    issued_lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        client = LoadClient(base_url, corpus_files, recorder, resume_ids, timeout)
+        while time.monotonic() < deadline:
+            with issued_lock:
+                if max_requests and issued[0] >= max_requests:
+                    return
+                issued[0] += 1
+            getattr(client, client.rng.choices(names, weights)[0])()
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return recorder.report(time.monotonic() - started)
+
+
+def compare_to_baseline(current, baseline, tolerance):
+    """List regressions of throughput, p50/p99 latency and error rate per endpoint."""
+    regressions = []
+    for endpoint, base in baseline.get("endpoints", {}).items():
+        now = current["endpoints"].get(endpoint)
+        if now is None:
+            continue
+        if base["throughput_per_s"] and now["throughput_per_s"] < base["throughput_per_s"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {now['throughput_per_s']}/s < baseline {base['throughput_per_s']}/s")
+        for key in ("p50_ms", "p99_ms"):
+            if base[key] and now[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key} {now[key]} > baseline {base[key]}")
+        if now["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{endpoint}: error rate {now['error_rate']} > baseline {base['error_rate']}")
+    return regressions
+
+
+def setup_local_db():
+    from backend.db_connection import execute_query
+    if execute_query(LOCAL_SCHEMA) is None:
+        raise RuntimeError("Could not create the resumes table; check the DB_* environment variables")
+    logging.info("Local resumes table is ready")
+
+
+def start_server(base_url, startup_timeout=120):
+    """Start the Procfile 'web' command from the repo root and wait for /ping."""
+    with open(os.path.join(REPO_ROOT, "Procfile"), "r", encoding="utf-8") as f:
+        web = next(line.split(":", 1)[1].strip() for line in f if line.startswith("web:"))
+    logging.info(f"Starting server: {web}")
+    process = subprocess.Popen(shlex.split(web), cwd=REPO_ROOT)
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(base_url.rstrip("/") + "/ping", timeout=2).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the resume API.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--start-server", action="store_true", help="Launch the Procfile web command first")
+    parser.add_argument("--setup-db", action="store_true", help="Create the resumes table in the DB_* database")
+    parser.add_argument("--corpus", default="bench_corpus")
+    parser.add_argument("--corpus-count", type=int, default=20)
+    parser.add_argument("--corpus-size", type=int, default=400)
+    parser.add_argument("--formats", default="pdf,docx,txt")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted endpoint mix")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--out", default="load_results.json")
+    parser.add_argument("--baseline", help="Compare against this stored result")
+    parser.add_argument("--save-baseline", help="Store this run as a baseline at the given path")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus, args.corpus_count, args.corpus_size, args.formats.split(","))
+    corpus_files = [path for paths in corpus.values() for path in paths]
+
+    if args.setup_db:
+        setup_local_db()
+
+    server = start_server(args.base_url) if args.start_server else None
+    try:
+        results = run_load(args.base_url, corpus_files, parse_mix(args.mix),
+                           args.concurrency, args.duration, args.requests, args.timeout)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results["config"] = {"mix": args.mix, "concurrency": args.concurrency, "duration_s": args.duration}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    logging.info(f"{results['requests']} requests, {results['throughput_per_s']}/s, "
+                 f"error rate {results['error_rate']}; results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        logging.info(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for line in regressions:
+            logging.error(f"Regression: {line}")
+        if regressions:
+            raise SystemExit(1)
+        logging.info("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Synthetic resume corpus generator for benchmarks and load tests.
+
+Usage:
+    python -m benchmarks.synthetic_corpus --out bench_corpus --count 50 --size 400 --formats pdf,docx,txt,png
+"""
+import os
+import random
+import argparse
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+FORMATS = ("pdf", "docx", "txt", "png")
+
+FIRST_NAMES = ["Tasiana", "Tomislav", "Priya", "Mateo", "Aiko", "Jonas", "Amara", "Lucas", "Mei", "Omar", "Sofia", "Ravi"]
+LAST_NAMES = ["Ukura", "Abramovic", "Sharma", "Garcia", "Tanaka", "Berg", "Okafor", "Silva", "Chen", "Haddad", "Rossi", "Iyer"]
+CITIES = ["Seattle, WA", "Sausalito, CA", "Austin, TX", "New York, NY", "Chicago, IL", "Denver, CO"]
+TITLES = ["Software Engineer", "Data Analyst", "Machine Learning Engineer", "Backend Developer",
+          "Data Scientist", "DevOps Engineer", "Business Analyst", "Frontend Developer"]
+COMPANIES = ["Sunbit", "Fast", "Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+SCHOOLS = ["University of Washington", "Stanford University", "IIT Bombay", "University of Texas", "MIT"]
+DEGREES = ["B.S., Computer Science", "M.S., Data Science", "B.A., Economics", "B.Tech, Information Technology"]
+SKILLS = ["Python", "Java", "SQL", "JavaScript", "C++", "C#", "Go", "Kubernetes", "Docker", "AWS", "Excel",
+          "Tableau", "Power BI", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Spark", "React", "Flask",
+          "machine learning", "data analysis", "communication", "teamwork", "problem-solving"]
+VERBS = ["Designed", "Built", "Led", "Automated", "Optimized", "Migrated", "Analyzed", "Deployed", "Reduced", "Improved"]
+OBJECTS = ["ad hoc SQL queries", "ETL pipelines", "REST APIs", "dashboards", "ML models", "CI/CD workflows",
+           "reporting jobs", "microservices", "data warehouse tables", "A/B test analyses"]
+OUTCOMES = ["cutting latency by {n}%", "saving ${n}K per year", "for {n} internal teams", "across {n} regions",
+            "improving accuracy by {n}%", "serving {n}K daily users"]
+
+
+def generate_resume_text(rng, size=400):
+    """Build a plausible resume of roughly `size` words as a list of lines."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = name.lower().replace(" ", ".") + f"{rng.randint(1, 99)}@email.com"
+    lines = [
+        name,
+        rng.choice(TITLES),
+        f"{email} ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)} {rng.choice(CITIES)}",
+        "WORK EXPERIENCE",
+    ]
+
+    words = sum(len(line.split()) for line in lines)
+    # Reserve some room for the education and skills sections
+    while words < max(size - 40, 20):
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)}, {rng.randint(2010, 2023)} - Present")
+        for _ in range(rng.randint(2, 5)):
+            bullet = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, " \
+                     f"{rng.choice(OUTCOMES).format(n=rng.randint(2, 90))}"
+            lines.append(bullet)
+        words = sum(len(line.split()) for line in lines)
+
+    lines.append("EDUCATION")
+    lines.append(f"{rng.choice(SCHOOLS)} - {rng.choice(DEGREES)}, {rng.randint(2000, 2020)}")
+    lines.append("SKILLS")
+    lines.append("Languages: " + ", ".join(rng.sample(SKILLS, k=min(8, len(SKILLS)))))
+    return lines
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+
+
+def write_pdf(lines, path, lines_per_page=50):
+    """Write a minimal text-only PDF (Helvetica, one content stream per page)."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages object, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        stream = b"BT /F1 10 Tf 14 TL 50 770 Td\n"
+        stream += b"".join(b"(" + _pdf_escape(line) + b") Tj T*\n" for line in page_lines)
+        stream += b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(lines, path):
+    import docx
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_txt(lines, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def write_image(lines, path, line_height=18):
+    from PIL import Image, ImageDraw
+    width = 1275
+    height = 60 + line_height * len(lines)
+    image = Image.new("L", (width, height), color=255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((40, 30 + i * line_height), line, fill=0)
+    image.save(path)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt, "png": write_image}
+
+
+def generate_corpus(out_dir, count=20, size=400, formats=FORMATS, seed=42):
+    """Write `count` resumes per format into out_dir and return their paths grouped by format."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    corpus = {fmt: [] for fmt in formats}
+    for i in range(count):
+        lines = generate_resume_text(rng, size)
+        for fmt in formats:
+            # Files already there are reused, so the name covers everything that shapes the content
+            path = os.path.join(out_dir, f"resume_seed{seed}_{size}w_{i:05d}.{fmt}")
+            if not os.path.exists(path):
+                WRITERS[fmt](lines, path)
+            corpus[fmt].append(path)
+    logging.info(f"Synthetic corpus ready in {out_dir}: {count} resumes x {len(formats)} formats")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus.")
+    parser.add_argument("--out", default="bench_corpus", help="Output directory")
+    parser.add_argument("--count", type=int, default=20, help="Resumes per format")
+    parser.add_argument("--size", type=int, default=400, help="Approximate words per resume")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated formats")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_corpus(args.out, args.count, args.size, args.formats.split(","), args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -59,7 +59,7 @@ def extract_text(uploaded_file):
     return clean_text(text)
 
 # Function to call the backend API to rank resumes
-def rank_resumes_from_folder(resumes, job_desc_text):
+def rank_resumes_from_folder(resumes, job_desc_text, deadline_ms=None):
     url = "https://ai-resume-api.onrender.com/rank_resumes_from_folder"  # Use deployed API URL
     headers = {'Content-Type': 'application/json'}
 
@@ -67,6 +67,9 @@ def rank_resumes_from_folder(resumes, job_desc_text):
     data = {
         'job_description': job_desc_text
     }
+    if deadline_ms:
+        # The API returns what it ranked within the budget and flags the rest as not fully scored
+        data['deadline_ms'] = deadline_ms
 
     # Send POST request to the backend
     try:
@@ -108,6 +111,7 @@ elif selected == "Upload Resume":
                                        type=["pdf", "docx", "txt", "png", "jpg", "jpeg"], 
                                        accept_multiple_files=True)
     uploaded_job_desc = st.text_area("📝 Job Description", height=300)
+    deadline_ms = st.number_input("⏱️ Time budget (ms, 0 = wait for the full ranking)", min_value=0, value=5000, step=500)
 
     submit_button = st.button("🔍 Submit")
 
@@ -127,7 +131,9 @@ elif selected == "Upload Resume":
                         "text": resume_text
                     })
 
-            ranked_resumes = rank_resumes_from_folder(resumes, uploaded_job_desc)
+            ranked_resumes = rank_resumes_from_folder(resumes, uploaded_job_desc, deadline_ms)
+            if ranked_resumes and not ranked_resumes.get("complete", True):
+                st.warning("⏱️ Time budget reached: some resumes were not fully scored.")
             
             if ranked_resumes:
                 resumes_data = ranked_resumes.get('ranked_resumes', [])
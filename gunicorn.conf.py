@@ -0,0 +1,66 @@
+"""gunicorn settings for the API (used by the Procfile: gunicorn -c gunicorn.conf.py).
+
+The app is built once in the master (preload_app) with its models and lookup
+tables loaded, then forked, so the workers share those pages copy-on-write
+instead of each holding its own copy. See backend/prefork.py.
+The master also runs the resumes schema migration once, before the workers start.
+
+The workers split one CPU budget (CPU_BUDGET cores) between them, so their torch,
+BLAS and OCR threads don't oversubscribe the machine. See backend/cpu_budget.py.
+"""
+import gc
+import os
+
+from backend.cpu_budget import CpuSlots, apply_environment, apply_worker_limits, get_cpu_budget
+from backend.prefork import freeze_heap
+
+wsgi_app = "backend.app:create_app(preload=True, start_workers=False)"
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+cpu_budget = get_cpu_budget()
+workers = cpu_budget.workers
+cpu_slots = CpuSlots()
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# Recycle workers now and then so slow leaks (or pages dirtied since the fork) are returned
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+if preload_app:
+    # No collections while the shared heap is built: freed gaps would be filled later, dirtying shared pages.
+    # The master only supervises after that, so it stays off there; workers turn it back on.
+    gc.disable()
+
+# Before the app (and with it numpy and torch) is loaded, so their thread pools start at the budgeted size
+apply_environment(cpu_budget)
+
+
+def on_starting(server):
+    server.log.info("Starting workers with CPU budget %s (preload_app=%s)", cpu_budget.as_dict(), preload_app)
+    # Schema migration, once per deployment and before any worker serves a request
+    from backend.db_connection import ensure_schema
+    if not ensure_schema():
+        server.log.error("Schema migration failed; newer columns may be missing")
+
+
+def pre_fork(server, worker):
+    # In the master: the forked worker inherits its slot on the worker object
+    worker.cpu_slot = cpu_slots.acquire()
+    if preload_app:
+        freeze_heap()
+
+
+def post_fork(server, worker):
+    gc.enable()
+    apply_worker_limits(cpu_budget, slot=worker.cpu_slot)
+
+
+def child_exit(server, worker):
+    # In the master: the next worker forked (e.g. after max_requests recycling) takes over these CPUs
+    cpu_slots.release(getattr(worker, "cpu_slot", None))
+
+
+def post_worker_init(worker):
+    # Background threads don't survive the fork; every worker starts its own (the folder
+    # indexer's file lock still lets only one of them index)
+    from backend.app import start_background_workers
+    start_background_workers()
@@ -0,0 +1,30 @@
+import zlib
+
+import numpy as np
+import pytest
+from backend.search_index import SearchIndex
+from backend.skills_taxonomy import tokenize
+
+
+def _bag_of_words(texts):
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            vectors[row, zlib.crc32(token.encode()) % 64] += 1.0
+    return vectors
+
+
+@pytest.fixture
+def bag_of_words():
+    """Hashed bag-of-words vectors, a deterministic stand-in for the sentence encoder."""
+    return _bag_of_words
+
+
+@pytest.fixture
+def make_index(tmp_path):
+    """make_index({doc_id: text}) builds a SearchIndex over those resumes (merges run inline)."""
+    def make(resumes):
+        index = SearchIndex(str(tmp_path / "index.sqlite3"), background_merge=False)
+        index.add_documents((doc_id, text, None) for doc_id, text in resumes.items())
+        return index
+    return make
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from backend.blob_store import BlobStore
+from backend.parsed_store import hash_bytes
+from backend.upload_storage import persist_async, record_stored_file
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / "blobs"))
+
+
+def test_blobs_fan_out_by_hash_and_keep_the_extension(store):
+    data = b"Jane Doe\nPython developer"
+    content_hash = hash_bytes(data)
+    _, path = store.put("resume.TXT", data=data)
+    assert path == os.path.join(store.root, content_hash[:2], content_hash[2:4], content_hash + ".txt")
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+
+def test_same_name_uploads_do_not_overwrite_each_other(store):
+    _, first = store.put("resume.txt", data=b"first")
+    _, second = store.put("resume.txt", data=b"second")
+    assert first != second and os.path.exists(first) and os.path.exists(second)
+    assert store.lookup("resume.txt") == [second, first]
+    assert [name for name, _ in store.entries()] == ["resume.txt", "resume.txt"]
+
+
+def test_identical_uploads_share_a_blob_until_the_last_release(store, tmp_path):
+    _, path = store.put("a.txt", data=b"same bytes")
+    spill = tmp_path / "spill.txt"
+    spill.write_bytes(b"same bytes")
+    _, again = store.put("b.txt", spill_path=str(spill))
+    assert again == path and not spill.exists()
+    assert store.stats() == {"files": 2, "blobs": 1, "bytes": len(b"same bytes")}
+
+    assert store.release(path, "a.txt") == 1 and os.path.exists(path)
+    assert store.release(path) == 0 and not os.path.exists(path)
+    assert store.release(path) is None
+    assert store.release("/elsewhere/uploads/legacy.pdf") is None
+
+
+def test_import_folder(store, tmp_path):
+    folder = tmp_path / "uploads"
+    folder.mkdir()
+    (folder / "a.txt").write_bytes(b"resume a")
+    moved = store.import_folder(str(folder))
+    assert list(moved) == [str(folder / "a.txt")]
+    assert store.lookup("a.txt") == list(moved.values())
+    # Moved, so the folder indexer doesn't rank the file a second time
+    assert not (folder / "a.txt").exists()
+    assert store.contains(hash_bytes(b"resume a")) and not store.contains(hash_bytes(b"other"))
+
+
+def test_unrecorded_uploads_release_their_blob(store, monkeypatch):
+    rows = {1: None}  # Resume 2 was deleted before its write finished; None was never inserted
+    monkeypatch.setattr("backend.db_connection.set_resume_file_path",
+                        lambda resume_id, path: resume_id in rows and not rows.update({resume_id: path}))
+    paths = {}
+    for resume_id in (1, 2, None):
+        data = f"resume {resume_id}".encode()
+        paths[resume_id], future = persist_async(f"{resume_id}.txt", hash_bytes(data), data=data, store=store)
+        future.result()
+        record_stored_file(resume_id, f"{resume_id}.txt", future, store=store)
+    assert rows == {1: paths[1]}
+    assert os.path.exists(paths[1]) and not os.path.exists(paths[2]) and not os.path.exists(paths[None])
+    assert store.stats()["files"] == 1
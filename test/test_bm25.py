@@ -0,0 +1,33 @@
+import pytest
+from backend.bm25 import BM25Ranker, query_terms
+
+RESUMES = {
+    1: "Python developer. Python, Django and SQL. Python scripting for data pipelines.",
+    2: "Java developer with some Python.",
+    3: "Registered nurse, intensive care unit.",
+    4: "Python and SQL analyst. " + "Stakeholder reporting and Excel dashboards. " * 20,
+}
+
+
+@pytest.fixture
+def ranker(make_index):
+    return BM25Ranker(make_index(RESUMES))
+
+
+def test_query_terms_drop_stopwords():
+    assert query_terms("We want a Python and SQL developer with Python") == {"want": 1, "python": 2, "sql": 1,
+                                                                             "developer": 1}
+
+
+def test_rank_uses_term_frequency_and_length(ranker):
+    ranked = ranker.rank("python sql developer")
+    # The long document mentions both terms once and is pushed down by length normalization
+    assert [doc_id for doc_id, _ in ranked] == [1, 2, 4]
+    assert all(score > 0 for _, score in ranked)
+    assert [doc_id for doc_id, _ in ranker.rank("python", candidates=[2, 3])] == [2]
+
+
+def test_score_text_matches_indexed_score(ranker):
+    scores = dict(ranker.rank("python sql developer", limit=None))
+    assert ranker.score_text(RESUMES[1], "python sql developer") == pytest.approx(scores[1])
+    assert ranker.score_text("nothing relevant", "python") == 0.0
@@ -0,0 +1,112 @@
+import pytest
+from backend.cascade import CascadeRanker, keyword_scores
+from backend.embedding_store import EmbeddingStore
+
+RESUMES = {
+    1: "Python developer. Python, Django and SQL. Machine learning pipelines in Python.",
+    2: "Java developer with some Python.",
+    3: "Registered nurse, intensive care unit.",
+    4: "Python and SQL analyst. Excel dashboards and stakeholder reporting.",
+    5: "Machine learning engineer: Python, PyTorch, SQL and Kubernetes.",
+}
+JOB = "Python SQL machine learning engineer"
+
+
+@pytest.fixture
+def index(make_index):
+    return make_index(RESUMES)
+
+
+@pytest.fixture
+def cascade(index, bag_of_words):
+    return lambda **kwargs: CascadeRanker(index, load_texts=lambda ids: {i: RESUMES[i] for i in ids},
+                                          encode=bag_of_words, **kwargs)
+
+
+def test_keyword_scores_count_distinct_terms(index):
+    doc_ids, scores = keyword_scores(index, "python python sql nurse")
+    assert dict(zip(doc_ids.tolist(), scores.tolist())) == {1: 2.0, 2: 1.0, 3: 1.0, 4: 2.0, 5: 2.0}
+
+
+@pytest.mark.parametrize("prefilter", ["keyword", "bm25"])
+def test_cascade_stages_narrow_the_pool(cascade, prefilter):
+    ranked, stages = cascade(prefilter=prefilter, prefilter_top_n=4, tfidf_top_n=2).rank(JOB)
+    assert [(s["stage"], s["candidates_in"], s["candidates_out"]) for s in stages] == [
+        (prefilter, 5, 4), ("tfidf", 4, 2), ("embedding", 2, 2)]
+    assert len(ranked) == 2 and 3 not in {row["resume_id"] for row in ranked}
+    assert ranked[0]["ranking_score"] >= ranked[1]["ranking_score"]
+    assert {"tfidf_score", f"{prefilter}_score"} <= set(ranked[0])
+
+
+def test_cascade_drops_resumes_without_text(index, bag_of_words):
+    ranker = CascadeRanker(index, load_texts=lambda ids: {1: RESUMES[1]}, encode=bag_of_words)
+    ranked, stages = ranker.rank(JOB)
+    assert [row["resume_id"] for row in ranked] == [1]
+    assert stages[1]["candidates_out"] == 1
+
+
+def test_terms_tfidf_ignores_keep_their_candidates(make_index, bag_of_words):
+    resumes = {1: "C and C++ developer", 2: "Embedded C, R scripts", 3: "Registered nurse"}
+    index = make_index(resumes)
+    ranker = CascadeRanker(index, load_texts=lambda ids: {i: resumes[i] for i in ids}, encode=bag_of_words)
+    ranked, stages = ranker.rank("C R")
+    assert stages[1]["candidates_in"] == stages[1]["candidates_out"] > 0
+    assert [row["resume_id"] for row in ranked] and 3 not in {row["resume_id"] for row in ranked}
+
+
+def test_unknown_prefilter(index):
+    with pytest.raises(ValueError):
+        CascadeRanker(index, prefilter="embedding")
+
+
+@pytest.mark.parametrize("cutoffs", [{"prefilter_top_n": 0}, {"tfidf_top_n": -1}])
+def test_cutoffs_must_be_positive(index, cutoffs):
+    with pytest.raises(ValueError):
+        CascadeRanker(index, **cutoffs)
+
+
+def test_deadline_returns_lexical_ranking_when_out_of_time(cascade):
+    ranked, stages = cascade(prefilter_top_n=4, tfidf_top_n=4).rank(JOB, deadline_ms=0)
+    assert ranked and not any(row["fully_scored"] for row in ranked)
+    assert all(row["ranking_score"] is None for row in ranked)
+    assert [s["completed"] for s in stages] == [True, False, False]
+
+
+def test_deadline_scores_in_chunks_until_the_budget_runs_out(index, bag_of_words, monkeypatch):
+    monkeypatch.setattr("backend.cascade.EMBEDDING_CHUNK_SIZE", 1)
+    calls = []
+    now = [0.0]
+
+    def slow_encoder(texts):
+        # Every encode takes 50 ms on the fake clock, so the result doesn't depend on the machine's speed
+        calls.append(len(texts))
+        now[0] += 0.05
+        return bag_of_words(texts)
+
+    ranker = CascadeRanker(index, load_texts=lambda ids: {i: RESUMES[i] for i in ids}, encode=slow_encoder,
+                           prefilter_top_n=4, tfidf_top_n=4, clock=lambda: now[0])
+    ranked, stages = ranker.rank(JOB, deadline_ms=120)
+    flags = [row["fully_scored"] for row in ranked]
+    # Fully scored resumes come first; the chunk that would overrun the budget is never started
+    assert flags == sorted(flags, reverse=True) and 0 < sum(flags) < len(flags)
+    # One extra call embeds the job description
+    assert len(calls) == sum(flags) + 1 and stages[-1]["completed"] is False
+
+
+def test_stored_embeddings_are_not_encoded_again(index, bag_of_words, tmp_path):
+    encoded = []
+
+    def encoder(texts):
+        encoded.extend(texts)
+        return bag_of_words(texts)
+
+    store = EmbeddingStore(str(tmp_path / "embeddings.sqlite3"))
+    ranker = CascadeRanker(index, load_texts=lambda ids: {i: RESUMES[i] for i in ids}, encode=encoder,
+                           embeddings=store)
+    first, _ = ranker.rank(JOB)
+    assert set(RESUMES.values()) & set(encoded)
+
+    encoded.clear()
+    second, _ = ranker.rank(JOB)
+    assert not set(RESUMES.values()) & set(encoded)
+    assert second == first
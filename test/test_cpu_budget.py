@@ -0,0 +1,45 @@
+import os
+
+from backend.cpu_budget import CpuBudget, CpuSlots, apply_environment, THREAD_ENV_VARS
+
+
+def test_budget_splits_cores_between_workers():
+    budget = CpuBudget(cores=8, workers=3)
+    assert budget.threads == 2
+    assert budget.environment()["OMP_NUM_THREADS"] == "2" and budget.environment()["OMP_THREAD_LIMIT"] == "2"
+    # More workers than cores still leaves each one thread
+    assert CpuBudget(cores=2, workers=5).threads == 1
+
+
+def test_default_budget_never_oversubscribes(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    for cores in (1, 4, 8):
+        budget = CpuBudget(cores=cores, memory_cap=64)
+        assert budget.workers * budget.threads <= cores
+    # Memory for only 3 workers: they share all 8 cores
+    assert CpuBudget(cores=8, memory_cap=3).as_dict() == {"cores": 8, "workers": 3, "threads": 2, "pin": False}
+    assert CpuBudget(cores=8, threads=4, memory_cap=64).workers == 2
+
+
+def test_freed_slots_are_reused():
+    slots = CpuSlots()
+    assert [slots.acquire() for _ in range(3)] == [0, 1, 2]
+    slots.release(1)
+    assert slots.acquire() == 1 and slots.acquire() == 3
+
+
+def test_pinned_slots_wrap_around_the_budget():
+    budget = CpuBudget(cores=4, workers=2, pin=True)
+    cpus = [0, 1, 2, 3, 4, 5]
+    assert budget.cpus_for(0, cpus) == [0, 1]
+    assert budget.cpus_for(1, cpus) == [2, 3]
+    assert budget.cpus_for(2, cpus) == [0, 1]
+
+
+def test_explicit_environment_wins(monkeypatch):
+    # Restored afterwards, so the other tests keep their thread settings
+    for name in THREAD_ENV_VARS + ("OMP_THREAD_LIMIT",):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("MKL_NUM_THREADS", "7")
+    apply_environment(CpuBudget(cores=4, workers=4))
+    assert os.environ["MKL_NUM_THREADS"] == "7" and os.environ["OPENBLAS_NUM_THREADS"] == "1"
@@ -0,0 +1,67 @@
+import backend.resume_parser as resume_parser
+from backend.dedup import DedupIndex, minhash_signature, estimate_similarity
+from backend.parsed_store import ParsedStore
+
+RESUME = """John Smith
+Senior Software Engineer with eight years of experience building data pipelines
+and web services in Python, Java and Go. Led a team of five engineers migrating
+batch ETL jobs to streaming, cutting report latency from hours to minutes.
+Skills: Python, SQL, Kafka, Spark, Docker, Kubernetes, AWS, PostgreSQL.
+Education: B.Sc. Computer Science, State University, 2014.
+"""
+
+OTHER = """Maria Garcia
+Registered nurse with intensive care and emergency department experience.
+Certified in advanced cardiac life support and pediatric advanced life support.
+Education: Bachelor of Science in Nursing, City College, 2016.
+"""
+
+
+def test_signature_similarity():
+    edited = RESUME.replace("eight", "nine") + "References available on request."
+    assert estimate_similarity(minhash_signature(RESUME), minhash_signature(edited)) > 0.6
+    assert estimate_similarity(minhash_signature(RESUME), minhash_signature(OTHER)) < 0.2
+
+
+def test_exact_near_and_new(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"), threshold=0.75)
+    assert index.check_exact("a").kind == "new"
+    assert index.check_and_add("a", RESUME).kind == "new"
+    assert index.check_exact("a").kind == "exact"
+
+    near = index.check_and_add("b", RESUME.replace("Senior", "Staff"))
+    assert near.kind == "near" and near.canonical_hash == "a"
+    assert index.check_and_add("c", OTHER).kind == "new"
+
+    # Persisted across instances
+    assert DedupIndex(str(tmp_path / "dedup.sqlite3")).canonical("b") == "a"
+
+
+def test_removing_a_canonical_document(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"), threshold=0.75)
+    index.check_and_add("a", RESUME)
+    index.check_and_add("b", RESUME.replace("Senior", "Staff"))
+    index.remove("a")
+    assert index.check_exact("a").kind == "new"
+    assert index.canonical("b") == "b"
+
+
+def test_near_duplicate_reuses_the_canonical_parse(tmp_path, monkeypatch):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"), threshold=0.75)
+    store_dir = str(tmp_path / "parsed")
+
+    def parse(data, content_hash):
+        return resume_parser.parse_resume_bytes(
+            data.encode(), "resume.txt", store_dir, "python kafka", content_hash=content_hash,
+            find_canonical=lambda text: index.check_and_add(content_hash, text).canonical_hash)
+
+    first = parse(RESUME, "a")
+    assert "alias_of" not in first
+
+    calls = []
+    monkeypatch.setattr(resume_parser, "extract_fields", lambda text: calls.append(text) or {})
+    second = parse(RESUME.replace("Senior", "Staff"), "b")
+    assert calls == []
+    assert second["alias_of"] == "a"
+    assert second["parsed_data"] == first["parsed_data"]
+    assert ParsedStore(store_dir)._get("b") == {"alias_of": "a"}
@@ -0,0 +1,38 @@
+from backend.field_extractor import extract_fields, extract_skills
+
+RESUME = """Priya Sharma
+Data Scientist
+priya.sharma@email.com | +1 (206) 555-0142 | Seattle, WA
+
+EXPERIENCE
+Data Scientist - Globex, 2019 - Present
+Built churn models in Python and scikit-learn; deployed them on AWS with Docker.
+
+EDUCATION
+University of Washington - M.S., Data Science, 2018
+
+SKILLS
+Python, SQL, Power BI, machine learning, C++, CI/CD
+"""
+
+
+def test_extract_fields():
+    fields = extract_fields(RESUME)
+    assert fields["name"] == "Priya Sharma"
+    assert fields["email"] == "priya.sharma@email.com"
+    assert fields["phone"].endswith("(206) 555-0142")
+    assert fields["education"] == "University of Washington - M.S., Data Science, 2018"
+    assert fields["experience"].startswith("Data Scientist - Globex")
+    for skill in ["Python", "scikit-learn", "AWS", "Docker", "SQL", "Power BI", "Machine Learning", "C++", "CI/CD"]:
+        assert skill in fields["skills"]
+
+
+def test_extract_skills_prefers_longest_alias_and_dedupes():
+    assert extract_skills("Apache Spark, spark and PySpark.") == ["Spark"]
+    assert extract_skills("Worked on the rest of the backlog") == []
+
+
+def test_missing_fields_are_empty():
+    fields = extract_fields("")
+    assert fields == {"name": "", "email": "", "phone": "", "skills": [], "skill_ids": [], "education": "",
+                      "experience": ""}
@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+from backend.folder_indexer import FolderIndexer
+
+
+@pytest.fixture
+def indexer(tmp_path):
+    folder = tmp_path / "uploads"
+    folder.mkdir()
+    return FolderIndexer(str(folder), str(tmp_path / "manifest.sqlite3"), str(tmp_path / "parsed"), embed=False)
+
+
+def write(indexer, name, text, mtime=None):
+    path = os.path.join(indexer.folder, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_sync_only_processes_new_and_changed_files(indexer):
+    write(indexer, "a.txt", "Jane Doe\nPython and SQL developer", mtime=1_000_000)
+    write(indexer, "b.txt", "John Roe\nRegistered nurse", mtime=1_000_000)
+    write(indexer, "notes.md", "not a resume")
+    assert indexer.sync() == {"added": 2, "changed": 0, "removed": 0, "unchanged": 0, "failed": 0}
+    assert indexer.sync()["unchanged"] == 2
+
+    write(indexer, "a.txt", "Jane Doe\nPython, SQL and Docker developer", mtime=2_000_000)
+    os.remove(os.path.join(indexer.folder, "b.txt"))
+    assert indexer.sync() == {"added": 0, "changed": 1, "removed": 1, "unchanged": 0, "failed": 0}
+
+    (name, content_hash), = indexer.entries()
+    assert name == "a.txt"
+    assert "Docker" in indexer.store.get(content_hash)["parsed_data"]["skills"]
+
+
+def test_unreadable_files_are_recorded_as_failed(indexer):
+    write(indexer, "empty.txt", "")
+    assert indexer.sync()["failed"] == 1
+    assert indexer.stats() == {"indexed": 0, "failed": 1}
+    # Not retried until the file changes
+    assert indexer.sync()["unchanged"] == 1
+
+
+def test_parser_version_bump_reindexes_unchanged_files(indexer, monkeypatch):
+    write(indexer, "a.txt", "Jane Doe\nPython and SQL developer", mtime=1_000_000)
+    assert indexer.pending() == 1
+    indexer.sync()
+    assert indexer.pending() == 0
+
+    monkeypatch.setattr("backend.folder_indexer.PARSER_VERSION", 99)
+    built = []
+    monkeypatch.setattr(indexer, "_build_artifacts", lambda path, content_hash: built.append(path))
+    assert indexer.pending() == 1
+    assert indexer.sync()["changed"] == 1 and len(built) == 1
+    assert indexer.sync()["unchanged"] == 1 and len(built) == 1
+
+
+def test_non_blocking_sync_skips_while_another_sync_runs(indexer):
+    write(indexer, "a.txt", "Jane Doe\nPython and SQL developer")
+    with indexer._sync_lock:
+        assert indexer.sync(blocking=False) is None
+    assert indexer.sync(blocking=False)["added"] == 1
+
+
+def test_wake_rescans_before_the_next_poll(indexer, monkeypatch):
+    monkeypatch.setattr("backend.folder_indexer.INotify", None)
+    indexer.poll_seconds = 60
+    write(indexer, "a.txt", "Jane Doe\nPython and SQL developer")
+    indexer.start()
+    try:
+        deadline = time.monotonic() + 10
+        while indexer.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        write(indexer, "b.txt", "John Roe\nRegistered nurse")
+        indexer.wake()
+        while indexer.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert indexer.stats()["indexed"] == 2
+    finally:
+        indexer.stop()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+from backend.inference_batcher import EncodeBatcher
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer and records the size of every batch."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.batch_sizes.append(len(texts))
+        time.sleep(self.delay)
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_encode_returns_rows_in_order():
+    batcher = EncodeBatcher(FakeModel(delay=0), max_wait_ms=1)
+    embeddings = batcher.encode(["a", "bbb"])
+    assert embeddings.shape == (2, 2)
+    assert embeddings[:, 0].tolist() == [1.0, 3.0]
+
+
+def test_concurrent_requests_are_coalesced():
+    model = FakeModel()
+    batcher = EncodeBatcher(model, max_wait_ms=20, max_batch_size=64)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.encode(["x" * i, "jd"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every caller gets its own rows back
+    for i, embeddings in results.items():
+        assert embeddings[:, 0].tolist() == [float(i), 2.0]
+    # and the model saw fewer, larger batches than there were callers
+    assert len(model.batch_sizes) < 8
+    assert sum(model.batch_sizes) == 16
+
+
+def test_max_batch_size_is_respected():
+    model = FakeModel()
+    batcher = EncodeBatcher(model, max_wait_ms=50, max_batch_size=4)
+    futures = [batcher.submit(["a", "b"]) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    assert max(model.batch_sizes) <= 4
+
+
+def test_model_errors_reach_the_caller():
+    class BrokenModel:
+        def encode(self, texts, **kwargs):
+            raise RuntimeError("model failed")
+
+    batcher = EncodeBatcher(BrokenModel(), max_wait_ms=0)
+    with pytest.raises(RuntimeError):
+        batcher.encode(["text"])
+
+
+def test_requests_never_push_a_batch_over_the_cap():
+    model = FakeModel()
+    batcher = EncodeBatcher(model, max_wait_ms=50, max_batch_size=4)
+    futures = [batcher.submit(["a", "b", "c"]) for _ in range(4)]
+    # One request larger than the cap is split across batches, its rows still in order
+    large = batcher.submit(["x" * i for i in range(1, 11)])
+    for future in futures:
+        assert future.result(timeout=5).shape == (3, 2)
+    assert large.result(timeout=5)[:, 0].tolist() == [float(i) for i in range(1, 11)]
+    assert max(model.batch_sizes) <= 4 and sum(model.batch_sizes) == 22
@@ -0,0 +1,39 @@
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from backend.job_query import JobQuery, get_job_query
+from backend.resume_parser import calculate_ranking_score, extract_keywords_from_job_description
+from backend.skills_taxonomy import get_skill_taxonomy
+
+JOB = "Looking for a Python3 engineer with SQL, Docker, CI/CD and machine-learning experience."
+RESUMES = [
+    "Senior engineer: python 3.11, PostgreSQL and SQL tuning; built CI / CD with Docker.",
+    "Registered nurse, intensive care unit.",
+    "",
+]
+
+
+def test_keywords_come_from_the_job_description():
+    assert extract_keywords_from_job_description(JOB) == ["Python", "SQL", "Docker", "CI/CD", "Machine Learning"]
+    assert extract_keywords_from_job_description("Registered nurse, night shifts")[:2] == ["registered", "nurse"]
+
+
+def test_job_query_is_cached_by_text():
+    assert get_job_query(JOB) is get_job_query("  " + JOB.replace(" ", "\n", 2))
+    query = get_job_query(JOB)
+    assert get_job_query(query) is query
+
+
+@pytest.mark.parametrize("resume", RESUMES)
+def test_skill_matcher_agrees_with_the_taxonomy(resume):
+    query = JobQuery(JOB)
+    expected = set(get_skill_taxonomy().match_ids(resume)) & set(query.skill_ids)
+    assert query.matched_skill_ids(resume) == expected
+    assert calculate_ranking_score(resume, JOB) == calculate_ranking_score(resume, JOB, sorted(expected))
+
+
+@pytest.mark.parametrize("resume", RESUMES[:2])
+def test_tfidf_similarity_matches_a_pairwise_fit(resume):
+    matrix = TfidfVectorizer(stop_words="english").fit_transform([resume, JOB])
+    expected = cosine_similarity(matrix[0:1], matrix[1:2])[0][0] * 100
+    assert JobQuery(JOB).tfidf_similarity(resume) == pytest.approx(expected)
@@ -0,0 +1,34 @@
+import pytest
+from backend.prefork import available_cpus, available_memory_bytes, load_shared_resources, worker_count
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def cgroup(tmp_path):
+    (tmp_path / "cpu.max").write_text("200000 100000\n")
+    (tmp_path / "memory.max").write_text(str(2048 * MB))
+    (tmp_path / "memory.current").write_text(str(512 * MB))
+    (tmp_path / "meminfo").write_text("MemTotal: 16000000 kB\nMemAvailable: 8000000 kB\n")
+    return tmp_path
+
+
+def test_cgroup_limits_cap_cpus_and_memory(cgroup):
+    assert available_cpus(str(cgroup)) <= 2
+    assert available_memory_bytes(str(cgroup), str(cgroup / "meminfo")) == 1536 * MB
+    (cgroup / "memory.max").write_text("max")
+    assert available_memory_bytes(str(cgroup), str(cgroup / "meminfo")) == 8000000 * 1024
+
+
+def test_worker_count(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    assert worker_count(cpus=4, memory_bytes=64 * 1024 * MB) == 9
+    # Memory bound: 80% of 1 GB at 256 MB per worker
+    assert worker_count(cpus=4, memory_bytes=1024 * MB, worker_memory_mb=256) == 3
+    assert worker_count(cpus=4, memory_bytes=0) == 1
+    monkeypatch.setenv("WEB_CONCURRENCY", "5")
+    assert worker_count(cpus=1, memory_bytes=0) == 5
+
+
+def test_load_shared_resources_without_models():
+    assert set(load_shared_resources(models=False)) == {"skill_taxonomy", "tfidf_analyzer"}
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from backend.embedding_store import EmbeddingStore
+from backend.score_matrix import score_matrix, top_k_per_row
+
+RESUMES = {
+    1: "Python developer. Django, SQL and data pipelines.",
+    2: "Registered nurse, intensive care unit and patient care.",
+    3: "Java backend developer: Spring, Kafka, SQL.",
+    4: "Nurse practitioner, family medicine and patient care.",
+}
+JOBS = ["Python SQL developer", "Registered nurse for patient care"]
+
+
+@pytest.fixture
+def pool(tmp_path, make_index):
+    store = EmbeddingStore(str(tmp_path / "embeddings.sqlite3"), model="bag-of-words")
+    return make_index(RESUMES), store
+
+
+def run(pool, encode, **kwargs):
+    index, store = pool
+    return score_matrix(JOBS, index=index, store=store, encode=encode,
+                        load_texts=lambda ids: {i: RESUMES[i] for i in ids}, **kwargs)
+
+
+def test_top_k_per_row():
+    columns, values = top_k_per_row(np.array([[1.0, 3.0, 2.0], [5.0, 4.0, 6.0]]), 2)
+    assert columns.tolist() == [[1, 2], [2, 0]]
+    assert values.tolist() == [[3.0, 2.0], [6.0, 5.0]]
+
+
+def test_matrix_ranks_every_job_and_picks_best_role(pool, bag_of_words):
+    result = run(pool, bag_of_words, top_k=2, prefilter_top_n=0)
+    assert result["scores"].shape == (2, 4)
+    assert result["top"][0][0][0] in (1, 3) and result["top"][1][0][0] in (2, 4)
+    best = {resume_id: job for resume_id, job, _ in result["best_job"]}
+    assert best == {1: 0, 2: 1, 3: 0, 4: 1}
+
+
+def test_resume_embeddings_are_reused(pool, bag_of_words):
+    encoded = []
+
+    def counting_encoder(texts):
+        encoded.extend(texts)
+        return bag_of_words(texts)
+
+    run(pool, encode=counting_encoder, prefilter_top_n=0)
+    first = len(encoded)
+    run(pool, encode=counting_encoder, prefilter_top_n=0)
+    # Resume embeddings come from the store and JD embeddings from the JobQuery cache
+    assert first == len(RESUMES) + len(JOBS) and len(encoded) == first
+
+
+def test_best_job_list_is_capped(pool, bag_of_words):
+    full = run(pool, bag_of_words, prefilter_top_n=0)["best_job"]
+    assert run(pool, bag_of_words, prefilter_top_n=0, best_job_limit=2)["best_job"] == full[:2]
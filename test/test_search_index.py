@@ -0,0 +1,83 @@
+import threading
+
+import numpy as np
+from backend.search_index import SearchIndex, parse_query, encode_postings, decode_postings
+
+RESUMES = {
+    1: "Senior Go engineer. Kubernetes, Docker and Terraform on AWS.",
+    2: "Python developer focused on machine learning and data pipelines.",
+    3: "Kubernetes operators written in Golang; machine learning infrastructure.",
+    4: "Intern: Kubernetes and Go coursework.",
+    5: "Learning machine design and CI/CD.",
+}
+
+
+def make_index(tmp_path, merge_factor=2):
+    index = SearchIndex(str(tmp_path / "index.sqlite3"), merge_factor=merge_factor, background_merge=False)
+    for doc_id, text in RESUMES.items():
+        index.add_document(doc_id, text)
+    return index
+
+
+def test_postings_round_trip():
+    doc_ids, freqs, positions = [3, 7, 100], [2, 1, 3], [1, 5, 0, 2, 9, 10]
+    decoded = decode_postings(encode_postings(doc_ids, freqs, positions))
+    assert [a.tolist() for a in decoded] == [doc_ids, freqs, positions]
+
+
+def test_parse_query():
+    assert parse_query('kubernetes AND (go OR golang) -intern "machine learning"') == ("and", [
+        ("term", "kubernetes"),
+        ("or", [("term", "go"), ("term", "golang")]),
+        ("not", ("term", "intern")),
+        ("phrase", ["machine", "learning"]),
+    ])
+    assert parse_query("") is None
+
+
+def test_boolean_and_phrase_queries(tmp_path):
+    index = make_index(tmp_path)
+    assert index.search("kubernetes go").tolist() == [1, 4]
+    assert index.search("kubernetes AND (go OR golang) -intern").tolist() == [1, 3]
+    assert index.search('"machine learning"').tolist() == [2, 3]
+    assert index.search("NOT kubernetes").tolist() == [2, 5]
+    assert index.search("ci/cd").tolist() == [5]
+    assert index.search("cobol").size == 0
+
+
+def test_incremental_delete_and_merge(tmp_path):
+    index = make_index(tmp_path)
+    assert not index.add_document(1, "duplicate id")
+    assert index.delete_document(3)
+    assert index.search("kubernetes").tolist() == [1, 4]
+
+    index.merge(force=True)
+    stats = index.stats()
+    assert stats["segments"] == 1 and stats["tombstones"] == 0 and stats["documents"] == 4
+    assert index.search('"machine learning"').tolist() == [2]
+
+    index.add_document(6, "Machine learning engineer, Kubernetes")
+    assert np.array_equal(index.search('kubernetes "machine learning"'), [6])
+
+
+def test_writes_during_a_merge_are_not_blocked_or_lost(tmp_path, monkeypatch):
+    index = make_index(tmp_path)
+    index.merge(force=True)
+    index.add_document(6, "Machine learning engineer, Kubernetes")
+    written = []
+
+    def delete_while_merging(*args):
+        # Runs while the merged segment is built: another thread's write must go through right away
+        if not written:
+            writer = threading.Thread(target=lambda: written.append(index.delete_document(1)))
+            writer.start()
+            writer.join(timeout=5)
+            assert written == [True]
+        return encode_postings(*args)
+
+    monkeypatch.setattr("backend.search_index.encode_postings", delete_while_merging)
+    index.merge(force=True)
+    stats = index.stats()
+    # Document 1 was deleted after the merge's snapshot: it keeps its tombstone until the next merge drops it
+    assert stats["segments"] == 1 and stats["tombstones"] == 1
+    assert index.search("kubernetes").tolist() == [3, 4, 6]
@@ -0,0 +1,63 @@
+from backend.section_segmenter import find_sections, split_sections, extract_section
+
+RESUME = """Jane Doe
+jane.doe@email.com
+
+PROFESSIONAL SUMMARY
+Data analyst with five years of experience.
+
+Work Experience
+Data Analyst - Acme Corp, 2019 - Present
+Built dashboards in Tableau.
+
+EDUCATION
+University of Washington - B.S., Statistics, 2018
+
+Technical Skills:
+Python, SQL, Tableau
+
+Projects
+Churn model for a subscription business
+"""
+
+
+def test_line_headings_with_synonyms():
+    sections = find_sections(RESUME)
+    assert [s.name for s in sections] == ["summary", "experience", "education", "skills", "projects"]
+    # Spans are contiguous: each section ends where the next heading starts
+    for current, following in zip(sections, sections[1:]):
+        assert current.end == following.heading_start
+
+    texts = split_sections(RESUME)
+    assert texts["experience"].startswith("Data Analyst - Acme Corp")
+    assert "five years of experience" in texts["summary"]
+    assert texts["skills"] == "Python, SQL, Tableau"
+
+
+def test_collapsed_text_falls_back_to_inline_headings():
+    flat = " ".join(RESUME.split())
+    texts = split_sections(flat)
+    assert texts["education"] == "University of Washington - B.S., Statistics, 2018"
+    assert texts["projects"] == "Churn model for a subscription business"
+
+
+def test_extract_section_compatibility():
+    flat = "Experience Built APIs Skills Python, Go Education BSc"
+    assert extract_section(flat, "Experience", ["Skills", "Education"]) == "Built APIs"
+    assert extract_section(flat, "Skills", ["Education"]) == "Python, Go"
+    assert extract_section(flat, "Education", ["Experience", "Skills"]) == "BSc"
+    assert extract_section(flat, "Certifications", ["Skills"]) == "Not Found"
+    assert extract_section("Foo: a b Bar c", "Foo", ["Bar"]) == "a b"
+
+
+def test_extract_section_ends_after_the_start_heading():
+    text = "Summary strong skills in Python. Experience Built APIs Skills Python Education BSc"
+    assert extract_section(text, "Experience", ["Skills", "Education"]) == "Built APIs"
+
+
+def test_extract_section_only_stops_at_the_given_end_keywords():
+    text = "Experience Led research on employment languages and a profile service Skills Python"
+    assert extract_section(text, "Experience", ["Skills"]) == (
+        "Led research on employment languages and a profile service")
+    lines = "Experience\nBuilt APIs\nTechnical Skills\nPython"
+    assert extract_section(lines, "Experience", ["Skills"]) == "Built APIs"
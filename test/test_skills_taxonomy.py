@@ -0,0 +1,30 @@
+from backend.skills_taxonomy import SkillTaxonomy, get_skill_taxonomy, skill_overlap
+
+SKILLS = [
+    {"id": 1, "name": "Python", "aliases": ["py", "python3"]},
+    {"id": 2, "name": "Machine Learning", "aliases": ["ml"]},
+    {"id": 3, "name": "Machine Vision", "aliases": []},
+    {"id": 4, "name": "CI/CD", "aliases": ["ci cd"]},
+]
+
+
+def test_variants_map_to_one_id():
+    taxonomy = SkillTaxonomy(SKILLS)
+    assert {taxonomy.normalize(s) for s in ["Python", "py", "python3", "PYTHON 3.11", "python-3"]} == {1}
+    assert taxonomy.normalize("CI/CD") == 4
+    assert taxonomy.normalize("machine") is None
+    assert taxonomy.normalize_many("python, ML, unknown, py") == [1, 2]
+
+
+def test_match_ids_single_scan():
+    taxonomy = SkillTaxonomy(SKILLS)
+    text = "Machine vision and machine learning in Python3; ML pipelines with CI/CD. Python again."
+    assert taxonomy.match_ids(text) == [3, 2, 1, 4]
+    assert taxonomy.names_for([1, 4]) == ["Python", "CI/CD"]
+    assert skill_overlap([1, 2, 4], [4, 1, 9]) == 2
+
+
+def test_bundled_taxonomy_loads():
+    taxonomy = get_skill_taxonomy()
+    assert taxonomy.normalize("python3") == taxonomy.normalize("Python")
+    assert taxonomy.names_for(taxonomy.match_ids("Kubernetes (k8s) and Power BI")) == ["Kubernetes", "Power BI"]
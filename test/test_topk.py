@@ -0,0 +1,22 @@
+import pytest
+from backend.topk import TopK
+
+
+def test_keeps_only_the_best_k():
+    top = TopK(3)
+    for score, name in [(1, "a"), (5, "b"), (3, "c"), (4, "d"), (0, "e"), (5, "f")]:
+        top.push(score, name)
+    assert len(top) == 3 and top.offered == 6
+    # Ties keep the item offered first
+    assert top.items() == ["b", "f", "d"]
+    assert not top.would_keep(4) and top.would_keep(4.5)
+
+
+def test_unbounded_and_empty():
+    everything = TopK()
+    for score in [2, 9, 4]:
+        everything.push(score, score)
+    assert everything.items() == [9, 4, 2]
+    assert not TopK(0).push(10, "x")
+    with pytest.raises(ValueError):
+        TopK(-1)